@@ -28,22 +28,50 @@ bl_info = {
 
 if "bpy" in locals():
     import importlib
-    if "kitfoxStairs" in locals():
-        importlib.reload(kitfoxStairs)
-    if "kitfoxStairsCurved" in locals():
-        importlib.reload(kitfoxStairs)
+    import sys
+    #Reload every submodule that has been imported, core modules first and the
+    #modules with register functions last, so each picks up reloaded helpers
+    def _reload_order(name):
+        module = sys.modules[name]
+        return (".core." not in name, hasattr(module, "register"), name)
+
+    for name in sorted((name for name in sys.modules if name.startswith(__name__ + ".") and sys.modules[name] is not None), key=_reload_order):
+        importlib.reload(sys.modules[name])
 else:
-    from .operators import kitfoxStairs
-    from .operators import kitfoxStairsCurved
+    try:
+        import bpy
+    except ImportError:
+        #Running outside of Blender.  Only the stairs.core package is usable.
+        bpy = None
+
+    if bpy is not None:
+        #Operator modules only define properties and menus, the geometry code
+        #and NumPy are imported the first time an operator runs
+        from .operators import kitfoxStairs
+        from .operators import kitfoxStairsCurved
+        from .operators import kitfoxStairsPath
+        from .operators import kitfoxStairsBatch
+        from .operators import kitfoxStairwell
+        from .operators import stairsObject
+        from .operators import stairsPreferences
 
-import bpy
 
 def register():
+    stairsPreferences.register()
+    stairsObject.register()
     kitfoxStairs.register()
     kitfoxStairsCurved.register()
+    kitfoxStairsPath.register()
+    kitfoxStairsBatch.register()
+    kitfoxStairwell.register()
 
 
 def unregister():
     kitfoxStairs.unregister()
     kitfoxStairsCurved.unregister()
+    kitfoxStairsPath.unregister()
+    kitfoxStairsBatch.unregister()
+    kitfoxStairwell.unregister()
+    stairsObject.unregister()
+    stairsPreferences.unregister()
 
@@ -0,0 +1,24 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Stairs geometry generators.
+
+Nothing in this package imports bpy, so it can be used from an ordinary
+Python process that has NumPy installed, eg
+
+    import sys
+    sys.path.append("<blender addons dir>")
+    from stairs.core import straightStairs
+    buffers = straightStairs.add_stairs_buffers(2, 1, 2, "NUM_STAIRS", 6, 0.16666, True)
+"""
@@ -0,0 +1,210 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Spec files listing many staircases to build in one go.
+
+A JSON spec is a list of entries, or an object with a "stairs" list:
+
+    [
+        {
+            "type": "straight",
+            "name": "Lobby Stairs",
+            "params": {"width": 3, "height": 4, "numSteps": 24},
+            "location": [0, 0, 0],
+            "rotation": [0, 0, 90],
+            "scale": [1, 1, 1]
+        },
+        {"type": "curved", "params": {"curvature": 180, "innerRadius": 2}}
+    ]
+
+A CSV spec has one staircase per row.  The columns are type, name, x, y, z,
+rx, ry, rz, sx, sy, sz plus any of the operator parameter names.  Empty
+cells and missing columns use the defaults.
+
+Parameters are named after the AddStairs / AddStairsCurved properties.
+Rotations are XYZ euler angles in degrees.
+"""
+
+import csv
+import json
+import math
+import os
+from collections import namedtuple
+
+from . import generators
+
+
+StairsSpec = namedtuple("StairsSpec", ["stairsType", "name", "params", "location", "rotation", "scale"])
+
+_TYPE_NAMES = {
+    "straight": generators.STRAIGHT,
+    "curved": generators.CURVED,
+}
+
+_DEFAULT_NAMES = {
+    generators.STRAIGHT: "Stairs",
+    generators.CURVED: "Curved Stairs",
+}
+
+#Smallest values the operator properties allow
+_MINIMUMS = {
+    "width": 0.01,
+    "height": 0.01,
+    "depth": 0.01,
+    "stairWidth": 0.01,
+    "numSteps": 1,
+    "stepHeight": 0.01,
+    "curvature": 0.01,
+    "innerRadius": 0.01,
+    "chordTolerance": 0.00001,
+    "turns": 1,
+}
+
+#Items of the operators' step type enum
+_STEP_TYPES = ("NUM_STAIRS", "STAIR_HEIGHT")
+
+_TRANSFORM_COLUMNS = {
+    "location": ("x", "y", "z"),
+    "rotation": ("rx", "ry", "rz"),
+    "scale": ("sx", "sy", "sz"),
+}
+
+
+def _parse_type(value, where):
+    stairsType = _TYPE_NAMES.get(str(value).strip().lower())
+    if stairsType is None:
+        raise ValueError("%s: unknown stairs type '%s', expected straight or curved" % (where, value))
+    return stairsType
+
+
+def _parse_value(stairsType, name, value, where):
+    #Convert to the type of the operator default
+    default = generators.STAIRS_DEFAULTS[stairsType][name]
+    try:
+        if isinstance(default, bool):
+            if isinstance(value, str):
+                text = value.strip().lower()
+                if text in ("1", "true", "yes", "on"):
+                    return True
+                if text in ("0", "false", "no", "off"):
+                    return False
+                raise ValueError(value)
+            return bool(value)
+        if isinstance(default, int):
+            return int(value)
+        if isinstance(default, float):
+            return float(value)
+        return str(value)
+    except ValueError:
+        raise ValueError("%s: bad value '%s' for %s" % (where, value, name))
+
+
+def _parse_vector(value, default, where, name):
+    if value is None:
+        return default
+    try:
+        vector = tuple(float(v) for v in value)
+    except (TypeError, ValueError):
+        raise ValueError("%s: %s must be a list of three numbers" % (where, name))
+    if len(vector) != 3:
+        raise ValueError("%s: %s must be a list of three numbers" % (where, name))
+    return vector
+
+
+def make_spec(stairsType, params, name=None, location=None, rotation=None, scale=None, where="entry"):
+    """Validate the parts of one entry and return a StairsSpec.  rotation is in degrees."""
+    unknown = set(params) - set(generators.STAIRS_PARAMS[stairsType])
+    if unknown:
+        raise ValueError("%s: unknown %s stairs parameters: %s" % (where, stairsType.lower(), ", ".join(sorted(unknown))))
+
+    params = {key: _parse_value(stairsType, key, value, where) for key, value in params.items()}
+
+    for key, value in params.items():
+        minimum = _MINIMUMS.get(key)
+        #Written so NaN fails as well
+        if minimum is not None and not value >= minimum:
+            raise ValueError("%s: %s must be at least %g" % (where, key, minimum))
+    if params.get("stepType", "NUM_STAIRS") not in _STEP_TYPES:
+        raise ValueError("%s: unknown stepType '%s', expected %s" % (where, params["stepType"], " or ".join(_STEP_TYPES)))
+
+    rotation = _parse_vector(rotation, (0.0, 0.0, 0.0), where, "rotation")
+
+    return StairsSpec(
+        stairsType,
+        name or _DEFAULT_NAMES[stairsType],
+        generators.complete_params(stairsType, params),
+        _parse_vector(location, (0.0, 0.0, 0.0), where, "location"),
+        tuple(math.radians(angle) for angle in rotation),
+        _parse_vector(scale, (1.0, 1.0, 1.0), where, "scale"),
+    )
+
+
+def parse_json(text):
+    data = json.loads(text)
+    if isinstance(data, dict):
+        data = data.get("stairs")
+    if not isinstance(data, list):
+        raise ValueError("JSON stairs spec must be a list of entries or an object with a 'stairs' list")
+
+    specs = []
+    for i, entry in enumerate(data):
+        where = "entry %d" % i
+        if not isinstance(entry, dict):
+            raise ValueError("%s: expected an object" % where)
+        stairsType = _parse_type(entry.get("type", "straight"), where)
+        params = entry.get("params", {})
+        if not isinstance(params, dict):
+            raise ValueError("%s: params must be an object" % where)
+        specs.append(make_spec(
+            stairsType,
+            params,
+            entry.get("name"),
+            entry.get("location"),
+            entry.get("rotation"),
+            entry.get("scale"),
+            where,
+        ))
+    return specs
+
+
+def parse_csv(text):
+    specs = []
+    reader = csv.DictReader(text.splitlines())
+    for i, row in enumerate(reader):
+        #Header is line 1
+        where = "line %d" % (i + 2)
+        row = {key.strip(): value.strip() for key, value in row.items() if key is not None and value is not None and value.strip() != ""}
+
+        stairsType = _parse_type(row.pop("type", "straight"), where)
+        name = row.pop("name", None)
+
+        transform = {}
+        for key, columns in _TRANSFORM_COLUMNS.items():
+            values = [row.pop(column, None) for column in columns]
+            if any(value is not None for value in values):
+                default = (1.0, 1.0, 1.0) if key == "scale" else (0.0, 0.0, 0.0)
+                transform[key] = [default[j] if value is None else value for j, value in enumerate(values)]
+
+        specs.append(make_spec(stairsType, row, name, where=where, **transform))
+    return specs
+
+
+def load_spec(filepath):
+    """Read a .json or .csv stairs spec file and return a list of StairsSpec."""
+    with open(filepath, newline="") as f:
+        text = f.read()
+
+    if os.path.splitext(filepath)[1].lower() == ".csv":
+        return parse_csv(text)
+    return parse_json(text)
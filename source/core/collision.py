@@ -0,0 +1,125 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Low poly collision proxies for stairs.
+
+A proxy is either a single ramp or a set of separate convex pieces, each
+a prism standing on the floor and reaching up to the top of the highest
+step it covers.  Every piece is closed and faces outwards, so each can be
+used directly as a convex collision shape.
+"""
+
+import math
+import numpy as np
+
+from . import generators
+from .curvedStairs import column_buffers, repeat_turns
+from .lod import effective_params, straight_ramp
+from .meshBuffers import box_buffers, merge_buffers, prism_buffers
+
+RAMP = "RAMP"
+BOXES = "BOXES"
+
+#Largest angle one curved piece may cover and still be convex
+MAX_SEGMENT_DEGREES = 90.0
+
+#Sides of the central column proxy
+COLUMN_SEGMENTS = 12
+
+#Largest angle covered by one edge of the outer side of a curved piece
+OUTER_EDGE_DEGREES = 30.0
+
+
+def segment_edges(numSteps, numSegments):
+    """Where each piece starts and ends, in steps, and the step count each must reach up to."""
+    edges = np.linspace(0, numSteps, numSegments + 1)
+    if numSegments <= numSteps:
+        #Keep pieces on step boundaries
+        edges = np.round(edges)
+    tops = np.ceil(edges[1:] - 1e-9)
+    return edges, tops
+
+
+def straight_proxy(width, height, depth, numSteps, shape=RAMP, numSegments=4):
+    """Ramp, or numSegments boxes following the steps."""
+    if shape == RAMP:
+        return straight_ramp(width, height, depth, True)
+
+    numSegments = max(min(numSegments, numSteps), 1)
+    edges, tops = segment_edges(numSteps, numSegments)
+    stepDepth = depth / numSteps
+    stepHeight = height / numSteps
+    width /= 2
+
+    return merge_buffers([
+        box_buffers((-width, edges[i] * stepDepth, 0), (width, edges[i + 1] * stepDepth, tops[i] * stepHeight))
+        for i in range(numSegments)
+    ])
+
+
+def arc_piece_outline(angle0, angle1, innerRadius, outerRadius):
+    """Convex outline around the part of a ring between two angles.
+
+    The outer side is made of lines tangent to the outer arc, so the
+    outline contains the arc rather than cutting across it.
+    """
+    numEdges = max(math.ceil(math.degrees(angle1 - angle0) / OUTER_EDGE_DEGREES - 1e-9), 1)
+    halfStep = (angle1 - angle0) / (2 * numEdges)
+    #Where the tangents at neighbouring edge ends meet
+    cornerAngles = angle0 + halfStep * (2 * np.arange(numEdges) + 1)
+    cornerRadius = outerRadius / math.cos(halfStep)
+
+    angles = np.concatenate(([angle0], cornerAngles, [angle1], [angle1, angle0]))
+    radii = np.concatenate(([outerRadius], np.full(numEdges, cornerRadius), [outerRadius], [innerRadius, innerRadius]))
+    return np.stack((np.cos(angles) * radii, np.sin(angles) * radii), axis=1)
+
+
+def curved_proxy(height, stepWidth, numSteps, curvature, innerRadius, ccw, numSegments=4, turns=1, centralColumn=False):
+    """One convex piece per angular segment of every turn, and one for the column."""
+    numSegments = max(numSegments, math.ceil(curvature / MAX_SEGMENT_DEGREES), 1)
+    edges, tops = segment_edges(numSteps, numSegments)
+    stepHeight = height / numSteps
+
+    if ccw:
+        offsetX = -innerRadius - stepWidth / 2
+    else:
+        offsetX = innerRadius + stepWidth / 2
+
+    angles = edges * math.radians(curvature) / numSteps
+    pieces = []
+    for i in range(numSegments):
+        outline = arc_piece_outline(angles[i], angles[i + 1], innerRadius, innerRadius + stepWidth)
+        if not ccw:
+            outline[:, 0] = -outline[:, 0]
+        outline[:, 0] += offsetX
+        pieces.append(prism_buffers(outline, 0, tops[i] * stepHeight))
+    buffers = merge_buffers(pieces)
+    if turns > 1:
+        buffers = repeat_turns(buffers, turns, curvature, height, offsetX, ccw)
+    if centralColumn:
+        buffers = merge_buffers([buffers, column_buffers(innerRadius, height * turns, offsetX, COLUMN_SEGMENTS)])
+    return buffers
+
+
+def collision_proxy(stairsType, params, shape=RAMP, numSegments=4):
+    """Collision proxy for the stairs generate would build from params.
+
+    Curved stairs always use convex pieces, shape only applies to straight
+    stairs.
+    """
+    params = effective_params(stairsType, params)
+    if stairsType == generators.STRAIGHT:
+        return straight_proxy(params["width"], params["height"], params["depth"], params["numSteps"], shape, numSegments)
+    return curved_proxy(params["height"], params["stairWidth"], params["numSteps"], params["curvature"],
+        params["innerRadius"], params["ccw"], numSegments, params["turns"], params["centralColumn"])
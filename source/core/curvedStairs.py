@@ -0,0 +1,696 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import functools
+import math
+import numpy as np
+from .meshBuffers import MeshBuffers, MeshTopology, freeze, interleave, loop_starts, merge_buffers, prism_buffers
+
+def add_stairs(height, stepWidth, stepType, numSteps, userStepHeight, curvature, innerRadius, ccw, sides):
+
+    verts = []
+    faces = []
+    uvs = []
+    
+    if stepType == "NUM_STAIRS": 
+        stepHeight = height / numSteps
+    else:
+        stepHeight = userStepHeight
+        numSteps = max(math.floor(height / userStepHeight), 1)
+        height = stepHeight * numSteps
+        
+    deltaAngle = math.radians(curvature) / numSteps
+    stepDepth = 2 * math.pi * (curvature / 360) * (innerRadius + stepWidth / 2) / numSteps
+
+    f = 0
+    
+    if ccw:
+        offsetX = -innerRadius - stepWidth / 2
+    else:
+        offsetX = innerRadius + stepWidth / 2
+    
+    #Draw steps    
+    for i in range(numSteps + 1):
+        if ccw:
+            x = math.cos(i * deltaAngle)
+            y = math.sin(i * deltaAngle)
+        else:
+            x = -math.cos(i * deltaAngle)
+            y = math.sin(i * deltaAngle)
+
+        x0 = x * innerRadius + offsetX
+        y0 = y * innerRadius
+        x1 = x * (innerRadius + stepWidth) + offsetX
+        y1 = y * (innerRadius + stepWidth)
+
+        verts.append((x0, y0, i * stepHeight))
+        verts.append((x1, y1, i * stepHeight))
+        if i != numSteps:
+            verts.append((x0, y0, (i + 1) * stepHeight))
+            verts.append((x1, y1, (i + 1) * stepHeight))
+
+    uvyOffset = 0
+        
+    for i in range(numSteps):
+        faces.append((f + 0, f + 1, f + 3, f + 2))
+        uvs.append(((0, uvyOffset), (stepWidth, uvyOffset), (stepWidth, uvyOffset + stepHeight), (0, uvyOffset + stepHeight)))
+        uvyOffset+= stepHeight
+
+        faces.append((f + 2, f + 3, f + 5, f + 4))
+        uvs.append(((0, uvyOffset), (stepWidth, uvyOffset), (stepWidth, uvyOffset + stepDepth), (0, uvyOffset + stepDepth)))
+        uvyOffset+= stepDepth
+
+        f += 4
+
+    if sides:
+        for i in range(1, numSteps + 1):
+            if ccw:
+                x = math.cos(i * deltaAngle)
+                y = math.sin(i * deltaAngle)
+            else:
+                x = -math.cos(i * deltaAngle)
+                y = math.sin(i * deltaAngle)
+
+            x0 = x * innerRadius + offsetX
+            y0 = y * innerRadius
+            x1 = x * (innerRadius + stepWidth) + offsetX
+            y1 = y * (innerRadius + stepWidth)
+
+            verts.append((x0, y0, 0))
+            verts.append((x1, y1, 0))
+
+        #Side trianges
+        for i in range(0, numSteps):
+            g = i * 4
+            #triangle at step
+            faces.append((g + 0, g + 2, g + 4))
+            uvs.append(((i * stepDepth, verts[g + 0][2]), (i * stepDepth, verts[g + 2][2]), ((i + 1) * stepDepth, verts[g + 4][2])))
+       
+            faces.append((g + 1, g + 5, g + 3))
+            uvs.append(((i * stepDepth, verts[g + 0][2]), ((i + 1) * stepDepth, verts[g + 4][2]), (i * stepDepth, verts[g + 2][2])))
+
+        #side of first step of stairs
+        bottomVertIdxStart = numSteps * 4 + 2
+        faces.append((0, 4, bottomVertIdxStart))
+        uvs.append(((0, verts[0][2]), (stepDepth, verts[4][2]), (stepDepth, verts[bottomVertIdxStart][2])))
+        
+        faces.append((1, bottomVertIdxStart + 1, 5))
+        uvs.append(((0, verts[0][2]), (stepDepth, verts[bottomVertIdxStart][2]), (stepDepth, verts[4][2])))
+            
+        #Side slats
+        for i in range(1, numSteps):
+            g = i * 4
+            h = numSteps * 4 + 2 + (i - 1) * 2
+            
+            faces.append((h + 0, g + 0, g + 4, h + 2))
+            uvs.append(((i * stepDepth, verts[h + 0][2]), (i * stepDepth, verts[g + 0][2]), ((i + 1) * stepDepth, verts[g + 4][2]), ((i + 1) * stepDepth, verts[h + 2][2])))
+
+            faces.append((h + 1, h + 3, g + 5, g + 1))
+            uvs.append(((i * stepDepth, verts[h + 0][2]), ((i + 1) * stepDepth, verts[h + 2][2]), ((i + 1) * stepDepth, verts[g + 4][2]), (i * stepDepth, verts[g + 0][2])))
+        
+        #bottom
+        faces.append((0, bottomVertIdxStart, bottomVertIdxStart + 1, 1))
+        uvs.append(((0, 0), (0, stepDepth), (stepWidth, stepDepth), (stepWidth, 0)))
+
+        for i in range(1, numSteps):
+            h = numSteps * 4 + 2 + (i - 1) * 2
+            faces.append((h + 0, h + 2, h + 3, h + 1))
+            uvs.append(((0, i * stepDepth), (0, (i + 1) * stepDepth), (stepWidth, (i + 1) * stepDepth), (stepWidth, i * stepDepth)))
+
+        #back
+        faces.append((bottomVertIdxStart - 2, bottomVertIdxStart - 1, numSteps * 6 + 1, numSteps * 6))
+        uvs.append(((0, 1), (1, 1), (1, 0), (0, 0)))
+            
+
+    return verts, faces, uvs
+
+
+@functools.lru_cache(maxsize=32)
+def stairs_topology(numSteps, sides, minimalTopology=False):
+    """Face connectivity of add_stairs_buffers.
+
+    It only depends on the number of steps and which faces are built, so it
+    is cached and shared between meshes that only differ in dimensions.
+    """
+
+    f = np.arange(numSteps, dtype=np.int32)[:, None] * 4
+    risers = f + np.array((0, 1, 3, 2), dtype=np.int32)
+    treads = f + np.array((2, 3, 5, 4), dtype=np.int32)
+
+    loopVerts = [interleave(risers, treads).ravel()]
+    loopTotals = [np.full(numSteps * 2, 4, dtype=np.int32)]
+
+    if sides and minimalTopology:
+        loopVerts, loopTotals = _minimal_side_loops(numSteps, loopVerts, loopTotals)
+    elif sides:
+        #Side triangles
+        g = f[:, 0]
+        leftTris = np.stack((g + 0, g + 2, g + 4), axis=1)
+        rightTris = np.stack((g + 1, g + 5, g + 3), axis=1)
+
+        #Side of first step of stairs
+        bottomVertIdxStart = numSteps * 4 + 2
+        b = bottomVertIdxStart
+        firstLoops = np.array((0, 4, b, 1, b + 1, 5), dtype=np.int32)
+
+        #Side slats
+        g = g[1:]
+        h = bottomVertIdxStart + np.arange(numSteps - 1, dtype=np.int32) * 2
+        leftSlats = np.stack((h + 0, g + 0, g + 4, h + 2), axis=1)
+        rightSlats = np.stack((h + 1, h + 3, g + 5, g + 1), axis=1)
+
+        #Bottom
+        bottomLoops = np.empty((numSteps, 4), dtype=np.int32)
+        bottomLoops[0] = (0, b, b + 1, 1)
+        bottomLoops[1:] = np.stack((h + 0, h + 2, h + 3, h + 1), axis=1)
+
+        #Back
+        backLoops = np.array((b - 2, b - 1, numSteps * 6 + 1, numSteps * 6), dtype=np.int32)
+
+        loopVerts += [
+            interleave(leftTris, rightTris).ravel(),
+            firstLoops,
+            interleave(leftSlats, rightSlats).ravel(),
+            bottomLoops.ravel(),
+            backLoops,
+        ]
+        loopTotals += [
+            np.full(numSteps * 2 + 2, 3, dtype=np.int32),
+            np.full((numSteps - 1) * 2 + numSteps + 1, 4, dtype=np.int32),
+        ]
+
+    loopTotals = np.concatenate(loopTotals)
+
+    return freeze(MeshTopology(np.concatenate(loopVerts).astype(np.int32), loop_starts(loopTotals), loopTotals))
+
+
+def _minimal_side_loops(numSteps, loopVerts, loopTotals):
+    #Each side triangle lies in the same vertical plane as the slat below
+    #it, so the two become one face.  The bottom is a single flat n-gon.
+    g = np.arange(1, numSteps, dtype=np.int32) * 4
+    b = numSteps * 4 + 2
+    h = b + np.arange(numSteps - 1, dtype=np.int32) * 2
+
+    #Side of first step of stairs
+    firstLoops = np.array((0, 2, 4, b, 1, b + 1, 5, 3), dtype=np.int32)
+
+    #Sides of the other steps
+    leftSides = np.stack((h + 0, g + 0, g + 2, g + 4, h + 2), axis=1)
+    rightSides = np.stack((h + 1, h + 3, g + 5, g + 3, g + 1), axis=1)
+
+    #Bottom, forward along the left edge and back along the right
+    bottomLeft = b + np.arange(numSteps, dtype=np.int32) * 2
+    bottomLoops = np.concatenate(([0], bottomLeft, bottomLeft[::-1] + 1, [1])).astype(np.int32)
+
+    #Back
+    backLoops = np.array((b - 2, b - 1, numSteps * 6 + 1, numSteps * 6), dtype=np.int32)
+
+    loopVerts = loopVerts + [
+        firstLoops,
+        interleave(leftSides, rightSides).ravel(),
+        bottomLoops,
+        backLoops,
+    ]
+    loopTotals = loopTotals + [
+        np.full(2, 4, dtype=np.int32),
+        np.full((numSteps - 1) * 2, 5, dtype=np.int32),
+        np.array((numSteps * 2 + 2, 4), dtype=np.int32),
+    ]
+    return loopVerts, loopTotals
+
+
+def _minimal_side_uvs(numSteps, stepWidth, stepDepth, u0, u1, zLow, zHigh):
+    #Same u along the arc and v up the side as the default layout
+    firstUvs = np.array((
+        (0, 0), (0, zHigh[0]), (stepDepth, zHigh[0]), (stepDepth, 0),
+        (0, 0), (stepDepth, 0), (stepDepth, zHigh[0]), (0, zHigh[0]),
+    ))
+
+    zeros = np.zeros(numSteps - 1)
+    leftUvs = np.stack((u0[1:], zeros, u0[1:], zLow[1:], u0[1:], zHigh[1:], u1[1:], zHigh[1:], u1[1:], zeros), axis=1).reshape(-1, 5, 2)
+    rightUvs = np.stack((u0[1:], zeros, u1[1:], zeros, u1[1:], zHigh[1:], u0[1:], zHigh[1:], u0[1:], zLow[1:]), axis=1).reshape(-1, 5, 2)
+
+    #Bottom, u across the stairs and v along the arc
+    arc = np.arange(numSteps + 1) * stepDepth
+    bottomUvs = np.empty((numSteps * 2 + 2, 2))
+    bottomUvs[:numSteps + 1, 0] = 0
+    bottomUvs[:numSteps + 1, 1] = arc
+    bottomUvs[numSteps + 1:, 0] = stepWidth
+    bottomUvs[numSteps + 1:, 1] = arc[::-1]
+
+    backUvs = np.array(((0, 1), (1, 1), (1, 0), (0, 0)), dtype=np.float64)
+
+    return [firstUvs, interleave(leftUvs, rightUvs).reshape(-1, 2), bottomUvs, backUvs]
+
+
+#Most segments a single step edge is split into by adaptiveCurve
+MAX_STEP_SEGMENTS = 256
+
+
+def curve_segments(deltaAngle, radius, chordTolerance):
+    """Fewest straight segments an arc of deltaAngle at radius needs to stay within chordTolerance of it."""
+    if chordTolerance <= 0:
+        return MAX_STEP_SEGMENTS
+    #A chord over angle a strays radius * (1 - cos(a / 2)) from its arc
+    maxAngle = 2 * math.acos(max(1 - chordTolerance / radius, -1))
+    return min(max(math.ceil(deltaAngle / maxAngle - 1e-9), 1), MAX_STEP_SEGMENTS)
+
+
+@functools.lru_cache(maxsize=32)
+def adaptive_topology(numSteps, segments, sides, minimalTopology=False):
+    """Face connectivity of add_stairs_buffers when each step edge is split into segments."""
+
+    k = segments
+    numArc = numSteps * k
+
+    #Two floor verts, then k + 1 inner and outer pairs along each tread
+    t = 2 + np.arange(numSteps, dtype=np.int32) * 2 * (k + 1)
+
+    #Risers climb from the end of the previous tread, or the floor
+    lower = np.empty(numSteps, dtype=np.int32)
+    lower[0] = 0
+    lower[1:] = t[:-1] + 2 * k
+    risers = np.stack((lower, lower + 1, t + 1, t), axis=1)
+
+    if minimalTopology:
+        #Treads are flat, so each is one face out along the outer edge and back along the inner
+        outerIdx = np.arange(k + 1, dtype=np.int32) * 2 + 1
+        innerIdx = np.arange(k, 0, -1, dtype=np.int32) * 2
+        treads = t[:, None] + np.concatenate(([0], outerIdx, innerIdx)).astype(np.int32)
+        loopTotals = [np.tile(np.array((4, 2 * k + 2), dtype=np.int32), numSteps)]
+    else:
+        j = np.arange(k, dtype=np.int32) * 2
+        treads = (t[:, None, None] + j[None, :, None] + np.array((0, 1, 3, 2), dtype=np.int32)).reshape(numSteps, -1)
+        loopTotals = [np.full(numSteps * (k + 1), 4, dtype=np.int32)]
+
+    loopVerts = [np.concatenate((risers, treads), axis=1).ravel()]
+
+    if sides:
+        #Floor ring, one inner and outer pair per arc point after the first
+        b = 2 + numSteps * 2 * (k + 1)
+        bottomLeft = np.empty(numArc + 1, dtype=np.int32)
+        bottomLeft[0] = 0
+        bottomLeft[1:] = b + np.arange(numArc, dtype=np.int32) * 2
+        bottomRight = bottomLeft + 1
+        bottomRight[0] = 1
+
+        #Side of first step of stairs
+        firstLoops = np.array((0, t[0], t[0] + 2, bottomLeft[1], 1, bottomRight[1], t[0] + 3, t[0] + 1), dtype=np.int32)
+
+        #First segment of the other steps also holds the riser's lower corner
+        a = np.arange(1, numSteps, dtype=np.int32) * k
+        g = lower[1:]
+        tt = t[1:]
+        leftFirst = np.stack((bottomLeft[a], g, tt, tt + 2, bottomLeft[a + 1]), axis=1)
+        rightFirst = np.stack((bottomRight[a], bottomRight[a + 1], tt + 3, tt + 1, g + 1), axis=1)
+
+        #Remaining segments of every step
+        a = (np.arange(numSteps, dtype=np.int32)[:, None] * k + np.arange(1, k, dtype=np.int32)).ravel()
+        top = (t[:, None] + np.arange(1, k, dtype=np.int32) * 2).ravel()
+        leftStrips = np.stack((bottomLeft[a], top, top + 2, bottomLeft[a + 1]), axis=1)
+        rightStrips = np.stack((bottomRight[a], bottomRight[a + 1], top + 3, top + 1), axis=1)
+
+        #Bottom
+        if minimalTopology:
+            bottomLoops = np.concatenate((bottomLeft, bottomRight[::-1]))
+            bottomTotals = np.array((numArc * 2 + 2,), dtype=np.int32)
+        else:
+            bottomLoops = np.stack((bottomLeft[:-1], bottomLeft[1:], bottomRight[1:], bottomRight[:-1]), axis=1).ravel()
+            bottomTotals = np.full(numArc, 4, dtype=np.int32)
+
+        #Back
+        end = t[-1] + 2 * k
+        backLoops = np.array((end, end + 1, bottomRight[-1], bottomLeft[-1]), dtype=np.int32)
+
+        loopVerts += [
+            firstLoops,
+            interleave(leftFirst, rightFirst).ravel(),
+            interleave(leftStrips, rightStrips).ravel(),
+            bottomLoops,
+            backLoops,
+        ]
+        loopTotals += [
+            np.full(2, 4, dtype=np.int32),
+            np.full((numSteps - 1) * 2, 5, dtype=np.int32),
+            np.full(numSteps * (k - 1) * 2, 4, dtype=np.int32),
+            bottomTotals,
+            np.array((4,), dtype=np.int32),
+        ]
+
+    loopTotals = np.concatenate(loopTotals)
+
+    return freeze(MeshTopology(np.concatenate(loopVerts).astype(np.int32), loop_starts(loopTotals), loopTotals))
+
+
+def _adaptive_buffers(stepWidth, numSteps, stepHeight, stepDepth, deltaAngle, innerRadius, offsetX, ccw, sides, minimalTopology, segments):
+    k = segments
+    numArc = numSteps * k
+    topology = adaptive_topology(numSteps, k, sides, minimalTopology)
+
+    #Angle table of every arc point, shared by the treads and the floor ring
+    arc = np.arange(numArc + 1, dtype=np.float64)
+    angles = arc * deltaAngle / k
+    x = np.cos(angles)
+    y = np.sin(angles)
+    if not ccw:
+        x = -x
+
+    ring = np.zeros((numArc + 1, 2, 3))
+    ring[:, 0, 0] = x * innerRadius + offsetX
+    ring[:, 0, 1] = y * innerRadius
+    ring[:, 1, 0] = x * (innerRadius + stepWidth) + offsetX
+    ring[:, 1, 1] = y * (innerRadius + stepWidth)
+
+    z = np.arange(numSteps + 1, dtype=np.float64) * stepHeight
+
+    treadVerts = ring[np.arange(numSteps)[:, None] * k + np.arange(k + 1)]
+    treadVerts[:, :, :, 2] = z[1:, None, None]
+
+    co = [ring[0], treadVerts.reshape(-1, 3)]
+
+    #Same uvyOffset layout as the unsplit steps, with each tread divided evenly
+    offsets = np.empty(numSteps * 2 + 1)
+    offsets[0] = 0
+    increments = np.empty(numSteps * 2)
+    increments[0::2] = stepHeight
+    increments[1::2] = stepDepth
+    np.cumsum(increments, out=offsets[1:])
+
+    riserUvs = np.empty((numSteps, 4, 2))
+    riserUvs[:, :, 0] = (0, stepWidth, stepWidth, 0)
+    riserUvs[:, 0:2, 1] = offsets[0:-1:2, None]
+    riserUvs[:, 2:4, 1] = offsets[1::2, None]
+
+    treadV = offsets[1::2, None] + np.arange(k + 1) * stepDepth / k
+    if minimalTopology:
+        treadUvs = np.empty((numSteps, 2 * k + 2, 2))
+        treadUvs[:, 0] = 0
+        treadUvs[:, 0, 1] = treadV[:, 0]
+        treadUvs[:, 1:k + 2, 0] = stepWidth
+        treadUvs[:, 1:k + 2, 1] = treadV
+        treadUvs[:, k + 2:, 0] = 0
+        treadUvs[:, k + 2:, 1] = treadV[:, :0:-1]
+    else:
+        treadUvs = np.empty((numSteps, k, 4, 2))
+        treadUvs[:, :, :, 0] = (0, stepWidth, stepWidth, 0)
+        treadUvs[:, :, 0:2, 1] = treadV[:, :-1, None]
+        treadUvs[:, :, 2:4, 1] = treadV[:, 1:, None]
+        treadUvs = treadUvs.reshape(numSteps, -1, 2)
+
+    loopUvs = [np.concatenate((riserUvs, treadUvs), axis=1).reshape(-1, 2)]
+
+    if sides:
+        co.append(ring[1:].reshape(-1, 3))
+
+        #u runs along the arc, v is height
+        u = arc * stepDepth / k
+
+        #Side of first step of stairs
+        u1 = u[1]
+        z1 = z[1]
+        firstUvs = np.array((
+            (0, 0), (0, z1), (u1, z1), (u1, 0),
+            (0, 0), (u1, 0), (u1, z1), (0, z1),
+        ))
+
+        a = np.arange(1, numSteps) * k
+        zeros = np.zeros(numSteps - 1)
+        zLow = z[1:-1]
+        zHigh = z[2:]
+        leftFirstUvs = np.stack((u[a], zeros, u[a], zLow, u[a], zHigh, u[a + 1], zHigh, u[a + 1], zeros), axis=1).reshape(-1, 5, 2)
+        rightFirstUvs = np.stack((u[a], zeros, u[a + 1], zeros, u[a + 1], zHigh, u[a], zHigh, u[a], zLow), axis=1).reshape(-1, 5, 2)
+
+        a = (np.arange(numSteps)[:, None] * k + np.arange(1, k)).ravel()
+        zeros = np.zeros(len(a))
+        zTop = np.repeat(z[1:], k - 1)
+        leftStripUvs = np.stack((u[a], zeros, u[a], zTop, u[a + 1], zTop, u[a + 1], zeros), axis=1).reshape(-1, 4, 2)
+        rightStripUvs = np.stack((u[a], zeros, u[a + 1], zeros, u[a + 1], zTop, u[a], zTop), axis=1).reshape(-1, 4, 2)
+
+        #Bottom
+        if minimalTopology:
+            bottomUvs = np.empty((numArc * 2 + 2, 2))
+            bottomUvs[:numArc + 1, 0] = 0
+            bottomUvs[:numArc + 1, 1] = u
+            bottomUvs[numArc + 1:, 0] = stepWidth
+            bottomUvs[numArc + 1:, 1] = u[::-1]
+        else:
+            bottomUvs = np.empty((numArc, 4, 2))
+            bottomUvs[:, :, 0] = (0, 0, stepWidth, stepWidth)
+            bottomUvs[:, 0, 1] = u[:-1]
+            bottomUvs[:, 1, 1] = u[1:]
+            bottomUvs[:, 2, 1] = u[1:]
+            bottomUvs[:, 3, 1] = u[:-1]
+
+        #Back
+        backUvs = np.array(((0, 1), (1, 1), (1, 0), (0, 0)), dtype=np.float64)
+
+        loopUvs += [
+            firstUvs,
+            interleave(leftFirstUvs, rightFirstUvs).reshape(-1, 2),
+            interleave(leftStripUvs, rightStripUvs).reshape(-1, 2),
+            bottomUvs.reshape(-1, 2),
+            backUvs,
+        ]
+
+    return MeshBuffers(np.concatenate(co), topology.loopVerts, topology.loopStarts, topology.loopTotals, np.concatenate(loopUvs))
+
+
+#Sides of the central column when adaptiveCurve is off
+COLUMN_SEGMENTS = 32
+
+
+def repeat_turns(buffers, turns, curvature, height, offsetX, ccw, weld=False, walkLoops=0, walkLength=0.0):
+    """Stack copies of one turn, each rotated by curvature about the stairs centre and lifted by height.
+
+    With weld the first two vertices of every turn are merged into the last
+    two of the turn below.  The v coordinate of the first walkLoops loops
+    carries on from the turn below by walkLength.
+    """
+
+    numVerts = buffers.numVerts
+    turn = np.arange(turns)
+    angle = turn * math.radians(curvature if ccw else -curvature)
+    cos = np.cos(angle)[:, None]
+    sin = np.sin(angle)[:, None]
+
+    x = buffers.co[:, 0] - offsetX
+    y = buffers.co[:, 1]
+    co = np.empty((turns, numVerts, 3))
+    co[:, :, 0] = cos * x - sin * y + offsetX
+    co[:, :, 1] = sin * x + cos * y
+    co[:, :, 2] = buffers.co[:, 2] + turn[:, None] * height
+
+    vertMap = np.empty((turns, numVerts), dtype=np.int32)
+    if weld and turns > 1:
+        #Later turns add all but their first two vertices
+        starts = numVerts + (turn - 1) * (numVerts - 2)
+        starts[0] = 0
+        vertMap[0] = np.arange(numVerts)
+        vertMap[1:, 2:] = starts[1:, None] + np.arange(numVerts - 2)
+        ends = vertMap[:-1, -2]
+        vertMap[1:, 0] = ends
+        vertMap[1:, 1] = ends + 1
+        co = np.concatenate((co[0], co[1:, 2:].reshape(-1, 3)))
+    else:
+        vertMap[:] = turn[:, None] * numVerts + np.arange(numVerts)
+        co = co.reshape(-1, 3)
+
+    uvs = np.repeat(buffers.uvs[None], turns, axis=0)
+    uvs[:, :walkLoops, 1] += turn[:, None] * walkLength
+
+    loopTotals = np.tile(buffers.loopTotals, turns)
+    return MeshBuffers(
+        co,
+        vertMap[:, buffers.loopVerts].ravel(),
+        loop_starts(loopTotals),
+        loopTotals,
+        uvs.reshape(-1, 2),
+    )
+
+
+def column_buffers(radius, height, offsetX, segments=COLUMN_SEGMENTS):
+    """Closed cylinder around the stairs centre from the floor up to height."""
+    angles = np.arange(segments) * 2 * math.pi / segments
+    outline = np.stack((np.cos(angles) * radius + offsetX, np.sin(angles) * radius), axis=1)
+    return prism_buffers(outline, 0, height)
+
+
+def walking_loops(numSteps, segments, minimalTopology):
+    """Number of loops in the risers and treads, which come first in every layout."""
+    if segments == 1:
+        return numSteps * 8
+    if minimalTopology:
+        return numSteps * (2 * segments + 6)
+    return numSteps * 4 * (segments + 1)
+
+
+def ring_stairs_buffers(ring, stepWidth, stepHeight, stepDepth, sides, minimalTopology=False):
+    """Stairs with their step edges along ring, a (numSteps + 1, 2, 2) array of inner and outer xy points.
+
+    Step i climbs from ring[i] to ring[i + 1].  stepDepth is the length of
+    a tread along the middle of the stairs and sets the uvyOffset spacing.
+    """
+
+    numSteps = len(ring) - 1
+    topology = stairs_topology(numSteps, sides, minimalTopology)
+
+    steps = np.arange(numSteps + 1, dtype=np.float64)
+    z = steps * stepHeight
+
+    #Draw steps
+    stepVerts = np.empty((numSteps, 4, 3))
+    stepVerts[:, 0:2, 0:2] = ring[:-1]
+    stepVerts[:, 2:4, 0:2] = ring[:-1]
+    stepVerts[:, 0:2, 2] = z[:-1, None]
+    stepVerts[:, 2:4, 2] = z[1:, None]
+
+    topVerts = np.empty((2, 3))
+    topVerts[:, 0:2] = ring[-1]
+    topVerts[:, 2] = z[-1]
+
+    co = [stepVerts.reshape(-1, 3), topVerts]
+
+    offsets = np.empty(numSteps * 2 + 1)
+    offsets[0] = 0
+    increments = np.empty(numSteps * 2)
+    increments[0::2] = stepHeight
+    increments[1::2] = stepDepth
+    np.cumsum(increments, out=offsets[1:])
+
+    stepUvs = np.empty((numSteps * 2, 4, 2))
+    stepUvs[:, :, 0] = (0, stepWidth, stepWidth, 0)
+    stepUvs[:, 0:2, 1] = offsets[:-1, None]
+    stepUvs[:, 2:4, 1] = offsets[1:, None]
+
+    loopUvs = [stepUvs.reshape(-1, 2)]
+
+    if sides:
+        bottomVerts = np.zeros((numSteps, 2, 3))
+        bottomVerts[:, :, 0:2] = ring[1:]
+        co.append(bottomVerts.reshape(-1, 3))
+
+        #u runs along the arc, v is height
+        u0 = steps[:-1] * stepDepth
+        u1 = (steps[:-1] + 1) * stepDepth
+        zLow = z[:-1]
+        zHigh = (steps[:-1] + 1) * stepHeight
+
+        if minimalTopology:
+            loopUvs += _minimal_side_uvs(numSteps, stepWidth, stepDepth, u0, u1, zLow, zHigh)
+        else:
+            #Side triangles
+            leftTriUvs = np.stack((u0, zLow, u0, zHigh, u1, zHigh), axis=1).reshape(-1, 3, 2)
+            rightTriUvs = np.stack((u0, zLow, u1, zHigh, u0, zHigh), axis=1).reshape(-1, 3, 2)
+
+            #Side of first step of stairs
+            firstUvs = np.array((
+                (0, z[0]), (stepDepth, zHigh[0]), (stepDepth, 0),
+                (0, z[0]), (stepDepth, 0), (stepDepth, zHigh[0]),
+            ))
+
+            #Side slats
+            zeros = np.zeros(numSteps - 1)
+            leftSlatUvs = np.stack((u0[1:], zeros, u0[1:], zLow[1:], u1[1:], zHigh[1:], u1[1:], zeros), axis=1).reshape(-1, 4, 2)
+            rightSlatUvs = np.stack((u0[1:], zeros, u1[1:], zeros, u1[1:], zHigh[1:], u0[1:], zLow[1:]), axis=1).reshape(-1, 4, 2)
+
+            #Bottom
+            bottomUvs = np.empty((numSteps, 4, 2))
+            bottomUvs[:, :, 0] = (0, 0, stepWidth, stepWidth)
+            bottomUvs[:, 0, 1] = u0
+            bottomUvs[:, 1, 1] = u1
+            bottomUvs[:, 2, 1] = u1
+            bottomUvs[:, 3, 1] = u0
+
+            #Back
+            backUvs = np.array(((0, 1), (1, 1), (1, 0), (0, 0)), dtype=np.float64)
+
+            loopUvs += [
+                interleave(leftTriUvs, rightTriUvs).reshape(-1, 2),
+                firstUvs,
+                interleave(leftSlatUvs, rightSlatUvs).reshape(-1, 2),
+                bottomUvs.reshape(-1, 2),
+                backUvs,
+            ]
+
+    return MeshBuffers(np.concatenate(co), topology.loopVerts, topology.loopStarts, topology.loopTotals, np.concatenate(loopUvs))
+
+
+def add_stairs_buffers(height, stepWidth, stepType, numSteps, userStepHeight, curvature, innerRadius, ccw, sides,
+        minimalTopology=False, adaptiveCurve=False, chordTolerance=0.001, turns=1, centralColumn=False):
+    """Vectorized add_stairs.  Returns the same mesh as flat MeshBuffers arrays.
+
+    With minimalTopology the sides and bottom use as few faces as possible,
+    one per step on each side and a single n-gon underneath.  Every vertex
+    of the default layout is still needed, so only the faces change.
+
+    With adaptiveCurve the curved edges of each step are split into just
+    enough segments to stay within chordTolerance of the true arc.
+
+    The other parameters describe one turn.  When turns is more than one
+    that turn is built once and copied upwards by repeat_turns.
+    """
+
+    if stepType == "NUM_STAIRS":
+        stepHeight = height / numSteps
+    else:
+        stepHeight = userStepHeight
+        numSteps = max(math.floor(height / userStepHeight), 1)
+        height = stepHeight * numSteps
+
+    deltaAngle = math.radians(curvature) / numSteps
+    stepDepth = 2 * math.pi * (curvature / 360) * (innerRadius + stepWidth / 2) / numSteps
+
+    if ccw:
+        offsetX = -innerRadius - stepWidth / 2
+    else:
+        offsetX = innerRadius + stepWidth / 2
+
+    segments = 1
+    if adaptiveCurve:
+        segments = curve_segments(deltaAngle, innerRadius + stepWidth, chordTolerance)
+
+    if turns > 1 or centralColumn:
+        buffers = add_stairs_buffers(height, stepWidth, "NUM_STAIRS", numSteps, stepHeight, curvature, innerRadius, ccw, sides,
+            minimalTopology, adaptiveCurve, chordTolerance)
+        if turns > 1:
+            #Risers and treads continue the uvyOffset layout of the turn below
+            buffers = repeat_turns(buffers, turns, curvature, height, offsetX, ccw, not sides,
+                walking_loops(numSteps, segments, minimalTopology), height + stepDepth * numSteps)
+        if centralColumn:
+            columnSegments = COLUMN_SEGMENTS
+            if adaptiveCurve:
+                columnSegments = max(curve_segments(2 * math.pi, innerRadius, chordTolerance), 8)
+            buffers = merge_buffers([buffers, column_buffers(innerRadius, height * turns, offsetX, columnSegments)])
+        return buffers
+
+    if adaptiveCurve:
+        if segments > 1:
+            return _adaptive_buffers(stepWidth, numSteps, stepHeight, stepDepth, deltaAngle, innerRadius, offsetX, ccw, sides, minimalTopology, segments)
+
+    #Angle table shared by the steps and the bottom ring
+    steps = np.arange(numSteps + 1, dtype=np.float64)
+    angles = steps * deltaAngle
+    x = np.cos(angles)
+    y = np.sin(angles)
+    if not ccw:
+        x = -x
+
+    ring = np.empty((numSteps + 1, 2, 2))
+    ring[:, 0, 0] = x * innerRadius + offsetX
+    ring[:, 0, 1] = y * innerRadius
+    ring[:, 1, 0] = x * (innerRadius + stepWidth) + offsetX
+    ring[:, 1, 1] = y * (innerRadius + stepWidth)
+
+    return ring_stairs_buffers(ring, stepWidth, stepHeight, stepDepth, sides, minimalTopology)
@@ -0,0 +1,187 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Generated stairs geometry stored on disk, shared between sessions and processes.
+
+Each parameter set is stored in its own directory, named after a hash of
+the generator version, the stairs type and every parameter, holding one
+.npy file per MeshBuffers array.  Entries are written to a temporary
+directory and renamed into place, so readers never see a partial entry,
+and are read back memory mapped.  When the cache grows past its size
+limit the least recently used entries are deleted.  The folder is only
+scanned for that once the running total of the entries this process
+wrote goes over the limit, so storing an entry does not cost time in
+proportion to the size of the cache.
+"""
+
+import hashlib
+import os
+import shutil
+import uuid
+
+import numpy as np
+
+from .geometryCache import buffers_nbytes, params_key
+from .meshBuffers import MeshBuffers, compact_buffers, freeze
+
+#Increase whenever the generators produce different geometry for the same
+#parameters, so entries written by older versions are no longer found
+GENERATOR_VERSION = 1
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+_TEMP_PREFIX = ".tmp-"
+
+
+def disk_key(stairsType, params, precision=1e-5):
+    """Hex digest naming the cache entry of a stairs parameter set."""
+    key = (GENERATOR_VERSION,) + params_key(stairsType, params, precision)
+    return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+
+
+def _entry_size(entryPath):
+    size = 0
+    for item in os.scandir(entryPath):
+        size += item.stat().st_size
+    return size
+
+
+class DiskCache:
+    """Content addressed store of MeshBuffers under path, kept below maxBytes."""
+
+    def __init__(self, path, maxBytes=DEFAULT_MAX_BYTES, precision=1e-5):
+        self.path = path
+        self.maxBytes = maxBytes
+        self.precision = precision
+        self.hits = 0
+        self.misses = 0
+        #Size of the folder at the last scan plus the entries written since,
+        #None until the first scan.  Other processes writing to the same
+        #folder are only seen by the next scan.
+        self.knownBytes = None
+
+    def entry_path(self, stairsType, params):
+        return os.path.join(self.path, disk_key(stairsType, params, self.precision))
+
+    def _read(self, entryPath):
+        try:
+            buffers = MeshBuffers(*[
+                np.load(os.path.join(entryPath, name + ".npy"), mmap_mode="r", allow_pickle=False)
+                for name in MeshBuffers._fields
+            ])
+            #Mark as recently used for eviction
+            os.utime(entryPath)
+        except (OSError, ValueError):
+            #Missing, or removed by another process while being read
+            return None
+        return buffers
+
+    def load(self, stairsType, params):
+        """Memory mapped, read only MeshBuffers for params, or None if they are not cached."""
+        buffers = self._read(self.entry_path(stairsType, params))
+        if buffers is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return buffers
+
+    def store(self, stairsType, params, buffers, evict=True):
+        """Write buffers as float32 and int32 arrays and return them read back from disk.
+
+        Pass evict=False when storing many entries and call evict once afterwards.
+        """
+        compact = freeze(compact_buffers(buffers))
+        if buffers_nbytes(compact) > self.maxBytes:
+            #Storing it would flush every other entry and then itself
+            return compact
+
+        entryPath = self.entry_path(stairsType, params)
+        try:
+            self._write(entryPath, compact)
+            if self.knownBytes is not None:
+                self.knownBytes += _entry_size(entryPath)
+            if evict and (self.knownBytes is None or self.knownBytes > self.maxBytes):
+                self.evict()
+        except OSError:
+            #An unusable cache folder must not stop the stairs being built
+            return compact
+
+        stored = self._read(entryPath)
+        if stored is None:
+            #Evicted by another process sharing the folder
+            stored = compact
+        return stored
+
+    def _write(self, entryPath, buffers):
+        os.makedirs(self.path, exist_ok=True)
+
+        tempPath = os.path.join(self.path, _TEMP_PREFIX + uuid.uuid4().hex)
+        os.mkdir(tempPath)
+        try:
+            for name, array in zip(MeshBuffers._fields, buffers):
+                np.save(os.path.join(tempPath, name + ".npy"), array, allow_pickle=False)
+            try:
+                os.rename(tempPath, entryPath)
+            except OSError:
+                #Either another process stored the same entry first, or a
+                #damaged entry is in the way, eg one left behind when an
+                #eviction could not delete memory mapped files
+                if self._read(entryPath) is not None:
+                    return
+                shutil.rmtree(entryPath, ignore_errors=True)
+                os.rename(tempPath, entryPath)
+        finally:
+            shutil.rmtree(tempPath, ignore_errors=True)
+
+    def get(self, stairsType, params, generate):
+        """Cached buffers for params, calling generate(stairsType, params) and storing the result on a miss."""
+        buffers = self.load(stairsType, params)
+        if buffers is None:
+            buffers = self.store(stairsType, params, generate(stairsType, params))
+        return buffers
+
+    def entries(self):
+        """(mtime, size, path) of every complete entry."""
+        entries = []
+        try:
+            items = list(os.scandir(self.path))
+        except OSError:
+            return entries
+        for item in items:
+            if item.name.startswith(_TEMP_PREFIX) or not item.is_dir():
+                continue
+            try:
+                entries.append((item.stat().st_mtime, _entry_size(item.path), item.path))
+            except OSError:
+                continue
+        return entries
+
+    def size(self):
+        return sum(size for mtime, size, path in self.entries())
+
+    def evict(self):
+        """Delete the least recently used entries until the cache fits in maxBytes."""
+        entries = sorted(self.entries())
+        total = sum(size for mtime, size, path in entries)
+        for mtime, size, path in entries:
+            if total <= self.maxBytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+        self.knownBytes = total
+
+    def clear(self):
+        for mtime, size, path in self.entries():
+            shutil.rmtree(path, ignore_errors=True)
+        self.knownBytes = None
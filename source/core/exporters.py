@@ -0,0 +1,267 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Write MeshBuffers straight to OBJ, binary PLY and binary glTF files.
+
+The writers work through the faces a chunk at a time, so no text or
+triangulated copy of the whole mesh is ever held in memory.
+
+A spec file can be exported without Blender:
+
+    python -m stairs.core.exporters spec.json outDir --format glb
+"""
+
+import argparse
+import json
+import os
+import struct
+
+import numpy as np
+
+from . import generators
+from .batchSpec import load_spec
+from .meshBuffers import transform_buffers, transform_matrix
+
+CHUNK_FACES = 65536
+
+FORMATS = (".obj", ".ply", ".glb")
+
+
+def face_chunks(buffers, chunkFaces=CHUNK_FACES):
+    """Yield (faceStart, faceEnd, loopStart, loopEnd) ranges of at most chunkFaces faces."""
+    for faceStart in range(0, buffers.numFaces, chunkFaces):
+        faceEnd = min(faceStart + chunkFaces, buffers.numFaces)
+        loopStart = int(buffers.loopStarts[faceStart])
+        loopEnd = int(buffers.loopStarts[faceEnd - 1] + buffers.loopTotals[faceEnd - 1])
+        yield faceStart, faceEnd, loopStart, loopEnd
+
+
+def equal_size_runs(loopTotals):
+    """Split a range of faces into runs of consecutive faces with the same loop count."""
+    if len(loopTotals) == 0:
+        return
+    breaks = np.flatnonzero(np.diff(loopTotals)) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(loopTotals)]))
+    for start, end in zip(starts, ends):
+        yield start, end, int(loopTotals[start])
+
+
+def write_obj(buffers, filepath, name="Stairs", chunkFaces=CHUNK_FACES):
+    with open(filepath, "w") as f:
+        f.write("# Kitfox stairs\n")
+        f.write("o %s\n" % name)
+
+        for start in range(0, buffers.numVerts, chunkFaces):
+            np.savetxt(f, buffers.co[start:start + chunkFaces], fmt="v %.6f %.6f %.6f")
+
+        #One texture coordinate per loop, so vt indices are loop indices
+        for start in range(0, buffers.numLoops, chunkFaces):
+            np.savetxt(f, buffers.uvs[start:start + chunkFaces], fmt="vt %.6f %.6f")
+
+        for faceStart, faceEnd, loopStart, loopEnd in face_chunks(buffers, chunkFaces):
+            totals = buffers.loopTotals[faceStart:faceEnd]
+            loop = loopStart
+            for start, end, size in equal_size_runs(totals):
+                count = (end - start) * size
+                corners = np.empty((end - start, size, 2), dtype=np.int64)
+                corners[:, :, 0] = buffers.loopVerts[loop:loop + count].reshape(-1, size) + 1
+                corners[:, :, 1] = np.arange(loop, loop + count).reshape(-1, size) + 1
+                np.savetxt(f, corners.reshape(end - start, -1), fmt="f" + " %d/%d" * size)
+                loop += count
+
+
+def write_ply(buffers, filepath, chunkFaces=CHUNK_FACES):
+    """Binary little endian PLY with per face corner texture coordinates."""
+    maxTotal = int(buffers.loopTotals.max()) if buffers.numFaces else 0
+    countType, countDtype = ("uchar", "u1") if maxTotal * 2 < 256 else ("uint", "<u4")
+
+    header = "\n".join((
+        "ply",
+        "format binary_little_endian 1.0",
+        "comment Kitfox stairs",
+        "element vertex %d" % buffers.numVerts,
+        "property float x",
+        "property float y",
+        "property float z",
+        "element face %d" % buffers.numFaces,
+        "property list %s int vertex_indices" % countType,
+        "property list %s float texcoord" % countType,
+        "end_header",
+    )) + "\n"
+
+    with open(filepath, "wb") as f:
+        f.write(header.encode("ascii"))
+
+        for start in range(0, buffers.numVerts, chunkFaces):
+            f.write(buffers.co[start:start + chunkFaces].astype("<f4").tobytes())
+
+        for faceStart, faceEnd, loopStart, loopEnd in face_chunks(buffers, chunkFaces):
+            totals = buffers.loopTotals[faceStart:faceEnd]
+            loop = loopStart
+            for start, end, size in equal_size_runs(totals):
+                count = (end - start) * size
+                record = np.dtype([
+                    ("numVerts", countDtype), ("verts", "<i4", (size,)),
+                    ("numUvs", countDtype), ("uvs", "<f4", (size * 2,)),
+                ])
+                faces = np.empty(end - start, dtype=record)
+                faces["numVerts"] = size
+                faces["verts"] = buffers.loopVerts[loop:loop + count].reshape(-1, size)
+                faces["numUvs"] = size * 2
+                faces["uvs"] = buffers.uvs[loop:loop + count].reshape(-1, size * 2)
+                f.write(faces.tobytes())
+                loop += count
+
+
+def fan_triangles(loopStarts, loopTotals):
+    """Loop indices of a triangle fan for each face, as a (numTris, 3) array."""
+    trisPerFace = loopTotals - 2
+    first = np.repeat(loopStarts, trisPerFace)
+    #Position of each triangle within its face
+    offsets = np.arange(len(first)) - np.repeat(np.cumsum(trisPerFace) - trisPerFace, trisPerFace)
+    return np.stack((first, first + offsets + 1, first + offsets + 2), axis=1)
+
+
+def to_gltf_space(co):
+    #glTF is y up
+    return np.stack((co[:, 0], co[:, 2], -co[:, 1]), axis=1)
+
+
+def write_glb(buffers, filepath, name="Stairs", chunkFaces=CHUNK_FACES):
+    """Binary glTF 2.0 with one vertex per loop and fan triangulated faces.
+
+    Fan triangulation is only correct for convex faces.  Build straight
+    stairs with splitSides and curved stairs without minimalTopology when
+    exporting, export_stairs does this.
+    """
+
+    numLoops = buffers.numLoops
+    numTris = int(np.sum(buffers.loopTotals - 2))
+
+    positionBytes = numLoops * 12
+    uvBytes = numLoops * 8
+    indexBytes = numTris * 12
+    binLength = positionBytes + uvBytes + indexBytes
+
+    if buffers.numVerts:
+        used = to_gltf_space(buffers.co)
+        posMin = used.min(axis=0).tolist()
+        posMax = used.max(axis=0).tolist()
+    else:
+        posMin = posMax = [0.0, 0.0, 0.0]
+
+    gltf = {
+        "asset": {"version": "2.0", "generator": "Kitfox stairs"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0, "name": name}],
+        "meshes": [{
+            "name": name,
+            "primitives": [{"attributes": {"POSITION": 0, "TEXCOORD_0": 1}, "indices": 2, "mode": 4}],
+        }],
+        "buffers": [{"byteLength": binLength}],
+        "bufferViews": [
+            {"buffer": 0, "byteOffset": 0, "byteLength": positionBytes, "target": 34962},
+            {"buffer": 0, "byteOffset": positionBytes, "byteLength": uvBytes, "target": 34962},
+            {"buffer": 0, "byteOffset": positionBytes + uvBytes, "byteLength": indexBytes, "target": 34963},
+        ],
+        "accessors": [
+            {"bufferView": 0, "componentType": 5126, "count": numLoops, "type": "VEC3", "min": posMin, "max": posMax},
+            {"bufferView": 1, "componentType": 5126, "count": numLoops, "type": "VEC2"},
+            {"bufferView": 2, "componentType": 5125, "count": numTris * 3, "type": "SCALAR"},
+        ],
+    }
+
+    jsonChunk = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    jsonChunk += b" " * (-len(jsonChunk) % 4)
+
+    with open(filepath, "wb") as f:
+        f.write(struct.pack("<4sII", b"glTF", 2, 12 + 8 + len(jsonChunk) + 8 + binLength))
+        f.write(struct.pack("<I4s", len(jsonChunk), b"JSON"))
+        f.write(jsonChunk)
+        f.write(struct.pack("<I4s", binLength, b"BIN\x00"))
+
+        for faceStart, faceEnd, loopStart, loopEnd in face_chunks(buffers, chunkFaces):
+            co = buffers.co[buffers.loopVerts[loopStart:loopEnd]]
+            f.write(to_gltf_space(co).astype("<f4").tobytes())
+
+        for faceStart, faceEnd, loopStart, loopEnd in face_chunks(buffers, chunkFaces):
+            uvs = buffers.uvs[loopStart:loopEnd].astype("<f4")
+            #glTF puts the texture origin at the top left
+            uvs[:, 1] = 1 - uvs[:, 1]
+            f.write(uvs.tobytes())
+
+        for faceStart, faceEnd, loopStart, loopEnd in face_chunks(buffers, chunkFaces):
+            tris = fan_triangles(buffers.loopStarts[faceStart:faceEnd], buffers.loopTotals[faceStart:faceEnd])
+            f.write(tris.astype("<u4").tobytes())
+
+
+def write_buffers(buffers, filepath, name="Stairs"):
+    """Write buffers in the format given by the extension of filepath."""
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext == ".obj":
+        write_obj(buffers, filepath, name)
+    elif ext == ".ply":
+        write_ply(buffers, filepath)
+    elif ext == ".glb":
+        write_glb(buffers, filepath, name)
+    else:
+        raise ValueError("Unsupported export format '%s', expected one of %s" % (ext, ", ".join(FORMATS)))
+
+
+def export_stairs(filepath, stairsType, params, name="Stairs", matrix=None):
+    """Generate a staircase and write it to filepath."""
+    params = generators.complete_params(stairsType, params)
+    if filepath.lower().endswith(".glb"):
+        #Straight side n-gons, and the minimal topology bottom and treads of
+        #curved stairs, are not convex and would not survive fan triangulation
+        if stairsType == generators.STRAIGHT:
+            params["splitSides"] = True
+        else:
+            params["minimalTopology"] = False
+
+    buffers = generators.generate(stairsType, params)
+    if matrix is not None:
+        buffers = transform_buffers(buffers, matrix)
+    write_buffers(buffers, filepath, name)
+
+
+def export_spec(specPath, outDir, ext=".glb", applyTransforms=False):
+    """Write every staircase in a spec file to its own file in outDir."""
+    os.makedirs(outDir, exist_ok=True)
+    paths = []
+    for i, spec in enumerate(load_spec(specPath)):
+        matrix = transform_matrix(spec.location, spec.rotation, spec.scale) if applyTransforms else None
+        fileName = "%s_%d%s" % ("".join(c if c.isalnum() or c in "-_" else "_" for c in spec.name), i, ext)
+        path = os.path.join(outDir, fileName)
+        export_stairs(path, spec.stairsType, spec.params, spec.name, matrix)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the staircases listed in a JSON or CSV spec to mesh files.")
+    parser.add_argument("spec", help="JSON or CSV stairs spec")
+    parser.add_argument("outDir", help="directory to write the files to")
+    parser.add_argument("--format", choices=[ext[1:] for ext in FORMATS], default="glb")
+    parser.add_argument("--apply-transforms", action="store_true", help="bake the spec location, rotation and scale into the vertices")
+    args = parser.parse_args(argv)
+
+    paths = export_spec(args.spec, args.outDir, "." + args.format, args.apply_transforms)
+    print("Wrote %d files to %s" % (len(paths), args.outDir))
+
+
+if __name__ == "__main__":
+    main()
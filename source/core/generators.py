@@ -0,0 +1,86 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import importlib
+
+STRAIGHT = "STRAIGHT"
+CURVED = "CURVED"
+
+#Parameters of each stairs type, named after the operator properties and
+#in the order the add_stairs_buffers functions take them
+STAIRS_PARAMS = {
+    STRAIGHT: ("width", "height", "depth", "stepType", "numSteps", "stepHeight", "sides", "splitSides"),
+    CURVED: ("height", "stairWidth", "stepType", "numSteps", "stepHeight", "curvature", "innerRadius", "ccw", "sides",
+        "minimalTopology", "adaptiveCurve", "chordTolerance", "turns", "centralColumn"),
+}
+
+#Operator defaults, used for parameters a caller leaves out
+STAIRS_DEFAULTS = {
+    STRAIGHT: {
+        "width": 2.0,
+        "height": 1.0,
+        "depth": 2.0,
+        "stepType": "NUM_STAIRS",
+        "numSteps": 6,
+        "stepHeight": 0.16666,
+        "sides": True,
+        "splitSides": False,
+    },
+    CURVED: {
+        "height": 1.0,
+        "stairWidth": 1.0,
+        "stepType": "NUM_STAIRS",
+        "numSteps": 6,
+        "stepHeight": 0.16666,
+        "curvature": 60.0,
+        "innerRadius": 1.0,
+        "ccw": True,
+        "sides": True,
+        "minimalTopology": False,
+        "adaptiveCurve": False,
+        "chordTolerance": 0.001,
+        "turns": 1,
+        "centralColumn": False,
+    },
+}
+
+#Modules holding the add_stairs_buffers function of each type.  They pull
+#in NumPy, so they are only imported once geometry is generated.
+_GENERATOR_MODULES = {
+    STRAIGHT: "straightStairs",
+    CURVED: "curvedStairs",
+}
+
+
+def params_from(stairsType, source):
+    """Collect the parameters of stairsType from the attributes of source, eg an operator."""
+    return {name: getattr(source, name) for name in STAIRS_PARAMS[stairsType]}
+
+
+def complete_params(stairsType, params):
+    """Copy of params with missing entries filled in from the operator defaults."""
+    if stairsType not in _GENERATOR_MODULES:
+        raise ValueError("Unknown stairs type: %s" % stairsType)
+    unknown = set(params) - set(STAIRS_PARAMS[stairsType])
+    if unknown:
+        raise ValueError("Unknown %s stairs parameters: %s" % (stairsType.lower(), ", ".join(sorted(unknown))))
+    return dict(STAIRS_DEFAULTS[stairsType], **params)
+
+
+def generate(stairsType, params):
+    """Build MeshBuffers for stairsType from a dict of operator parameters."""
+    params = complete_params(stairsType, params)
+    module = importlib.import_module("." + _GENERATOR_MODULES[stairsType], __package__)
+    return module.add_stairs_buffers(*[params[name] for name in STAIRS_PARAMS[stairsType]])
@@ -0,0 +1,129 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import hashlib
+from collections import OrderedDict
+
+from . import generators
+
+
+def quantize(value, precision):
+    """Map floats that only differ by less than precision to the same key value."""
+    if isinstance(value, float):
+        return round(value / precision)
+    return value
+
+
+def params_key(stairsType, params, precision=1e-5):
+    """Hashable key for a stairs parameter set."""
+    params = generators.complete_params(stairsType, params)
+    return (stairsType,) + tuple(quantize(params[name], precision) for name in generators.STAIRS_PARAMS[stairsType])
+
+
+def params_hash(stairsType, params, precision=1e-5):
+    """Stable hex digest of a stairs parameter set, for storing in files."""
+    return hashlib.sha1(repr(params_key(stairsType, params, precision)).encode("utf-8")).hexdigest()
+
+
+def buffers_nbytes(buffers):
+    return sum(array.nbytes for array in buffers)
+
+
+class GeometryCache:
+    """Bounded LRU cache of generated MeshBuffers keyed on quantized stairs parameters."""
+
+    def __init__(self, maxEntries=64, maxBytes=256 * 1024 * 1024, precision=1e-5):
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.precision = precision
+        self.numBytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self.diskCachePath = ""
+        self.diskCacheBytes = 0
+        self._diskCache = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def set_limits(self, maxEntries, maxBytes):
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self._evict()
+
+    def set_disk_cache(self, path, maxBytes):
+        """Back the cache with a DiskCache under path, shared between sessions.  An empty path turns it off."""
+        if path != self.diskCachePath or maxBytes != self.diskCacheBytes:
+            self.diskCachePath = path
+            self.diskCacheBytes = maxBytes
+            self._diskCache = None
+
+    def disk_cache(self):
+        """The DiskCache in use, or None.  It is only created once geometry is needed."""
+        if self._diskCache is None and self.diskCachePath:
+            from .diskCache import DiskCache
+            self._diskCache = DiskCache(self.diskCachePath, self.diskCacheBytes, self.precision)
+        return self._diskCache
+
+    def clear(self):
+        self._entries.clear()
+        self.numBytes = 0
+
+    def get(self, stairsType, params):
+        """Return cached geometry for params, generating and storing it on a miss.
+
+        The returned arrays are read only.
+        """
+        key = params_key(stairsType, params, self.precision)
+
+        buffers = self._entries.get(key)
+        if buffers is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return buffers
+
+        self.misses += 1
+        diskCache = self.disk_cache()
+        if diskCache is not None:
+            #Disk entries are memory mapped read only
+            buffers = diskCache.get(stairsType, params, generators.generate)
+        else:
+            from .meshBuffers import freeze
+            buffers = freeze(generators.generate(stairsType, params))
+        self.put(key, buffers)
+        return buffers
+
+    def put(self, key, buffers):
+        size = buffers_nbytes(buffers)
+        if self.maxEntries <= 0 or size > self.maxBytes:
+            return
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.numBytes -= buffers_nbytes(old)
+
+        self._entries[key] = buffers
+        self.numBytes += size
+        self._evict()
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.maxEntries or self.numBytes > self.maxBytes):
+            key, buffers = self._entries.popitem(last=False)
+            self.numBytes -= buffers_nbytes(buffers)
+
+
+#Shared by the operators so redo panel edits can reuse earlier results
+geometryCache = GeometryCache()
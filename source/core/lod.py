@@ -0,0 +1,225 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Level of detail chains for stairs.
+
+Each level halves the number of steps of the one before it, keeping the
+overall size, and the last level replaces the steps with a ramp.  All
+levels use the uvyOffset layout of the full stairs, so the texture along
+the walking surface runs from 0 to height + depth on every level.
+"""
+
+import math
+import numpy as np
+
+from . import generators
+from .curvedStairs import column_buffers, repeat_turns
+from .meshBuffers import MeshBuffers, loop_starts, merge_buffers
+
+#Angle covered by one segment of a curved ramp
+RAMP_SEGMENT_DEGREES = 30.0
+
+#Sides of the central column on a ramp
+RAMP_COLUMN_SEGMENTS = 8
+
+#Largest angle a single curved step may cover.  Steps are flat quads, so
+#coarser ones cut across the curve and fold over past 180 degrees.
+MAX_STEP_DEGREES = 90.0
+
+
+def effective_params(stairsType, params):
+    """Parameters in NUM_STAIRS form, with the height and step count add_stairs would use."""
+    params = generators.complete_params(stairsType, params)
+    if params["stepType"] != "NUM_STAIRS":
+        numSteps = max(math.floor(params["height"] / params["stepHeight"]), 1)
+        params["height"] = params["stepHeight"] * numSteps
+        params["numSteps"] = numSteps
+        params["stepType"] = "NUM_STAIRS"
+    return params
+
+
+def straight_ramp(width, height, depth, sides):
+    """Wedge covering the same space as straight stairs."""
+    width /= 2
+
+    co = [(-width, 0, 0), (width, 0, 0), (-width, depth, height), (width, depth, height)]
+    loopVerts = [0, 1, 3, 2]
+    uvs = [(-width, 0), (width, 0), (width, height + depth), (-width, height + depth)]
+    loopTotals = [4]
+
+    if sides:
+        co += [(-width, depth, 0), (width, depth, 0)]
+        #Back, bottom, left and right
+        loopVerts += [2, 3, 5, 4, 0, 4, 5, 1, 0, 2, 4, 5, 3, 1]
+        uvs += [
+            (-width, height), (width, height), (width, 0), (-width, 0),
+            (-width, depth), (-width, 0), (width, 0), (width, depth),
+            (0, 0), (depth, height), (depth, 0),
+            (depth, 0), (depth, height), (0, 0),
+        ]
+        loopTotals += [4, 4, 3, 3]
+
+    loopTotals = np.array(loopTotals, dtype=np.int32)
+    return MeshBuffers(
+        np.array(co, dtype=np.float64),
+        np.array(loopVerts, dtype=np.int32),
+        loop_starts(loopTotals),
+        loopTotals,
+        np.array(uvs, dtype=np.float64),
+    )
+
+
+def curved_ramp(height, stepWidth, curvature, innerRadius, ccw, sides, numSegments=None):
+    """Helical ramp covering the same space as curved stairs."""
+    if numSegments is None:
+        numSegments = max(math.ceil(curvature / RAMP_SEGMENT_DEGREES), 1)
+
+    arcLength = 2 * math.pi * (curvature / 360) * (innerRadius + stepWidth / 2)
+
+    if ccw:
+        offsetX = -innerRadius - stepWidth / 2
+    else:
+        offsetX = innerRadius + stepWidth / 2
+
+    segments = np.arange(numSegments + 1, dtype=np.float64)
+    angles = segments * math.radians(curvature) / numSegments
+    x = np.cos(angles)
+    y = np.sin(angles)
+    if not ccw:
+        x = -x
+
+    ring = np.empty((numSegments + 1, 2, 3))
+    ring[:, 0, 0] = x * innerRadius + offsetX
+    ring[:, 0, 1] = y * innerRadius
+    ring[:, 1, 0] = x * (innerRadius + stepWidth) + offsetX
+    ring[:, 1, 1] = y * (innerRadius + stepWidth)
+    ring[:, :, 2] = (segments * height / numSegments)[:, None]
+
+    fraction = segments / numSegments
+    g = np.arange(numSegments, dtype=np.int32) * 2
+
+    co = [ring.reshape(-1, 3)]
+    loopVerts = [np.stack((g, g + 1, g + 3, g + 2), axis=1).ravel()]
+    rampUvs = np.empty((numSegments, 4, 2))
+    rampUvs[:, :, 0] = (0, stepWidth, stepWidth, 0)
+    rampUvs[:, 0:2, 1] = (fraction[:-1] * (height + arcLength))[:, None]
+    rampUvs[:, 2:4, 1] = (fraction[1:] * (height + arcLength))[:, None]
+    uvs = [rampUvs.reshape(-1, 2)]
+    loopTotals = [np.full(numSegments, 4, dtype=np.int32)]
+
+    if sides:
+        bottom = ring[1:].copy()
+        bottom[:, :, 2] = 0
+        co.append(bottom.reshape(-1, 3))
+
+        #Bottom ring, the first segment starts at the ramp's own bottom edge
+        bottomLeft = np.empty(numSegments + 1, dtype=np.int32)
+        bottomLeft[0] = 0
+        bottomLeft[1:] = numSegments * 2 + 2 + np.arange(numSegments, dtype=np.int32) * 2
+        bottomRight = bottomLeft + 1
+        bottomRight[0] = 1
+
+        u = fraction * arcLength
+        z = ring[:, 0, 2]
+
+        #Side of first segment
+        firstLoops = np.array((0, 2, bottomLeft[1], 1, bottomRight[1], 3), dtype=np.int32)
+        firstUvs = np.array(((0, 0), (u[1], z[1]), (u[1], 0), (0, 0), (u[1], 0), (u[1], z[1])))
+
+        #Side slats
+        leftSlats = np.stack((bottomLeft[1:-1], g[1:], g[1:] + 2, bottomLeft[2:]), axis=1)
+        rightSlats = np.stack((bottomRight[1:-1], bottomRight[2:], g[1:] + 3, g[1:] + 1), axis=1)
+        zeros = np.zeros(numSegments - 1)
+        leftSlatUvs = np.stack((u[1:-1], zeros, u[1:-1], z[1:-1], u[2:], z[2:], u[2:], zeros), axis=1)
+        rightSlatUvs = np.stack((u[1:-1], zeros, u[2:], zeros, u[2:], z[2:], u[1:-1], z[1:-1]), axis=1)
+        slats = np.stack((leftSlats, rightSlats), axis=1).reshape(-1, 4)
+        slatUvs = np.stack((leftSlatUvs, rightSlatUvs), axis=1).reshape(-1, 2)
+
+        #Bottom
+        bottomLoops = np.stack((bottomLeft[:-1], bottomLeft[1:], bottomRight[1:], bottomRight[:-1]), axis=1)
+        bottomUvs = np.stack((np.zeros(numSegments), u[:-1], np.zeros(numSegments), u[1:],
+            np.full(numSegments, stepWidth), u[1:], np.full(numSegments, stepWidth), u[:-1]), axis=1)
+
+        #Back
+        backLoops = np.array((numSegments * 2, numSegments * 2 + 1, bottomRight[-1], bottomLeft[-1]), dtype=np.int32)
+        backUvs = np.array(((0, 1), (1, 1), (1, 0), (0, 0)), dtype=np.float64)
+
+        loopVerts += [firstLoops, slats.ravel(), bottomLoops.ravel(), backLoops]
+        uvs += [firstUvs, slatUvs, bottomUvs.reshape(-1, 2), backUvs]
+        loopTotals += [
+            np.full(2, 3, dtype=np.int32),
+            np.full((numSegments - 1) * 2 + numSegments + 1, 4, dtype=np.int32),
+        ]
+
+    loopTotals = np.concatenate(loopTotals)
+    return MeshBuffers(
+        np.concatenate(co),
+        np.concatenate(loopVerts).astype(np.int32),
+        loop_starts(loopTotals),
+        loopTotals,
+        np.concatenate(uvs),
+    )
+
+
+def ramp(stairsType, params):
+    """The lowest level of detail, a ramp with the size of the stairs."""
+    params = effective_params(stairsType, params)
+    if stairsType == generators.STRAIGHT:
+        return straight_ramp(params["width"], params["height"], params["depth"], params["sides"])
+    numSegments = min(math.ceil(params["curvature"] / RAMP_SEGMENT_DEGREES), params["numSteps"])
+    buffers = curved_ramp(params["height"], params["stairWidth"], params["curvature"], params["innerRadius"], params["ccw"], params["sides"], numSegments)
+
+    offsetX = params["innerRadius"] + params["stairWidth"] / 2
+    if params["ccw"]:
+        offsetX = -offsetX
+    if params["turns"] > 1:
+        arcLength = 2 * math.pi * (params["curvature"] / 360) * (params["innerRadius"] + params["stairWidth"] / 2)
+        buffers = repeat_turns(buffers, params["turns"], params["curvature"], params["height"], offsetX, params["ccw"],
+            not params["sides"], numSegments * 4, params["height"] + arcLength)
+    if params["centralColumn"]:
+        buffers = merge_buffers([buffers, column_buffers(params["innerRadius"], params["height"] * params["turns"], offsetX, RAMP_COLUMN_SEGMENTS)])
+    return buffers
+
+
+def lod_params(stairsType, params, level):
+    """Parameters for an intermediate level, with 1 / 2^level of the steps."""
+    params = effective_params(stairsType, params)
+    minSteps = 1
+    if stairsType == generators.CURVED:
+        minSteps = math.ceil(params["curvature"] / MAX_STEP_DEGREES)
+    params["numSteps"] = min(params["numSteps"], max(params["numSteps"] >> level, minSteps))
+    return params
+
+
+def lod_chain(stairsType, params, levels, generate=generators.generate):
+    """MeshBuffers for levels 1 to levels.  The last one is always the ramp.
+
+    Intermediate levels stop once halving no longer removes steps, so the
+    chain can be shorter than levels.
+
+    generate builds the intermediate levels, so a caching generator can be
+    passed in.
+    """
+    chain = []
+    numSteps = effective_params(stairsType, params)["numSteps"]
+    for level in range(1, levels):
+        levelParams = lod_params(stairsType, params, level)
+        if levelParams["numSteps"] >= numSteps:
+            #Already down to the fewest steps, later levels would repeat it
+            break
+        numSteps = levelParams["numSteps"]
+        chain.append(generate(stairsType, levelParams))
+    if levels > 0:
+        chain.append(ramp(stairsType, params))
+    return chain
@@ -0,0 +1,187 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+from collections import namedtuple
+
+import numpy as np
+
+
+class MeshBuffers(namedtuple("MeshBuffers", ["co", "loopVerts", "loopStarts", "loopTotals", "uvs"])):
+    """Flat mesh arrays.
+
+    co is a (numVerts, 3) float array, loopVerts holds the vertex index of
+    every face corner, loopStarts/loopTotals give the first loop and the
+    number of loops of each face, and uvs is a (numLoops, 2) float array.
+    """
+
+    __slots__ = ()
+
+    @property
+    def numVerts(self):
+        return len(self.co)
+
+    @property
+    def numFaces(self):
+        return len(self.loopTotals)
+
+    @property
+    def numLoops(self):
+        return len(self.loopVerts)
+
+    def to_lists(self):
+        """Convert to the (verts, faces, uvs) lists returned by add_stairs."""
+        verts = [tuple(v) for v in self.co.tolist()]
+        loopVerts = self.loopVerts.tolist()
+        uvList = [tuple(uv) for uv in self.uvs.tolist()]
+        faces = []
+        uvs = []
+        for start, total in zip(self.loopStarts.tolist(), self.loopTotals.tolist()):
+            faces.append(tuple(loopVerts[start:start + total]))
+            uvs.append(tuple(uvList[start:start + total]))
+        return verts, faces, uvs
+
+
+class MeshTopology(namedtuple("MeshTopology", ["loopVerts", "loopStarts", "loopTotals"])):
+    """The face connectivity part of MeshBuffers."""
+
+    __slots__ = ()
+
+    @property
+    def numFaces(self):
+        return len(self.loopTotals)
+
+    @property
+    def numLoops(self):
+        return len(self.loopVerts)
+
+
+def freeze(arrays):
+    """Make every array in arrays read only so a shared copy cannot be modified."""
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays
+
+
+def loop_starts(loopTotals):
+    """Offset of the first loop of each face."""
+    loopStarts = np.zeros(len(loopTotals), dtype=np.int32)
+    np.cumsum(loopTotals[:-1], out=loopStarts[1:])
+    return loopStarts
+
+
+def interleave(*arrays):
+    """Interleave equal length arrays along their first axis, ie a0, b0, a1, b1..."""
+    stacked = np.stack(arrays, axis=1)
+    return stacked.reshape((-1,) + stacked.shape[2:])
+
+
+def transform_matrix(location=(0, 0, 0), rotation=(0, 0, 0), scale=(1, 1, 1)):
+    """4x4 matrix of a Blender style transform with an XYZ euler rotation in radians."""
+    cx, cy, cz = np.cos(rotation)
+    sx, sy, sz = np.sin(rotation)
+
+    rotX = np.array(((1, 0, 0), (0, cx, -sx), (0, sx, cx)))
+    rotY = np.array(((cy, 0, sy), (0, 1, 0), (-sy, 0, cy)))
+    rotZ = np.array(((cz, -sz, 0), (sz, cz, 0), (0, 0, 1)))
+
+    matrix = np.identity(4)
+    matrix[:3, :3] = rotZ @ rotY @ rotX @ np.diag(scale)
+    matrix[:3, 3] = location
+    return matrix
+
+
+def reversed_loops(buffers):
+    """Loop order that reverses the winding of every face."""
+    faceOfLoop = np.repeat(np.arange(buffers.numFaces), buffers.loopTotals)
+    starts = buffers.loopStarts[faceOfLoop]
+    ends = starts + buffers.loopTotals[faceOfLoop] - 1
+    return starts + ends - np.arange(buffers.numLoops)
+
+
+def transform_buffers(buffers, matrix):
+    """Copy of buffers with the vertices multiplied by a 4x4 matrix."""
+    co = buffers.co @ matrix[:3, :3].T + matrix[:3, 3]
+    loopVerts = buffers.loopVerts
+    uvs = buffers.uvs
+
+    if np.linalg.det(matrix[:3, :3]) < 0:
+        #Mirrored, keep the normals facing out
+        order = reversed_loops(buffers)
+        loopVerts = loopVerts[order]
+        uvs = uvs[order]
+
+    return MeshBuffers(co, loopVerts, buffers.loopStarts, buffers.loopTotals, uvs)
+
+
+def merge_buffers(buffersList):
+    """Join several MeshBuffers into one."""
+    vertOffsets = np.cumsum([0] + [buffers.numVerts for buffers in buffersList[:-1]])
+    loopTotals = np.concatenate([buffers.loopTotals for buffers in buffersList])
+
+    return MeshBuffers(
+        np.concatenate([buffers.co for buffers in buffersList]),
+        np.concatenate([buffers.loopVerts + offset for buffers, offset in zip(buffersList, vertOffsets)]).astype(np.int32),
+        loop_starts(loopTotals),
+        loopTotals,
+        np.concatenate([buffers.uvs for buffers in buffersList]),
+    )
+
+
+def compact_buffers(buffers):
+    """Copy of buffers using float32 and int32 arrays, the types Blender stores meshes in."""
+    return MeshBuffers(
+        buffers.co.astype(np.float32),
+        buffers.loopVerts.astype(np.int32),
+        buffers.loopStarts.astype(np.int32),
+        buffers.loopTotals.astype(np.int32),
+        buffers.uvs.astype(np.float32),
+    )
+
+
+def prism_buffers(outline, zMin, zMax):
+    """Closed prism over a convex (k, 2) outline, from zMin to zMax."""
+    outline = np.asarray(outline, dtype=np.float64)
+    #Wind the outline counter clockwise seen from above
+    area = np.sum(outline[:, 0] * np.roll(outline[:, 1], -1) - np.roll(outline[:, 0], -1) * outline[:, 1])
+    if area < 0:
+        outline = outline[::-1]
+    k = len(outline)
+
+    co = np.empty((2, k, 3))
+    co[:, :, 0:2] = outline
+    co[0, :, 2] = zMin
+    co[1, :, 2] = zMax
+
+    i = np.arange(k, dtype=np.int32)
+    j = (i + 1) % k
+    sides = np.stack((i, j, j + k, i + k), axis=1)
+    loopVerts = np.concatenate((sides.ravel(), i[::-1], i + k))
+
+    #Sides are unrolled along the outline, top and bottom are projected
+    perimeter = np.concatenate(([0], np.cumsum(np.linalg.norm(outline[j] - outline, axis=1))))
+    sideUvs = np.stack((
+        perimeter[:-1], np.full(k, zMin), perimeter[1:], np.full(k, zMin),
+        perimeter[1:], np.full(k, zMax), perimeter[:-1], np.full(k, zMax),
+    ), axis=1).reshape(-1, 2)
+    uvs = np.concatenate((sideUvs, outline[::-1], outline))
+
+    loopTotals = np.concatenate((np.full(k, 4, dtype=np.int32), np.array((k, k), dtype=np.int32)))
+    return MeshBuffers(co.reshape(-1, 3), loopVerts.astype(np.int32), loop_starts(loopTotals), loopTotals, uvs)
+
+
+def box_buffers(boxMin, boxMax):
+    """Closed axis aligned box between two corners."""
+    (x0, y0, z0), (x1, y1, z1) = boxMin, boxMax
+    return prism_buffers(((x0, y0), (x1, y0), (x1, y1), (x0, y1)), z0, z1)
@@ -0,0 +1,100 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Generate stairs geometry for large batches on several CPU cores.
+
+Worker processes only import this bpy-free package, so the results are
+plain MeshBuffers which the caller inserts into bpy.data on the main
+thread.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from . import generators
+from .geometryCache import params_key
+from .meshBuffers import compact_buffers
+
+
+def _generate_job(job):
+    stairsType, params = job
+    #float32 halves the data sent back to the main process
+    return compact_buffers(generators.generate(stairsType, params))
+
+
+#Below this many steps in total, starting the workers costs more than it
+#saves.  Generating takes about 1 to 3 us per step in one process, while
+#spawning workers that import NumPy takes around half a second, so a batch
+#of a few hundred ordinary staircases is done before a pool would be ready.
+MIN_PARALLEL_STEPS = 1000000
+
+
+def default_processes():
+    return os.cpu_count() or 1
+
+
+def estimated_steps(stairsType, params):
+    params = generators.complete_params(stairsType, params)
+    if params["stepType"] == "NUM_STAIRS":
+        numSteps = params["numSteps"]
+    else:
+        numSteps = max(int(params["height"] / params["stepHeight"]), 1)
+    return numSteps * params.get("turns", 1)
+
+
+def generate_many(jobs, processes=None, minParallelSteps=MIN_PARALLEL_STEPS, diskCache=None):
+    """Generate MeshBuffers for a list of (stairsType, params) jobs.
+
+    Identical jobs are only generated once.  processes is the number of
+    worker processes, all cores when None.  Small batches, and batches with
+    a single distinct job, run in the calling process.  Jobs found in
+    diskCache are read from it and the others are stored in it.
+    """
+
+    keys = [params_key(stairsType, params) for stairsType, params in jobs]
+    uniqueJobs = {}
+    for key, job in zip(keys, jobs):
+        uniqueJobs.setdefault(key, job)
+
+    cached = {}
+    if diskCache is not None:
+        for key, job in list(uniqueJobs.items()):
+            buffers = diskCache.load(*job)
+            if buffers is not None:
+                cached[key] = buffers
+                del uniqueJobs[key]
+
+    if processes is None:
+        processes = default_processes()
+    processes = min(processes, len(uniqueJobs))
+    if sum(estimated_steps(*job) for job in uniqueJobs.values()) < minParallelSteps:
+        processes = 1
+
+    if processes <= 1:
+        results = [_generate_job(job) for job in uniqueJobs.values()]
+    else:
+        #spawn works the same on every platform and does not fork Blender
+        context = multiprocessing.get_context("spawn")
+        chunksize = max(1, len(uniqueJobs) // (processes * 4))
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+            results = list(pool.map(_generate_job, uniqueJobs.values(), chunksize=chunksize))
+
+    resultsByKey = dict(zip(uniqueJobs.keys(), results))
+    if diskCache is not None:
+        for key, job in uniqueJobs.items():
+            resultsByKey[key] = diskCache.store(job[0], job[1], resultsByKey[key], evict=False)
+        diskCache.evict()
+    resultsByKey.update(cached)
+    return [resultsByKey[key] for key in keys]
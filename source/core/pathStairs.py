@@ -0,0 +1,111 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Stairs laid along an arbitrary path, such as a Bezier or poly curve.
+
+The path is flattened onto the xy plane and the steps climb from z = 0.
+Steps are spaced evenly by arc length and each step edge is square to
+the path where it sits.  The mesh uses the same layout and UVs as the
+curved stairs, so risers, treads and sides match the other generators.
+
+Paths that turn tighter than half the stairs width fold the inner edge
+over itself.
+"""
+
+import math
+import numpy as np
+
+from .curvedStairs import ring_stairs_buffers
+
+#Points sampled along each Bezier segment before resampling by arc length
+BEZIER_SAMPLES = 64
+
+
+def bezier_points(knots, handlesLeft, handlesRight, cyclic=False, samples=BEZIER_SAMPLES):
+    """Sample a Bezier spline into a (numPoints, 3) polyline.
+
+    knots and handles are (n, 3) arrays, as stored on Blender Bezier points.
+    Every segment is evaluated in one batch.
+    """
+    knots = np.asarray(knots, dtype=np.float64)
+    handlesLeft = np.asarray(handlesLeft, dtype=np.float64)
+    handlesRight = np.asarray(handlesRight, dtype=np.float64)
+
+    numKnots = len(knots)
+    if numKnots < 2:
+        raise ValueError("Bezier curve needs at least two points")
+    start = np.arange(numKnots if cyclic else numKnots - 1)
+    end = (start + 1) % numKnots
+
+    #Cubic Bernstein basis at every sample, shared by all segments
+    t = np.linspace(0, 1, samples + 1)[:-1, None]
+    basis = np.hstack(((1 - t) ** 3, 3 * t * (1 - t) ** 2, 3 * t ** 2 * (1 - t), t ** 3))
+
+    controls = np.stack((knots[start], handlesRight[start], handlesLeft[end], knots[end]), axis=1)
+    points = np.einsum("sk,mkd->msd", basis, controls).reshape(-1, 3)
+    return np.vstack((points, knots[end[-1]]))
+
+
+def arc_lengths(points):
+    """Distance along a polyline to each of its points."""
+    lengths = np.zeros(len(points))
+    np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1), out=lengths[1:])
+    return lengths
+
+
+def resample(points, count):
+    """count + 1 points spaced evenly by arc length along a polyline, with the unit tangent at each."""
+    lengths = arc_lengths(points)
+
+    #Tangents at the polyline points, one sided at the ends
+    tangents = np.empty_like(points)
+    tangents[1:-1] = points[2:] - points[:-2]
+    tangents[0] = points[1] - points[0]
+    tangents[-1] = points[-1] - points[-2]
+    tangents /= np.maximum(np.linalg.norm(tangents, axis=1), 1e-12)[:, None]
+
+    stations = np.linspace(0, lengths[-1], count + 1)
+    sampled = np.stack([np.interp(stations, lengths, points[:, i]) for i in range(points.shape[1])], axis=1)
+    sampledTangents = np.stack([np.interp(stations, lengths, tangents[:, i]) for i in range(points.shape[1])], axis=1)
+    sampledTangents /= np.maximum(np.linalg.norm(sampledTangents, axis=1), 1e-12)[:, None]
+    return sampled, sampledTangents, lengths[-1]
+
+
+def path_stairs_buffers(points, width, height, stepType, numSteps, userStepHeight, sides, minimalTopology=False):
+    """Stairs climbing along a polyline of (n, 2) or (n, 3) points, with steps of equal depth along it."""
+
+    if stepType == "NUM_STAIRS":
+        stepHeight = height / numSteps
+    else:
+        stepHeight = userStepHeight
+        numSteps = max(math.floor(height / userStepHeight), 1)
+
+    points = np.asarray(points, dtype=np.float64)[:, 0:2]
+    #Drop repeated points, which have no direction
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.any(np.diff(points, axis=0) != 0, axis=1)
+    points = points[keep]
+    if len(points) < 2:
+        raise ValueError("Path needs at least two distinct points")
+
+    centers, tangents, length = resample(points, numSteps)
+
+    #Right hand side of the walking direction, like +x on straight stairs
+    right = np.stack((tangents[:, 1], -tangents[:, 0]), axis=1)
+
+    ring = np.empty((numSteps + 1, 2, 2))
+    ring[:, 0] = centers - right * (width / 2)
+    ring[:, 1] = centers + right * (width / 2)
+
+    return ring_stairs_buffers(ring, width, stepHeight, length / numSteps, sides, minimalTopology)
@@ -0,0 +1,112 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Optional timing of the phases of building a staircase.
+
+    timer = PhaseTimer()
+    with timer.phase("geometry"):
+        buffers = generate(...)
+    timer.count(verts=buffers.numVerts)
+    print(timer.summary())
+
+A disabled timer costs one attribute check per phase.  With traceMemory
+the peak allocation of each phase is measured with tracemalloc, so it
+covers NumPy arrays and Python objects but not memory Blender allocates
+itself.  Tracing slows allocation heavy code down considerably, so time
+and memory are best measured in separate runs.
+"""
+
+import contextlib
+import json
+import logging
+import time
+import tracemalloc
+
+log = logging.getLogger(__name__)
+
+
+class PhaseTimer:
+    def __init__(self, enabled=True, traceMemory=False):
+        self.enabled = enabled
+        self.traceMemory = enabled and traceMemory
+        #(name, seconds, peak bytes or None) in the order the phases ran
+        self.phases = []
+        self.counts = {}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time the body of a with block as the phase name."""
+        if not self.enabled:
+            yield
+            return
+
+        startedTracing = False
+        if self.traceMemory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                startedTracing = True
+            elif hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            startMemory = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak = None
+            if self.traceMemory:
+                peak = max(tracemalloc.get_traced_memory()[1] - startMemory, 0)
+                if startedTracing:
+                    tracemalloc.stop()
+            self.phases.append((name, seconds, peak))
+
+    def count(self, **counts):
+        """Record sizes, such as vertex and face counts, alongside the timings."""
+        if self.enabled:
+            self.counts.update(counts)
+
+    @property
+    def total(self):
+        return sum(seconds for name, seconds, peak in self.phases)
+
+    def to_dict(self):
+        return {
+            "phases": [{"name": name, "seconds": seconds, "peakBytes": peak} for name, seconds, peak in self.phases],
+            "total": self.total,
+            "counts": dict(self.counts),
+        }
+
+    def summary(self):
+        """One line description of the phases, for an operator report."""
+        parts = []
+        for name, seconds, peak in self.phases:
+            part = "%s %.2f ms" % (name, seconds * 1000)
+            if peak is not None:
+                part += " (%.1f MB)" % (peak / 1e6)
+            parts.append(part)
+        counts = ", ".join("%s %d" % item for item in self.counts.items())
+        return "%s; total %.2f ms%s" % (", ".join(parts), self.total * 1000, "; " + counts if counts else "")
+
+    def log(self, label="Stairs"):
+        log.info("%s: %s", label, self.summary())
+
+    def write_json(self, filepath, **extra):
+        """Write the timings, counts and any extra entries to a JSON file."""
+        with open(filepath, "w") as f:
+            json.dump(dict(self.to_dict(), **extra), f, indent=4)
+
+
+#Shared disabled timer, the default wherever timing is optional
+NO_TIMER = PhaseTimer(enabled=False)
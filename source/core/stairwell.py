@@ -0,0 +1,77 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Layout of a switchback stairwell.
+
+Every floor holds two flights of straight stairs and two landings.  The
+first flight climbs along +y to a landing half a storey up, the second
+turns back along -y beside it to the next floor.  Both flights use the
+same mesh, and every floor is the same, so a floor only has to be built
+once and can then be instanced.
+"""
+
+import math
+
+from . import generators
+from .meshBuffers import box_buffers
+
+FLIGHT = "FLIGHT"
+LANDING = "LANDING"
+
+
+def flight_params(storeyHeight, flightWidth, flightDepth, stepsPerFlight, sides=True):
+    """Straight stairs parameters of one flight, which climbs half a storey."""
+    return generators.complete_params(generators.STRAIGHT, {
+        "width": flightWidth,
+        "height": storeyHeight / 2,
+        "depth": flightDepth,
+        "stepType": "NUM_STAIRS",
+        "numSteps": stepsPerFlight,
+        "sides": sides,
+    })
+
+
+def landing_buffers(flightWidth, wellGap, landingDepth, landingThickness):
+    """Landing slab spanning both flights.  It extends along +y from its origin, with its top at z = 0."""
+    halfWidth = flightWidth + wellGap / 2
+    return box_buffers((-halfWidth, 0, -landingThickness), (halfWidth, landingDepth, 0))
+
+
+def floor_layout(storeyHeight, flightWidth, flightDepth, wellGap):
+    """(kind, location, z rotation) of every part of one floor, relative to the floor."""
+    halfStorey = storeyHeight / 2
+    secondFlightX = flightWidth + wellGap
+    middleX = secondFlightX / 2
+    return [
+        (LANDING, (middleX, 0.0, 0.0), math.pi),
+        (FLIGHT, (0.0, 0.0, 0.0), 0.0),
+        (LANDING, (middleX, flightDepth, halfStorey), 0.0),
+        (FLIGHT, (secondFlightX, flightDepth, halfStorey), math.pi),
+    ]
+
+
+def floor_transforms(numFloors, storeyHeight, floorRotation=0.0):
+    """(location, z rotation) of each floor.  Each one is raised by storeyHeight and turned by floorRotation."""
+    return [((0.0, 0.0, i * storeyHeight), i * floorRotation) for i in range(numFloors)]
+
+
+def top_landing_transform(numFloors, storeyHeight, flightWidth, flightDepth, wellGap, floorRotation=0.0):
+    """(location, z rotation) of the landing the last flight arrives at, which no floor provides."""
+    kind, location, rotation = floor_layout(storeyHeight, flightWidth, flightDepth, wellGap)[0]
+    angle = numFloors * floorRotation
+    x, y, z = location
+    return (
+        (x * math.cos(angle) - y * math.sin(angle), x * math.sin(angle) + y * math.cos(angle), z + numFloors * storeyHeight),
+        rotation + angle,
+    )
@@ -0,0 +1,260 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import functools
+import math
+import numpy as np
+from .meshBuffers import MeshBuffers, MeshTopology, freeze, interleave, loop_starts
+
+def add_stairs(width, height, depth, stepType, numSteps, userStepHeight, sides):
+
+    width /= 2
+
+    verts = []
+    faces = []
+    uvs = []
+    
+    if stepType == "NUM_STAIRS": 
+        stepHeight = height / numSteps
+    else:
+        stepHeight = userStepHeight
+        numSteps = max(math.floor(height / userStepHeight), 1)
+        height = stepHeight * numSteps
+
+    stepDepth = depth / numSteps
+
+    f = 0
+    uvyOffset = 0
+    
+    #Draw steps    
+    for i in range(numSteps):
+        verts.append((-width, i * stepDepth, i * stepHeight))
+        verts.append((width, i * stepDepth, i * stepHeight))
+        verts.append((-width, i * stepDepth, (i + 1) * stepHeight))
+        verts.append((width, i * stepDepth, (i + 1) * stepHeight))
+
+        if i != 0:
+            faces.append((f + 0, f - 2, f - 1, f + 1))
+            uvs.append(((-width, uvyOffset + stepDepth), (-width, uvyOffset), (width, uvyOffset), (width, uvyOffset + stepDepth)))
+            uvyOffset+= stepDepth
+            
+        faces.append((f + 0, f + 1, f + 3, f + 2))
+        uvs.append(((-width, uvyOffset), (width, uvyOffset), (width, uvyOffset + stepHeight), (-width, uvyOffset + stepHeight)))
+
+        uvyOffset+= stepHeight
+        
+        f += 4
+
+    #Top of last step
+    verts.append((-width, depth, height))
+    verts.append((width, depth, height))
+    faces.append((f + 0, f - 2, f - 1, f + 1))
+    uvs.append(((-width, uvyOffset + stepDepth), (-width, uvyOffset), (width, uvyOffset), (width, uvyOffset + stepDepth)))
+
+    if sides:
+        #Far bottom vertices
+        verts.append((-width, depth, 0))
+        verts.append((width, depth, 0))
+        
+        faces.append((f + 0, f + 1, f + 3, f + 2))
+        uvs.append(((-width, height), (width, height), (width, 0), (-width, 0)))
+        
+        faces.append((0, f + 2, f + 3, 1))
+        uvs.append(((-width, depth), (-width, 0), (width, 0), (width, depth)))
+        
+        leftFace = []
+        rightFace = []
+        leftFaceUvs = []
+        rightFaceUvs = []
+        for i in range(numSteps * 2 + 2):
+            idx = i * 2
+            leftFace.append(idx)
+            leftFaceUvs.append((verts[idx][1], verts[idx][2]))
+            
+            idx = i * 2 + 1
+            rightFace.append(idx)
+            rightFaceUvs.append((verts[idx][1], verts[idx][2]))
+
+        #Right side winds the other way
+        rightFace.reverse()
+        rightFaceUvs.reverse()
+            
+        faces.append(leftFace)
+        faces.append(rightFace)
+        uvs.append(leftFaceUvs)
+        uvs.append(rightFaceUvs)
+
+
+    return verts, faces, uvs
+
+
+@functools.lru_cache(maxsize=32)
+def stairs_topology(numSteps, sides, splitSides=False):
+    """Face connectivity of add_stairs_buffers.
+
+    It only depends on the number of steps and whether sides are built, so
+    it is cached and shared between meshes that only differ in dimensions.
+    """
+
+    #Each riser is followed by the tread above it
+    f = np.arange(numSteps, dtype=np.int32)[:, None] * 4
+    risers = f + np.array((0, 1, 3, 2), dtype=np.int32)
+    treads = f + np.array((4, 2, 3, 5), dtype=np.int32)
+
+    loopVerts = [interleave(risers, treads).ravel()]
+    loopTotals = [np.full(numSteps * 2, 4, dtype=np.int32)]
+
+    if sides:
+        f = numSteps * 4
+        #Back
+        loopVerts.append(np.array((f + 0, f + 1, f + 3, f + 2), dtype=np.int32))
+
+        if splitSides:
+            #Bottom vertices under each riser, the first and last already exist
+            bottomLeft = np.empty(numSteps + 1, dtype=np.int32)
+            bottomLeft[0] = 0
+            bottomLeft[1:-1] = f + 4 + np.arange(numSteps - 1, dtype=np.int32) * 2
+            bottomLeft[-1] = f + 2
+            bottomRight = bottomLeft + 1
+
+            #Bottom
+            bottom = np.stack((bottomLeft[:-1], bottomLeft[1:], bottomRight[1:], bottomRight[:-1]), axis=1)
+
+            #Side triangles
+            g = np.arange(numSteps, dtype=np.int32) * 4
+            leftTris = np.stack((g + 0, g + 2, g + 4), axis=1)
+            rightTris = np.stack((g + 1, g + 5, g + 3), axis=1)
+
+            #Side of first step of stairs
+            firstLoops = np.array((0, 4, bottomLeft[1], 1, bottomRight[1], 5), dtype=np.int32)
+
+            #Side slats
+            g = g[1:]
+            leftSlats = np.stack((bottomLeft[1:-1], g + 0, g + 4, bottomLeft[2:]), axis=1)
+            rightSlats = np.stack((bottomRight[1:-1], bottomRight[2:], g + 5, g + 1), axis=1)
+
+            loopVerts += [
+                bottom.ravel(),
+                interleave(leftTris, rightTris).ravel(),
+                firstLoops,
+                interleave(leftSlats, rightSlats).ravel(),
+            ]
+            loopTotals += [
+                np.full(numSteps + 1, 4, dtype=np.int32),
+                np.full(numSteps * 2 + 2, 3, dtype=np.int32),
+                np.full((numSteps - 1) * 2, 4, dtype=np.int32),
+            ]
+
+        else:
+            sideVerts = numSteps * 2 + 2
+            loopVerts += [
+                #Bottom
+                np.array((0, f + 2, f + 3, 1), dtype=np.int32),
+                #Left side
+                np.arange(0, sideVerts * 2, 2, dtype=np.int32),
+                #Right side
+                np.arange(sideVerts * 2 - 1, 0, -2, dtype=np.int32),
+            ]
+            loopTotals.append(np.array((4, 4, sideVerts, sideVerts), dtype=np.int32))
+
+    loopTotals = np.concatenate(loopTotals)
+
+    return freeze(MeshTopology(np.concatenate(loopVerts), loop_starts(loopTotals), loopTotals))
+
+
+def add_stairs_buffers(width, height, depth, stepType, numSteps, userStepHeight, sides, splitSides=False):
+    """Vectorized add_stairs.  Returns the same mesh as flat MeshBuffers arrays.
+
+    With splitSides the side n-gons are replaced by one triangle and one quad
+    per step, and the bottom by one quad per step, which keeps every face
+    small for very large step counts.
+    """
+
+    width /= 2
+
+    if stepType == "NUM_STAIRS":
+        stepHeight = height / numSteps
+    else:
+        stepHeight = userStepHeight
+        numSteps = max(math.floor(height / userStepHeight), 1)
+        height = stepHeight * numSteps
+
+    stepDepth = depth / numSteps
+
+    splitSides = bool(sides and splitSides)
+    topology = stairs_topology(numSteps, sides, splitSides)
+
+    #Draw steps
+    steps = np.arange(numSteps, dtype=np.float64)
+    stepVerts = np.empty((numSteps, 4, 3))
+    stepVerts[:, :, 0] = (-width, width, -width, width)
+    stepVerts[:, :, 1] = (steps * stepDepth)[:, None]
+    stepVerts[:, 0:2, 2] = (steps * stepHeight)[:, None]
+    stepVerts[:, 2:4, 2] = ((steps + 1) * stepHeight)[:, None]
+
+    #Top of last step
+    endVerts = [(-width, depth, height), (width, depth, height)]
+    if sides:
+        #Far bottom vertices
+        endVerts += [(-width, depth, 0), (width, depth, 0)]
+
+    co = [stepVerts.reshape(-1, 3), np.array(endVerts, dtype=np.float64)]
+
+    if splitSides:
+        bottomVerts = np.zeros((numSteps - 1, 2, 3))
+        bottomVerts[:, :, 0] = (-width, width)
+        bottomVerts[:, :, 1] = (steps[1:] * stepDepth)[:, None]
+        co.append(bottomVerts.reshape(-1, 3))
+
+    co = np.concatenate(co)
+
+    #uvyOffset accumulates riser and tread lengths in face order
+    offsets = np.empty(numSteps * 2 + 1)
+    offsets[0] = 0
+    increments = np.empty(numSteps * 2)
+    increments[0::2] = stepHeight
+    increments[1::2] = stepDepth
+    np.cumsum(increments, out=offsets[1:])
+
+    v0 = offsets[:-1]
+    v1 = offsets[1:]
+    uvs = np.empty((topology.numLoops, 2))
+    stepUvs = uvs[:numSteps * 8].reshape(numSteps * 2, 4, 2)
+    stepUvs[0::2, :, 0] = (-width, width, width, -width)
+    stepUvs[1::2, :, 0] = (-width, -width, width, width)
+    stepUvs[0::2, :, 1] = np.stack((v0[0::2], v0[0::2], v1[0::2], v1[0::2]), axis=1)
+    stepUvs[1::2, :, 1] = np.stack((v1[1::2], v0[1::2], v0[1::2], v1[1::2]), axis=1)
+
+    if sides:
+        loop = numSteps * 8
+
+        #Back
+        uvs[loop:loop + 4] = ((-width, height), (width, height), (width, 0), (-width, 0))
+        loop += 4
+
+        #Bottom runs from v = depth at the first step to v = 0 at the back
+        if splitSides:
+            bottomUvs = uvs[loop:loop + numSteps * 4].reshape(numSteps, 4, 2)
+            bottomUvs[:, :, 0] = (-width, -width, width, width)
+            bottomUvs[:, :, 1] = depth - co[topology.loopVerts[loop:loop + numSteps * 4], 1].reshape(numSteps, 4)
+            loop += numSteps * 4
+        else:
+            uvs[loop:loop + 4] = ((-width, depth), (-width, 0), (width, 0), (width, depth))
+            loop += 4
+
+        #Sides are projected onto the yz plane
+        uvs[loop:] = co[topology.loopVerts[loop:], 1:3]
+
+    return MeshBuffers(co, topology.loopVerts, topology.loopStarts, topology.loopTotals, uvs)
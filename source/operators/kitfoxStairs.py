@@ -14,87 +14,9 @@
 
 
 import bpy
-import bmesh
-import math
 from bpy_extras.object_utils import AddObjectHelper
-
-def add_stairs(width, height, depth, stepType, numSteps, userStepHeight, sides):
-
-    width /= 2
-
-    verts = []
-    faces = []
-    uvs = []
-    
-    if stepType == "NUM_STAIRS": 
-        stepHeight = height / numSteps
-    else:
-        stepHeight = userStepHeight
-        numSteps = max(math.floor(height / userStepHeight), 1)
-        height = stepHeight * numSteps
-
-    stepDepth = depth / numSteps
-
-    f = 0
-    uvyOffset = 0
-    
-    #Draw steps    
-    for i in range(numSteps):
-        verts.append((-width, i * stepDepth, i * stepHeight))
-        verts.append((width, i * stepDepth, i * stepHeight))
-        verts.append((-width, i * stepDepth, (i + 1) * stepHeight))
-        verts.append((width, i * stepDepth, (i + 1) * stepHeight))
-
-        if i != 0:
-            faces.append((f + 0, f - 2, f - 1, f + 1))
-            uvs.append(((-width, uvyOffset + stepDepth), (-width, uvyOffset), (width, uvyOffset), (width, uvyOffset + stepDepth)))
-            uvyOffset+= stepDepth
-            
-        faces.append((f + 0, f + 1, f + 3, f + 2))
-        uvs.append(((-width, uvyOffset), (width, uvyOffset), (width, uvyOffset + stepHeight), (-width, uvyOffset + stepHeight)))
-
-        uvyOffset+= stepHeight
-        
-        f += 4
-
-    #Top of last step
-    verts.append((-width, depth, height))
-    verts.append((width, depth, height))
-    faces.append((f + 0, f - 2, f - 1, f + 1))
-    uvs.append(((-width, uvyOffset + stepDepth), (-width, uvyOffset), (width, uvyOffset), (width, uvyOffset + stepDepth)))
-
-    if sides:
-        #Far bottom vertices
-        verts.append((-width, depth, 0))
-        verts.append((width, depth, 0))
-        
-        faces.append((f + 0, f + 1, f + 3, f + 2))
-        uvs.append(((-width, height), (width, height), (width, 0), (-width, 0)))
-        
-        faces.append((0, f + 2, f + 3, 1))
-        uvs.append(((-width, depth), (-width, 0), (width, 0), (width, depth)))
-        
-        leftFace = []
-        rightFace = []
-        leftFaceUvs = []
-        rightFaceUvs = []
-        for i in range(numSteps * 2 + 2):
-            idx = i * 2
-            leftFace.append(idx)
-            leftFaceUvs.append((verts[idx][1], verts[idx][2]))
-            
-            idx = i * 2 + 1
-            rightFace.insert(0, idx)
-            rightFaceUvs.insert(0, (verts[idx][1], verts[idx][2]))
-            
-        faces.append(leftFace)
-        faces.append(rightFace)
-        uvs.append(leftFaceUvs)
-        uvs.append(rightFaceUvs)
-
-
-    return verts, faces, uvs
-
+from .stairsCollision import collision_shape
+from ..core.generators import STRAIGHT, params_from
 
 from bpy.props import (
     BoolProperty,
@@ -105,6 +27,7 @@ from bpy.props import (
     FloatProperty,
     FloatVectorProperty,
     EnumProperty,
+    StringProperty,
 )
 
 #step type enum
@@ -148,7 +71,7 @@ class AddStairs(bpy.types.Operator):
     numSteps: IntProperty(
         name="Number of Steps",
         description="Number of Steps",
-        min=1, soft_max=100,
+        min=1, soft_max=1000,
         default=6,
     )
     stepHeight: FloatProperty(
@@ -162,6 +85,63 @@ class AddStairs(bpy.types.Operator):
         description="Build sides and bottom of stairs.",
         default=True,
     )
+    splitSides: BoolProperty(
+        name="Split Sides",
+        description="Build each side from one triangle and one quad per step instead of a single n-gon.  Recommended for very large step counts",
+        default=False,
+    )
+    shareMesh: BoolProperty(
+        name="Share Mesh",
+        description="Reuse the mesh of an existing staircase with identical parameters, creating a linked duplicate",
+        default=False,
+    )
+    editModeInsert: BoolProperty(
+        name="Insert Into Edit Mesh",
+        description="In Edit Mode, add the stairs to the mesh being edited instead of joining a new object into it",
+        default=True,
+    )
+    lodLevels: IntProperty(
+        name="LOD Levels",
+        description="Number of lower detail versions to add as children.  Each halves the steps and the last is a ramp",
+        min=0, max=8,
+        default=0,
+    )
+    collisionProxy: BoolProperty(
+        name="Collision Proxy",
+        description="Add a low poly collision mesh as a child of the stairs",
+        default=False,
+    )
+    collisionShape: EnumProperty(
+        name="Collision Shape",
+        description="Shape of the collision proxy",
+        items=collision_shape,
+        default="RAMP",
+    )
+    collisionSegments: IntProperty(
+        name="Collision Pieces",
+        description="Number of convex pieces in the collision proxy",
+        min=1, soft_max=32,
+        default=4,
+    )
+    profile: BoolProperty(
+        name="Profile",
+        description="Time each phase of building the stairs and report the results",
+        default=False,
+        options={'SKIP_SAVE'},
+    )
+    profileMemory: BoolProperty(
+        name="Profile Memory",
+        description="Also measure the peak memory of each phase.  This slows the phases down, so timings are only accurate with it off",
+        default=False,
+        options={'SKIP_SAVE'},
+    )
+    statsPath: StringProperty(
+        name="Stats File",
+        description="JSON file to write the profile to.  Leave empty to only report it",
+        subtype='FILE_PATH',
+        default="",
+        options={'SKIP_SAVE'},
+    )
     layers: BoolVectorProperty(
         name="Layers",
         description="Object Layers",
@@ -191,45 +171,60 @@ class AddStairs(bpy.types.Operator):
     )
 
 
-    def execute(self, context):
-
-        verts_loc, faces, uvs = add_stairs(
-            self.width,
-            self.height,
-            self.depth,
-            self.stepType,
-            self.numSteps,
-            self.stepHeight,
-            self.sides
-        )
-
-        mesh = bpy.data.meshes.new("Stairs")
+    def add_stairs_object(self, context, params, buffers, timer):
+        """Build the stairs as a new object, with its LOD and collision children."""
+        from .meshBuilder import stairs_mesh
+        from .stairsObject import store_stairs_settings
+        #In Edit Mode object_data_add joins the stairs into the edited mesh
+        joined = context.edit_object is not None
 
-        bm = bmesh.new()
+        #The join deletes the mesh it was given, so it must not be a shared one
+        mesh = stairs_mesh("Stairs", STRAIGHT, params, buffers, self.shareMesh and not joined, timer)
 
-        for v_co in verts_loc:
-            bm.verts.new(v_co)
-
-        bm.verts.ensure_lookup_table()
-        for f_idx in faces:
-            bm.faces.new([bm.verts[i] for i in f_idx])
-
-        #create a uv layer and generate uv coords
-        uv_layer = bm.loops.layers.uv.new()
+        # add the mesh as an object into the scene with this utility module
+        from bpy_extras import object_utils
+        with timer.phase("object_data_add"):
+            obj = object_utils.object_data_add(context, mesh, operator=self)
+        if joined:
+            #The result is the user's mesh, not a staircase that can be regenerated
+            return
 
-        loop = bm.loops.layers.uv[0]
-        for face, faceUvs in zip(bm.faces, uvs):
-            for loop, uv in zip(face.loops, faceUvs):
-                loop[uv_layer].uv = uv
+        store_stairs_settings(obj, STRAIGHT, params, self.lodLevels, self.collisionProxy, self.collisionShape, self.collisionSegments)
 
+        if self.lodLevels > 0:
+            from .stairsLod import add_lod_objects
+            add_lod_objects(obj, STRAIGHT, params, self.lodLevels)
 
-        bm.to_mesh(mesh)
-        bm.free()
-        mesh.update()
+        if self.collisionProxy:
+            from .stairsCollision import add_collision_object
+            add_collision_object(obj, STRAIGHT, params, self.collisionShape, self.collisionSegments)
 
-        # add the mesh as an object into the scene with this utility module
-        from bpy_extras import object_utils
-        object_utils.object_data_add(context, mesh, operator=self)
+    def execute(self, context):
+        #Geometry code is imported on first use to keep add-on startup light
+        from .meshBuilder import insert_into_edit_mesh
+        from ..core.geometryCache import geometryCache
+        from ..core.phaseTimer import PhaseTimer
+
+        timer = PhaseTimer(self.profile, self.profileMemory)
+
+        params = params_from(STRAIGHT, self)
+        with timer.phase("geometry"):
+            buffers = geometryCache.get(STRAIGHT, params)
+
+        editObj = context.edit_object
+        if self.editModeInsert and editObj is not None and editObj.type == 'MESH':
+            #Place at the operator location, which defaults to the 3D cursor
+            from bpy_extras import object_utils
+            matrix = editObj.matrix_world.inverted() @ object_utils.add_object_align_init(context, self)
+            bpy.ops.mesh.select_all(action='DESELECT')
+            insert_into_edit_mesh(editObj, buffers, matrix, timer)
+        else:
+            self.add_stairs_object(context, params, buffers, timer)
+
+        if self.profile:
+            from .stairsProfiling import report_profile
+            timer.count(verts=buffers.numVerts, faces=buffers.numFaces, loops=buffers.numLoops)
+            report_profile(self, timer, self.statsPath, params)
 
         return {'FINISHED'}
 
@@ -0,0 +1,151 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import bpy
+from bpy_extras.io_utils import ImportHelper
+
+from bpy.props import (
+    BoolProperty,
+    IntProperty,
+    StringProperty,
+)
+
+
+def parallel_supported():
+    #Before 2.91 sys.executable is the Blender binary, which cannot host pool workers
+    return bpy.app.version >= (2, 91, 0)
+
+
+def build_stairs_objects(collection, specs, joinMeshes=False, name="Stairs Batch", processes=1, shareMeshes=False):
+    """Create objects for a list of StairsSpec and link them to collection.
+
+    Objects are created directly through bpy.data, so the whole batch costs a
+    single depsgraph update.  With joinMeshes every staircase is transformed
+    into one mesh and a single object is returned.  When processes is not 1
+    the geometry is generated by a process pool (0 or None for every core)
+    and only inserted into bpy.data here.  With shareMeshes staircases with
+    identical parameters use the same mesh datablock.
+    """
+    from .meshBuilder import buffers_to_mesh, stairs_mesh
+    from .stairsObject import store_stairs_settings
+    from ..core.geometryCache import geometryCache, params_hash
+
+    if processes != 1 and parallel_supported():
+        from ..core.parallel import generate_many
+        buffersList = generate_many([(spec.stairsType, spec.params) for spec in specs], processes or None, diskCache=geometryCache.disk_cache())
+    else:
+        buffersList = [geometryCache.get(spec.stairsType, spec.params) for spec in specs]
+
+    if joinMeshes:
+        from ..core.meshBuffers import merge_buffers, transform_buffers, transform_matrix
+        merged = merge_buffers([
+            transform_buffers(buffers, transform_matrix(spec.location, spec.rotation, spec.scale))
+            for spec, buffers in zip(specs, buffersList)
+        ])
+        mesh = buffers_to_mesh(name, merged)
+        obj = bpy.data.objects.new(name, mesh)
+        collection.objects.link(obj)
+        return [obj]
+
+    objects = []
+    batchMeshes = {}
+    for spec, buffers in zip(specs, buffersList):
+        if shareMeshes:
+            #Avoid scanning bpy.data.meshes again for repeats within the batch
+            key = params_hash(spec.stairsType, spec.params)
+            mesh = batchMeshes.get(key)
+            if mesh is None:
+                mesh = batchMeshes[key] = stairs_mesh(spec.name, spec.stairsType, spec.params, buffers, True)
+        else:
+            mesh = stairs_mesh(spec.name, spec.stairsType, spec.params, buffers)
+        obj = bpy.data.objects.new(spec.name, mesh)
+        obj.location = spec.location
+        obj.rotation_euler = spec.rotation
+        obj.scale = spec.scale
+        store_stairs_settings(obj, spec.stairsType, spec.params)
+        collection.objects.link(obj)
+        objects.append(obj)
+
+    return objects
+
+
+class AddStairsBatch(bpy.types.Operator, ImportHelper):
+    """Add every staircase listed in a JSON or CSV spec file"""
+    bl_idname = "mesh.primitive_stairs_batch_add"
+    bl_label = "Add Stairs From Spec"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filter_glob: StringProperty(
+        default="*.json;*.csv",
+        options={'HIDDEN'},
+    )
+    joinMeshes: BoolProperty(
+        name="Join Meshes",
+        description="Build all staircases as a single mesh object instead of one object each",
+        default=False,
+    )
+    shareMeshes: BoolProperty(
+        name="Share Meshes",
+        description="Staircases with identical parameters use one mesh, also reusing matching meshes already in the file",
+        default=True,
+    )
+    processes: IntProperty(
+        name="Processes",
+        description="Worker processes used to generate the geometry of large batches.  0 uses every CPU core, 1 generates everything in Blender's own process.  Batches with fewer than a million steps in total are always generated in Blender's own process, which is faster for them",
+        min=0, soft_max=64,
+        default=0,
+    )
+
+    def execute(self, context):
+        from ..core.batchSpec import load_spec
+
+        try:
+            specs = load_spec(self.filepath)
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, "Could not read stairs spec: %s" % e)
+            return {'CANCELLED'}
+
+        if not specs:
+            self.report({'WARNING'}, "Stairs spec is empty")
+            return {'CANCELLED'}
+
+        objects = build_stairs_objects(context.collection, specs, self.joinMeshes, processes=self.processes, shareMeshes=self.shareMeshes)
+
+        for obj in context.selected_objects:
+            obj.select_set(False)
+        for obj in objects:
+            obj.select_set(True)
+        context.view_layer.objects.active = objects[-1]
+
+        self.report({'INFO'}, "Added %d staircases" % len(specs))
+        return {'FINISHED'}
+
+
+def menu_func(self, context):
+    self.layout.operator(AddStairsBatch.bl_idname, icon='FORWARD')
+
+
+def register():
+    bpy.utils.register_class(AddStairsBatch)
+    bpy.types.VIEW3D_MT_mesh_add.append(menu_func)
+
+
+def unregister():
+    bpy.utils.unregister_class(AddStairsBatch)
+    bpy.types.VIEW3D_MT_mesh_add.remove(menu_func)
+
+
+if __name__ == "__main__":
+    register()
@@ -14,130 +14,8 @@
 
 
 import bpy
-import bmesh
-import math
-import os
-import bpy.utils.previews
 from bpy_extras.object_utils import AddObjectHelper
-
-def add_stairs(height, stepWidth, stepType, numSteps, userStepHeight, curvature, innerRadius, ccw, sides):
-
-    verts = []
-    faces = []
-    uvs = []
-    
-    if stepType == "NUM_STAIRS": 
-        stepHeight = height / numSteps
-    else:
-        stepHeight = userStepHeight
-        numSteps = max(math.floor(height / userStepHeight), 1)
-        height = stepHeight * numSteps
-        
-    deltaAngle = math.radians(curvature) / numSteps
-    stepDepth = 2 * math.pi * (curvature / 360) * (innerRadius + stepWidth / 2) / numSteps
-
-    f = 0
-    
-    if ccw:
-        offsetX = -innerRadius - stepWidth / 2
-    else:
-        offsetX = innerRadius + stepWidth / 2
-    
-    #Draw steps    
-    for i in range(numSteps + 1):
-        if ccw:
-            x = math.cos(i * deltaAngle)
-            y = math.sin(i * deltaAngle)
-        else:
-            x = -math.cos(i * deltaAngle)
-            y = math.sin(i * deltaAngle)
-
-        x0 = x * innerRadius + offsetX
-        y0 = y * innerRadius
-        x1 = x * (innerRadius + stepWidth) + offsetX
-        y1 = y * (innerRadius + stepWidth)
-
-        verts.append((x0, y0, i * stepHeight))
-        verts.append((x1, y1, i * stepHeight))
-        if i != numSteps:
-            verts.append((x0, y0, (i + 1) * stepHeight))
-            verts.append((x1, y1, (i + 1) * stepHeight))
-
-    uvyOffset = 0
-        
-    for i in range(numSteps):
-        faces.append((f + 0, f + 1, f + 3, f + 2))
-        uvs.append(((0, uvyOffset), (stepWidth, uvyOffset), (stepWidth, uvyOffset + stepHeight), (0, uvyOffset + stepHeight)))
-        uvyOffset+= stepHeight
-
-        faces.append((f + 2, f + 3, f + 5, f + 4))
-        uvs.append(((0, uvyOffset), (stepWidth, uvyOffset), (stepWidth, uvyOffset + stepDepth), (0, uvyOffset + stepDepth)))
-        uvyOffset+= stepDepth
-
-        f += 4
-
-    if sides:
-        for i in range(1, numSteps + 1):
-            if ccw:
-                x = math.cos(i * deltaAngle)
-                y = math.sin(i * deltaAngle)
-            else:
-                x = -math.cos(i * deltaAngle)
-                y = math.sin(i * deltaAngle)
-
-            x0 = x * innerRadius + offsetX
-            y0 = y * innerRadius
-            x1 = x * (innerRadius + stepWidth) + offsetX
-            y1 = y * (innerRadius + stepWidth)
-
-            verts.append((x0, y0, 0))
-            verts.append((x1, y1, 0))
-
-        #Side trianges
-        for i in range(0, numSteps):
-            g = i * 4
-            #triangle at step
-            faces.append((g + 0, g + 2, g + 4))
-            uvs.append(((i * stepDepth, verts[g + 0][2]), (i * stepDepth, verts[g + 2][2]), ((i + 1) * stepDepth, verts[g + 4][2])))
-       
-            faces.append((g + 1, g + 5, g + 3))
-            uvs.append(((i * stepDepth, verts[g + 0][2]), ((i + 1) * stepDepth, verts[g + 4][2]), (i * stepDepth, verts[g + 2][2])))
-
-        #side of first step of stairs
-        bottomVertIdxStart = numSteps * 4 + 2
-        faces.append((0, 4, bottomVertIdxStart))
-        uvs.append(((0, verts[0][2]), (stepDepth, verts[4][2]), (stepDepth, verts[bottomVertIdxStart][2])))
-        
-        faces.append((1, bottomVertIdxStart + 1, 5))
-        uvs.append(((0, verts[0][2]), (stepDepth, verts[bottomVertIdxStart][2]), (stepDepth, verts[4][2])))
-            
-        #Side slats
-        for i in range(1, numSteps):
-            g = i * 4
-            h = numSteps * 4 + 2 + (i - 1) * 2
-            
-            faces.append((h + 0, g + 0, g + 4, h + 2))
-            uvs.append(((i * stepDepth, verts[h + 0][2]), (i * stepDepth, verts[g + 0][2]), ((i + 1) * stepDepth, verts[g + 4][2]), ((i + 1) * stepDepth, verts[h + 2][2])))
-
-            faces.append((h + 1, h + 3, g + 5, g + 1))
-            uvs.append(((i * stepDepth, verts[h + 0][2]), ((i + 1) * stepDepth, verts[h + 2][2]), ((i + 1) * stepDepth, verts[g + 4][2]), (i * stepDepth, verts[g + 0][2])))
-        
-        #bottom
-        faces.append((0, bottomVertIdxStart, bottomVertIdxStart + 1, 1))
-        uvs.append(((0, 0), (0, stepDepth), (stepWidth, stepDepth), (stepWidth, 0)))
-
-        for i in range(1, numSteps):
-            h = numSteps * 4 + 2 + (i - 1) * 2
-            faces.append((h + 0, h + 2, h + 3, h + 1))
-            uvs.append(((0, i * stepDepth), (0, (i + 1) * stepDepth), (stepWidth, (i + 1) * stepDepth), (stepWidth, i * stepDepth)))
-
-        #back
-        faces.append((bottomVertIdxStart - 2, bottomVertIdxStart - 1, numSteps * 6 + 1, numSteps * 6))
-        uvs.append(((0, 1), (1, 1), (1, 0), (0, 0)))
-            
-
-    return verts, faces, uvs
-
+from ..core.generators import CURVED, params_from
 
 from bpy.props import (
     BoolProperty,
@@ -147,6 +25,7 @@ from bpy.props import (
     IntVectorProperty,
     FloatProperty,
     FloatVectorProperty,
+    StringProperty,
 )
 
 #step type enum
@@ -183,7 +62,7 @@ class AddStairsCurved(bpy.types.Operator):
     numSteps: IntProperty(
         name="NumSteps",
         description="Number of Steps",
-        min=1, soft_max=100,
+        min=1, soft_max=1000,
         default=6,
     )
     stepHeight: FloatProperty(
@@ -210,11 +89,85 @@ class AddStairsCurved(bpy.types.Operator):
         description="Build sides and bottom of stairs.",
         default=True
     )
+    minimalTopology: BoolProperty(
+        name="Minimal Topology",
+        description="Build each side of a step as one face and the bottom as a single n-gon.  Keeps the shape and UVs with fewer faces",
+        default=False,
+    )
+    adaptiveCurve: BoolProperty(
+        name="Adaptive Curve",
+        description="Split the curved edges of each step into as few segments as keep them within the chord tolerance of a true arc",
+        default=False,
+    )
+    chordTolerance: FloatProperty(
+        name="Chord Tolerance",
+        description="Largest distance the curved edges may stray from a true arc when Adaptive Curve is on",
+        min=0.00001, soft_max=1.0,
+        precision=4,
+        default=0.001,
+    )
+    turns: IntProperty(
+        name="Turns",
+        description="Number of times the stairs repeat, each one rotated by the curvature and raised by the height",
+        min=1, soft_max=50,
+        default=1,
+    )
+    centralColumn: BoolProperty(
+        name="Central Column",
+        description="Add a column filling the inner radius from the floor to the top of the stairs",
+        default=False,
+    )
     ccw: BoolProperty(
         name="Counter Clockwise",
         description="Stairs should spiral in a counter-clockwise direction.",
         default=True
     )
+    shareMesh: BoolProperty(
+        name="Share Mesh",
+        description="Reuse the mesh of an existing staircase with identical parameters, creating a linked duplicate",
+        default=False,
+    )
+    editModeInsert: BoolProperty(
+        name="Insert Into Edit Mesh",
+        description="In Edit Mode, add the stairs to the mesh being edited instead of joining a new object into it",
+        default=True,
+    )
+    lodLevels: IntProperty(
+        name="LOD Levels",
+        description="Number of lower detail versions to add as children.  Each halves the steps and the last is a ramp",
+        min=0, max=8,
+        default=0,
+    )
+    collisionProxy: BoolProperty(
+        name="Collision Proxy",
+        description="Add a low poly collision mesh as a child of the stairs",
+        default=False,
+    )
+    collisionSegments: IntProperty(
+        name="Collision Pieces",
+        description="Number of convex pieces in the collision proxy",
+        min=1, soft_max=32,
+        default=4,
+    )
+    profile: BoolProperty(
+        name="Profile",
+        description="Time each phase of building the stairs and report the results",
+        default=False,
+        options={'SKIP_SAVE'},
+    )
+    profileMemory: BoolProperty(
+        name="Profile Memory",
+        description="Also measure the peak memory of each phase.  This slows the phases down, so timings are only accurate with it off",
+        default=False,
+        options={'SKIP_SAVE'},
+    )
+    statsPath: StringProperty(
+        name="Stats File",
+        description="JSON file to write the profile to.  Leave empty to only report it",
+        subtype='FILE_PATH',
+        default="",
+        options={'SKIP_SAVE'},
+    )
     layers: BoolVectorProperty(
         name="Layers",
         description="Object Layers",
@@ -243,46 +196,60 @@ class AddStairsCurved(bpy.types.Operator):
         subtype='EULER',
     )
 
-    def execute(self, context):
-
-        verts_loc, faces, uvs = add_stairs(
-            self.height,
-            self.stairWidth,
-            self.stepType,
-            self.numSteps,
-            self.stepHeight,
-            self.curvature,
-            self.innerRadius,
-            self.ccw,
-            self.sides
-        )
-
-        mesh = bpy.data.meshes.new("Curved Stairs")
+    def add_stairs_object(self, context, params, buffers, timer):
+        """Build the stairs as a new object, with its LOD and collision children."""
+        from .meshBuilder import stairs_mesh
+        from .stairsObject import store_stairs_settings
+        #In Edit Mode object_data_add joins the stairs into the edited mesh
+        joined = context.edit_object is not None
 
-        bm = bmesh.new()
+        #The join deletes the mesh it was given, so it must not be a shared one
+        mesh = stairs_mesh("Curved Stairs", CURVED, params, buffers, self.shareMesh and not joined, timer)
 
-        for v_co in verts_loc:
-            bm.verts.new(v_co)
+        # add the mesh as an object into the scene with this utility module
+        from bpy_extras import object_utils
+        with timer.phase("object_data_add"):
+            obj = object_utils.object_data_add(context, mesh, operator=self)
+        if joined:
+            #The result is the user's mesh, not a staircase that can be regenerated
+            return
 
-        bm.verts.ensure_lookup_table()
-        for f_idx in faces:
-            bm.faces.new([bm.verts[i] for i in f_idx])
+        store_stairs_settings(obj, CURVED, params, self.lodLevels, self.collisionProxy, "RAMP", self.collisionSegments)
 
-        #create a uv layer and generate uv coords
-        uv_layer = bm.loops.layers.uv.new()
+        if self.lodLevels > 0:
+            from .stairsLod import add_lod_objects
+            add_lod_objects(obj, CURVED, params, self.lodLevels)
 
-        loop = bm.loops.layers.uv[0]
-        for face, faceUvs in zip(bm.faces, uvs):
-            for loop, uv in zip(face.loops, faceUvs):
-                loop[uv_layer].uv = uv
+        if self.collisionProxy:
+            from .stairsCollision import add_collision_object
+            add_collision_object(obj, CURVED, params, numSegments=self.collisionSegments)
 
-        bm.to_mesh(mesh)
-        bm.free()
-        mesh.update()
+    def execute(self, context):
+        #Geometry code is imported on first use to keep add-on startup light
+        from .meshBuilder import insert_into_edit_mesh
+        from ..core.geometryCache import geometryCache
+        from ..core.phaseTimer import PhaseTimer
+
+        timer = PhaseTimer(self.profile, self.profileMemory)
+
+        params = params_from(CURVED, self)
+        with timer.phase("geometry"):
+            buffers = geometryCache.get(CURVED, params)
+
+        editObj = context.edit_object
+        if self.editModeInsert and editObj is not None and editObj.type == 'MESH':
+            #Place at the operator location, which defaults to the 3D cursor
+            from bpy_extras import object_utils
+            matrix = editObj.matrix_world.inverted() @ object_utils.add_object_align_init(context, self)
+            bpy.ops.mesh.select_all(action='DESELECT')
+            insert_into_edit_mesh(editObj, buffers, matrix, timer)
+        else:
+            self.add_stairs_object(context, params, buffers, timer)
 
-        # add the mesh as an object into the scene with this utility module
-        from bpy_extras import object_utils
-        object_utils.object_data_add(context, mesh, operator=self)
+        if self.profile:
+            from .stairsProfiling import report_profile
+            timer.count(verts=buffers.numVerts, faces=buffers.numFaces, loops=buffers.numLoops)
+            report_profile(self, timer, self.statsPath, params)
 
         return {'FINISHED'}
 
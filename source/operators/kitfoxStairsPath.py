@@ -0,0 +1,165 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import bpy
+
+from bpy.props import (
+    BoolProperty,
+    EnumProperty,
+    IntProperty,
+    FloatProperty,
+)
+
+#step type enum
+step_type = [
+    ("NUM_STAIRS", "Num Stairs", "", 1),
+    ("STAIR_HEIGHT", "Stair Height", "", 2),
+]
+
+
+def _get_vectors(collection, name, size):
+    import numpy as np
+    values = np.empty(len(collection) * size)
+    collection.foreach_get(name, values)
+    return values.reshape(-1, size)
+
+
+def spline_path(spline):
+    """Polyline of a Bezier, poly or NURBS spline in object space.  NURBS splines follow their control points."""
+    import numpy as np
+    from ..core.pathStairs import bezier_points
+
+    if spline.type == 'BEZIER':
+        points = spline.bezier_points
+        return bezier_points(
+            _get_vectors(points, "co", 3),
+            _get_vectors(points, "handle_left", 3),
+            _get_vectors(points, "handle_right", 3),
+            spline.use_cyclic_u,
+        )
+
+    co = _get_vectors(spline.points, "co", 4)[:, 0:3]
+    if spline.use_cyclic_u:
+        co = np.vstack((co, co[:1]))
+    return co
+
+
+class AddStairsPath(bpy.types.Operator):
+    """Add a stairs mesh following the active curve"""
+
+    bl_idname = "mesh.primitive_stairs_path_add"
+    bl_label = "Add Stairs Along Curve"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    width: FloatProperty(
+        name="Width",
+        description="Stairs Width",
+        min=0.01, soft_max=100.0,
+        default=2.0,
+    )
+    height: FloatProperty(
+        name="Height",
+        description="Stairs Height",
+        min=0.01, soft_max=100.0,
+        default=1.0,
+    )
+    stepType: EnumProperty(
+        name="Step Type",
+        description="Choose between using 'number of steps' or 'step height' for determining height of a step",
+        items=step_type,
+        default="NUM_STAIRS",
+    )
+    numSteps: IntProperty(
+        name="Number of Steps",
+        description="Number of Steps",
+        min=1, soft_max=1000,
+        default=12,
+    )
+    stepHeight: FloatProperty(
+        name="Step Height",
+        description="Step Height",
+        min=0.01, soft_max=100.0,
+        default=0.16666,
+    )
+    sides: BoolProperty(
+        name="Create Sides",
+        description="Build sides and bottom of stairs.",
+        default=True,
+    )
+    minimalTopology: BoolProperty(
+        name="Minimal Topology",
+        description="Build each side of a step as one face and the bottom as a single n-gon.  Keeps the shape and UVs with fewer faces",
+        default=False,
+    )
+    splineIndex: IntProperty(
+        name="Spline",
+        description="Index of the spline in the curve to follow",
+        min=0,
+        default=0,
+    )
+    reverse: BoolProperty(
+        name="Reverse",
+        description="Climb from the end of the curve towards its start",
+        default=False,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.active_object
+        return obj is not None and obj.type == 'CURVE' and len(obj.data.splines) > 0 and context.mode == 'OBJECT'
+
+    def execute(self, context):
+        #Geometry code is imported on first use to keep add-on startup light
+        from .meshBuilder import buffers_to_mesh
+        from ..core.pathStairs import path_stairs_buffers
+
+        curveObj = context.active_object
+        splines = curveObj.data.splines
+        try:
+            points = spline_path(splines[min(self.splineIndex, len(splines) - 1)])
+            if self.reverse:
+                points = points[::-1]
+            buffers = path_stairs_buffers(points, self.width, self.height, self.stepType, self.numSteps, self.stepHeight, self.sides, self.minimalTopology)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+
+        mesh = buffers_to_mesh("Path Stairs", buffers)
+
+        #Stairs share the transform of the curve they follow
+        obj = bpy.data.objects.new(mesh.name, mesh)
+        context.collection.objects.link(obj)
+        obj.matrix_world = curveObj.matrix_world
+
+        for selected in context.selected_objects:
+            selected.select_set(False)
+        obj.select_set(True)
+        context.view_layer.objects.active = obj
+
+        return {'FINISHED'}
+
+
+def menu_func(self, context):
+    self.layout.operator(AddStairsPath.bl_idname, icon='FORWARD')
+
+
+def register():
+    bpy.utils.register_class(AddStairsPath)
+    bpy.types.VIEW3D_MT_mesh_add.append(menu_func)
+
+
+def unregister():
+    bpy.utils.unregister_class(AddStairsPath)
+    bpy.types.VIEW3D_MT_mesh_add.remove(menu_func)
@@ -0,0 +1,182 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import bpy
+from bpy_extras.object_utils import AddObjectHelper
+from ..core.generators import STRAIGHT
+
+from bpy.props import (
+    BoolProperty,
+    EnumProperty,
+    IntProperty,
+    FloatProperty,
+    FloatVectorProperty,
+)
+
+
+def build_floor_collection(name, flightMesh, landingMesh, layout):
+    """Collection holding the objects of one floor.  It is only used for instancing and not linked to the scene."""
+    from ..core.stairwell import FLIGHT
+
+    floor = bpy.data.collections.new(name)
+    for kind, location, rotation in layout:
+        mesh = flightMesh if kind == FLIGHT else landingMesh
+        obj = bpy.data.objects.new(mesh.name, mesh)
+        obj.location = location
+        obj.rotation_euler = (0, 0, rotation)
+        floor.objects.link(obj)
+    return floor
+
+
+class AddStairwell(bpy.types.Operator):
+    """Add a stairwell of switchback flights, with every floor instancing the same collection"""
+
+    bl_idname = "mesh.primitive_stairwell_add"
+    bl_label = "Add Stairwell"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    numFloors: IntProperty(
+        name="Floors",
+        description="Number of storeys the stairwell climbs",
+        min=1, soft_max=100,
+        default=4,
+    )
+    storeyHeight: FloatProperty(
+        name="Storey Height",
+        description="Height from one floor to the next",
+        min=0.01, soft_max=100.0,
+        default=3.0,
+    )
+    stepsPerFlight: IntProperty(
+        name="Steps per Flight",
+        description="Number of steps in each of the two flights of a floor",
+        min=1, soft_max=100,
+        default=10,
+    )
+    flightWidth: FloatProperty(
+        name="Flight Width",
+        description="Width of each flight",
+        min=0.01, soft_max=100.0,
+        default=1.2,
+    )
+    flightDepth: FloatProperty(
+        name="Flight Depth",
+        description="Horizontal length of each flight",
+        min=0.01, soft_max=100.0,
+        default=3.0,
+    )
+    landingDepth: FloatProperty(
+        name="Landing Depth",
+        description="Depth of the landings between flights",
+        min=0.01, soft_max=100.0,
+        default=1.5,
+    )
+    landingThickness: FloatProperty(
+        name="Landing Thickness",
+        description="Thickness of the landing slabs",
+        min=0.01, soft_max=10.0,
+        default=0.2,
+    )
+    wellGap: FloatProperty(
+        name="Well Gap",
+        description="Gap between the two flights of a floor",
+        min=0.0, soft_max=10.0,
+        default=0.2,
+    )
+    floorRotation: FloatProperty(
+        name="Floor Rotation",
+        description="Rotation of each floor about the vertical axis relative to the floor below",
+        subtype='ANGLE',
+        default=0.0,
+    )
+    sides: BoolProperty(
+        name="Create Sides",
+        description="Build sides and bottom of the flights.",
+        default=True,
+    )
+
+    # generic transform props
+    align_items = (
+            ('WORLD', "World", "Align the new object to the world"),
+            ('VIEW', "View", "Align the new object to the view"),
+            ('CURSOR', "3D Cursor", "Use the 3D cursor orientation for the new object")
+    )
+    align: EnumProperty(
+            name="Align",
+            items=align_items,
+            default='WORLD',
+            update=AddObjectHelper.align_update_callback,
+            )
+    location: FloatVectorProperty(
+        name="Location",
+        subtype='TRANSLATION',
+    )
+    rotation: FloatVectorProperty(
+        name="Rotation",
+        subtype='EULER',
+    )
+
+
+    def execute(self, context):
+        #Geometry code is imported on first use to keep add-on startup light
+        from .meshBuilder import buffers_to_mesh, stairs_mesh
+        from ..core.geometryCache import geometryCache
+        from ..core.stairwell import flight_params, floor_layout, floor_transforms, landing_buffers, top_landing_transform
+
+        #One flight mesh and one landing mesh serve every floor
+        params = flight_params(self.storeyHeight, self.flightWidth, self.flightDepth, self.stepsPerFlight, self.sides)
+        flightMesh = stairs_mesh("Stairwell Flight", STRAIGHT, params, geometryCache.get(STRAIGHT, params))
+        landingMesh = buffers_to_mesh("Stairwell Landing", landing_buffers(self.flightWidth, self.wellGap, self.landingDepth, self.landingThickness))
+
+        layout = floor_layout(self.storeyHeight, self.flightWidth, self.flightDepth, self.wellGap)
+        floor = build_floor_collection("Stairwell Floor", flightMesh, landingMesh, layout)
+
+        from bpy_extras import object_utils
+        root = object_utils.object_data_add(context, None, operator=self, name="Stairwell")
+        collections = root.users_collection
+
+        for i, (location, rotation) in enumerate(floor_transforms(self.numFloors, self.storeyHeight, self.floorRotation)):
+            instance = bpy.data.objects.new("%s Floor %d" % (root.name, i + 1), None)
+            instance.instance_type = 'COLLECTION'
+            instance.instance_collection = floor
+            instance.location = location
+            instance.rotation_euler = (0, 0, rotation)
+            instance.parent = root
+            for collection in collections:
+                collection.objects.link(instance)
+
+        location, rotation = top_landing_transform(self.numFloors, self.storeyHeight, self.flightWidth, self.flightDepth, self.wellGap, self.floorRotation)
+        topLanding = bpy.data.objects.new("%s Top Landing" % root.name, landingMesh)
+        topLanding.location = location
+        topLanding.rotation_euler = (0, 0, rotation)
+        topLanding.parent = root
+        for collection in collections:
+            collection.objects.link(topLanding)
+
+        return {'FINISHED'}
+
+
+def menu_func(self, context):
+    self.layout.operator(AddStairwell.bl_idname, icon='FORWARD')
+
+
+def register():
+    bpy.utils.register_class(AddStairwell)
+    bpy.types.VIEW3D_MT_mesh_add.append(menu_func)
+
+
+def unregister():
+    bpy.utils.unregister_class(AddStairwell)
+    bpy.types.VIEW3D_MT_mesh_add.remove(menu_func)
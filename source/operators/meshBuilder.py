@@ -0,0 +1,198 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import bpy
+import bmesh
+import numpy as np
+from ..core.generators import complete_params
+from ..core.geometryCache import params_hash
+from ..core.phaseTimer import NO_TIMER
+
+#Custom properties identifying meshes built from stairs parameters
+STAIRS_HASH_PROP = "kitfoxStairsHash"
+STAIRS_PARAMS_PROP = "kitfoxStairsParams"
+
+
+def _loop_total_is_readonly():
+    #Blender 4.0 derives loop_total from loop_start and made it read only
+    return bpy.types.MeshPolygon.bl_rna.properties["loop_total"].is_readonly
+
+
+def fill_mesh(mesh, buffers, timer=NO_TIMER):
+    """Add the geometry in MeshBuffers to an empty mesh without going through BMesh."""
+
+    with timer.phase("vertices"):
+        mesh.vertices.add(buffers.numVerts)
+        mesh.vertices.foreach_set("co", np.ascontiguousarray(buffers.co, dtype=np.float32).ravel())
+
+    with timer.phase("faces"):
+        mesh.loops.add(buffers.numLoops)
+        mesh.polygons.add(buffers.numFaces)
+        mesh.loops.foreach_set("vertex_index", np.ascontiguousarray(buffers.loopVerts, dtype=np.int32))
+        mesh.polygons.foreach_set("loop_start", np.ascontiguousarray(buffers.loopStarts, dtype=np.int32))
+        if not _loop_total_is_readonly():
+            mesh.polygons.foreach_set("loop_total", np.ascontiguousarray(buffers.loopTotals, dtype=np.int32))
+
+    with timer.phase("uvs"):
+        #create a uv layer and fill in the uv coords
+        uvLayer = mesh.uv_layers.active
+        if uvLayer is None:
+            uvLayer = mesh.uv_layers.new()
+        uvLayer.data.foreach_set("uv", np.ascontiguousarray(buffers.uvs, dtype=np.float32).ravel())
+
+    with timer.phase("update"):
+        mesh.update(calc_edges=True)
+
+
+def buffers_to_mesh(name, buffers, timer=NO_TIMER):
+    """Create a new mesh datablock from MeshBuffers."""
+    mesh = bpy.data.meshes.new(name)
+    fill_mesh(mesh, buffers, timer)
+    return mesh
+
+
+def insert_into_edit_mesh(obj, buffers, matrix, timer=NO_TIMER):
+    """Append MeshBuffers to the mesh obj is editing, placed by matrix in object space.
+
+    The geometry goes into a temporary mesh through foreach_set and joins
+    the edit BMesh in a single from_mesh call.  It arrives selected, with
+    its UVs in the active UV layer.  Existing selection is left to the caller.
+    """
+
+    editMesh = obj.data
+    bm = bmesh.from_edit_mesh(editMesh)
+    uvLayer = bm.loops.layers.uv.active
+
+    temp = buffers_to_mesh("Stairs", buffers, timer)
+    with timer.phase("insert"):
+        temp.transform(matrix)
+        if uvLayer is not None:
+            #from_mesh matches UV layers by name
+            temp.uv_layers.active.name = uvLayer.name
+        for elements in (temp.vertices, temp.edges, temp.polygons):
+            elements.foreach_set("select", np.ones(len(elements), dtype=bool))
+
+        bm.from_mesh(temp)
+        bpy.data.meshes.remove(temp)
+
+    with timer.phase("update_edit_mesh"):
+        bmesh.update_edit_mesh(editMesh)
+
+
+#Custom properties marking the objects a stairs object generated as
+#children, and their order among the children with the same role
+CHILD_ROLE = "kitfoxStairsChild"
+CHILD_INDEX = "kitfoxStairsChildIndex"
+
+
+def add_child_object(parent, name, mesh, role="", index=0):
+    """Link a new object for mesh to the collections of parent, parented to it in place.
+
+    role and index are stored on the object so child_objects can find it again.
+    """
+    obj = bpy.data.objects.new(name, mesh)
+    for collection in parent.users_collection:
+        collection.objects.link(obj)
+    obj.parent = parent
+    if role:
+        obj[CHILD_ROLE] = role
+        obj[CHILD_INDEX] = index
+    return obj
+
+
+def child_objects(parent, role):
+    """The children of parent added with role, in index order."""
+    children = [child for child in parent.children if child.get(CHILD_ROLE) == role]
+    return sorted(children, key=lambda child: child.get(CHILD_INDEX, 0))
+
+
+def update_child_mesh(child, buffers):
+    """Replace the geometry of a generated child in place."""
+    if child.data.users > 1:
+        #Leave duplicates of the parent with their own children alone
+        child.data = child.data.copy()
+    update_mesh(child.data, buffers)
+
+
+def remove_child_objects(parent, role):
+    """Delete the children of parent added with role, and their meshes once unused."""
+    for child in child_objects(parent, role):
+        mesh = child.data
+        bpy.data.objects.remove(child)
+        if mesh is not None and mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+
+
+def same_topology(mesh, buffers):
+    """True if the faces of mesh connect the same vertices as buffers."""
+    if (len(mesh.vertices) != buffers.numVerts
+            or len(mesh.loops) != buffers.numLoops
+            or len(mesh.polygons) != buffers.numFaces):
+        return False
+
+    loopVerts = np.empty(buffers.numLoops, dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loopVerts)
+    loopStarts = np.empty(buffers.numFaces, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loopStarts)
+    return np.array_equal(loopVerts, buffers.loopVerts) and np.array_equal(loopStarts, buffers.loopStarts)
+
+
+def update_mesh(mesh, buffers):
+    """Replace the geometry of an existing mesh with buffers.
+
+    When the connectivity is unchanged only vertex positions and UVs are
+    written, otherwise the geometry is rebuilt.  Either way the mesh keeps
+    its name, materials and users.
+    """
+
+    if same_topology(mesh, buffers) and mesh.uv_layers.active is not None:
+        mesh.vertices.foreach_set("co", np.ascontiguousarray(buffers.co, dtype=np.float32).ravel())
+        mesh.uv_layers.active.data.foreach_set("uv", np.ascontiguousarray(buffers.uvs, dtype=np.float32).ravel())
+        mesh.update()
+        return
+
+    mesh.clear_geometry()
+    fill_mesh(mesh, buffers)
+
+
+def tag_stairs_mesh(mesh, stairsType, params):
+    """Store the parameters a stairs mesh was built from on the mesh."""
+    params = complete_params(stairsType, params)
+    mesh[STAIRS_HASH_PROP] = params_hash(stairsType, params)
+    mesh[STAIRS_PARAMS_PROP] = dict(params, stairsType=stairsType)
+
+
+def find_stairs_mesh(stairsType, params, buffers):
+    """Find a local mesh that was built from the same parameters and still matches buffers."""
+    key = params_hash(stairsType, params)
+    for mesh in bpy.data.meshes:
+        if (mesh.get(STAIRS_HASH_PROP) == key
+                and mesh.library is None
+                and len(mesh.vertices) == buffers.numVerts
+                and len(mesh.polygons) == buffers.numFaces):
+            return mesh
+    return None
+
+
+def stairs_mesh(name, stairsType, params, buffers, share=False, timer=NO_TIMER):
+    """Mesh for a staircase.  With share an existing mesh with the same parameters is reused."""
+    if share:
+        mesh = find_stairs_mesh(stairsType, params, buffers)
+        if mesh is not None:
+            return mesh
+
+    mesh = buffers_to_mesh(name, buffers, timer)
+    tag_stairs_mesh(mesh, stairsType, params)
+    return mesh
@@ -0,0 +1,64 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+COLLISION_ROLE = "COLLISION"
+
+#collision shape enum, using the RAMP and BOXES names of core.collision
+collision_shape = [
+    ("RAMP", "Ramp", "Single wedge along the slope of the stairs", 1),
+    ("BOXES", "Boxes", "Convex boxes following groups of steps", 2),
+]
+
+
+def add_collision_object(obj, stairsType, params, shape="RAMP", numSegments=4):
+    """Add a collision proxy named <name>_collision as a child of obj.
+
+    The proxy is drawn as wire and left out of renders.
+    """
+    from ..core.collision import collision_proxy
+
+    return _add_collision_object(obj, collision_proxy(stairsType, params, shape, numSegments))
+
+
+def _add_collision_object(obj, buffers):
+    from .meshBuilder import add_child_object, buffers_to_mesh
+
+    name = "%s_collision" % obj.name
+    proxy = add_child_object(obj, name, buffers_to_mesh(name, buffers), COLLISION_ROLE)
+    proxy.display_type = 'WIRE'
+    proxy.hide_render = True
+    return proxy
+
+
+def replace_collision_object(obj, stairsType, params, enabled, shape="RAMP", numSegments=4):
+    """Bring the collision proxy of obj up to date, or remove it when enabled is False.
+
+    An existing proxy has its mesh updated in place.
+    """
+    from .meshBuilder import child_objects, remove_child_objects, update_child_mesh
+    from ..core.collision import collision_proxy
+
+    if not enabled:
+        remove_child_objects(obj, COLLISION_ROLE)
+        return None
+
+    buffers = collision_proxy(stairsType, params, shape, numSegments)
+    proxies = child_objects(obj, COLLISION_ROLE)
+    if len(proxies) == 1:
+        update_child_mesh(proxies[0], buffers)
+        return proxies[0]
+
+    remove_child_objects(obj, COLLISION_ROLE)
+    return _add_collision_object(obj, buffers)
@@ -0,0 +1,55 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+from .meshBuilder import add_child_object, buffers_to_mesh, child_objects, remove_child_objects, update_child_mesh
+from ..core.lod import lod_chain
+from ..core.geometryCache import geometryCache
+
+LOD_ROLE = "LOD"
+
+
+def add_lod_objects(obj, stairsType, params, levels):
+    """Add objects named <name>_LOD1 up to <name>_LOD<levels> as hidden children of obj.
+
+    Fewer are added when the stairs have too few steps for every level.
+    """
+    return _add_lod_objects(obj, lod_chain(stairsType, params, levels, geometryCache.get))
+
+
+def _add_lod_objects(obj, chain):
+    lodObjects = []
+    for level, buffers in enumerate(chain, 1):
+        name = "%s_LOD%d" % (obj.name, level)
+        lodObj = add_child_object(obj, name, buffers_to_mesh(name, buffers), LOD_ROLE, level)
+        lodObj.hide_set(True)
+        lodObjects.append(lodObj)
+    return lodObjects
+
+
+def replace_lod_objects(obj, stairsType, params, levels):
+    """Bring the LOD children of obj up to date, eg after its parameters changed.
+
+    While the number of levels stays the same the existing meshes are
+    updated in place, so dragging a slider does not recreate objects.
+    """
+    chain = lod_chain(stairsType, params, levels, geometryCache.get)
+    lodObjects = child_objects(obj, LOD_ROLE)
+    if len(lodObjects) == len(chain):
+        for lodObj, buffers in zip(lodObjects, chain):
+            update_child_mesh(lodObj, buffers)
+        return lodObjects
+
+    remove_child_objects(obj, LOD_ROLE)
+    return _add_lod_objects(obj, chain)
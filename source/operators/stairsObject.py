@@ -0,0 +1,289 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import bpy
+from .stairsCollision import collision_shape
+from ..core.generators import STRAIGHT, CURVED, STAIRS_PARAMS, params_from
+
+from bpy.props import (
+    BoolProperty,
+    EnumProperty,
+    IntProperty,
+    FloatProperty,
+    PointerProperty,
+)
+
+#step type enum
+step_type = [
+    ("NUM_STAIRS", "Num Stairs", "", 1),
+    ("STAIR_HEIGHT", "Stair Height", "", 2),
+]
+
+stairs_type = [
+    (STRAIGHT, "Straight", "", 1),
+    (CURVED, "Curved", "", 2),
+]
+
+
+def regenerate_stairs(obj):
+    """Rebuild the mesh of a stairs object from the parameters stored on it."""
+    from .meshBuilder import tag_stairs_mesh, update_mesh
+    from ..core.geometryCache import geometryCache
+
+    settings = obj.kitfoxStairs
+    params = params_from(settings.stairsType, settings)
+    buffers = geometryCache.get(settings.stairsType, params)
+
+    mesh = obj.data
+    if mesh.users > 1:
+        #Leave linked duplicates with their own parameters alone
+        mesh = mesh.copy()
+        obj.data = mesh
+
+    update_mesh(mesh, buffers)
+    tag_stairs_mesh(mesh, settings.stairsType, params)
+
+    #Bring the children built from the old parameters up to date, adding or
+    #removing them only when the number of levels or the proxy setting changed
+    from .stairsLod import replace_lod_objects
+    from .stairsCollision import replace_collision_object
+    replace_lod_objects(obj, settings.stairsType, params, settings.lodLevels)
+    replace_collision_object(obj, settings.stairsType, params, settings.collisionProxy, settings.collisionShape, settings.collisionSegments)
+
+
+def update_stairs(self, context):
+    obj = self.id_data
+    #Mesh data changes made in edit mode would be overwritten on exit
+    if not self.isStairs or obj.type != 'MESH' or obj.mode == 'EDIT':
+        return
+    regenerate_stairs(obj)
+
+
+def store_stairs_settings(obj, stairsType, params, lodLevels=0, collisionProxy=False, collisionShape="RAMP", collisionSegments=4):
+    """Remember the parameters obj was built from, and the children it was given, so it can be edited later."""
+    settings = obj.kitfoxStairs
+    #Assign everything before isStairs so the updates do not regenerate the mesh
+    settings.isStairs = False
+    settings.stairsType = stairsType
+    for name, value in params.items():
+        setattr(settings, name, value)
+    settings.lodLevels = lodLevels
+    settings.collisionProxy = collisionProxy
+    settings.collisionShape = collisionShape
+    settings.collisionSegments = collisionSegments
+    settings.isStairs = True
+
+
+class KitfoxStairsSettings(bpy.types.PropertyGroup):
+    isStairs: BoolProperty(
+        name="Is Stairs",
+        description="Object was built by one of the stairs operators and can be regenerated",
+        default=False,
+    )
+    stairsType: EnumProperty(
+        name="Stairs Type",
+        items=stairs_type,
+        default=STRAIGHT,
+        update=update_stairs,
+    )
+    width: FloatProperty(
+        name="Width",
+        description="Stairs Width",
+        min=0.01, soft_max=100.0,
+        default=2.0,
+        update=update_stairs,
+    )
+    height: FloatProperty(
+        name="Height",
+        description="Stairs Height",
+        min=0.01, soft_max=100.0,
+        default=1.0,
+        update=update_stairs,
+    )
+    depth: FloatProperty(
+        name="Depth",
+        description="Stairs Depth",
+        min=0.01, soft_max=100.0,
+        default=2.0,
+        update=update_stairs,
+    )
+    stairWidth: FloatProperty(
+        name="Stair Width",
+        description="Width of a single stair",
+        min=0.01, soft_max=100.0,
+        default=1.0,
+        update=update_stairs,
+    )
+    stepType: EnumProperty(
+        name="Step Type",
+        description="Choose between using 'number of steps' or 'step height' for determining height of a step",
+        items=step_type,
+        default="NUM_STAIRS",
+        update=update_stairs,
+    )
+    numSteps: IntProperty(
+        name="Number of Steps",
+        description="Number of Steps",
+        min=1, soft_max=1000,
+        default=6,
+        update=update_stairs,
+    )
+    stepHeight: FloatProperty(
+        name="Step Height",
+        description="Step Height",
+        min=0.01, soft_max=100.0,
+        default=0.16666,
+        update=update_stairs,
+    )
+    curvature: FloatProperty(
+        name="Curvature",
+        description="Angle arc of staircase will sweep in degrees.",
+        min=0.01, soft_max=360.0,
+        step=20,
+        default=60.0,
+        update=update_stairs,
+    )
+    innerRadius: FloatProperty(
+        name="Inner Radius",
+        description="Radius of stair curve.",
+        min=0.01, soft_max=100.0,
+        default=1.0,
+        update=update_stairs,
+    )
+    sides: BoolProperty(
+        name="Create Sides",
+        description="Build sides and bottom of stairs.",
+        default=True,
+        update=update_stairs,
+    )
+    splitSides: BoolProperty(
+        name="Split Sides",
+        description="Build each side from one triangle and one quad per step instead of a single n-gon.  Recommended for very large step counts",
+        default=False,
+        update=update_stairs,
+    )
+    ccw: BoolProperty(
+        name="Counter Clockwise",
+        description="Stairs should spiral in a counter-clockwise direction.",
+        default=True,
+        update=update_stairs,
+    )
+    minimalTopology: BoolProperty(
+        name="Minimal Topology",
+        description="Build each side of a step as one face and the bottom as a single n-gon.  Keeps the shape and UVs with fewer faces",
+        default=False,
+        update=update_stairs,
+    )
+    adaptiveCurve: BoolProperty(
+        name="Adaptive Curve",
+        description="Split the curved edges of each step into as few segments as keep them within the chord tolerance of a true arc",
+        default=False,
+        update=update_stairs,
+    )
+    chordTolerance: FloatProperty(
+        name="Chord Tolerance",
+        description="Largest distance the curved edges may stray from a true arc when Adaptive Curve is on",
+        min=0.00001, soft_max=1.0,
+        precision=4,
+        default=0.001,
+        update=update_stairs,
+    )
+    turns: IntProperty(
+        name="Turns",
+        description="Number of times the stairs repeat, each one rotated by the curvature and raised by the height",
+        min=1, soft_max=50,
+        default=1,
+        update=update_stairs,
+    )
+    centralColumn: BoolProperty(
+        name="Central Column",
+        description="Add a column filling the inner radius from the floor to the top of the stairs",
+        default=False,
+        update=update_stairs,
+    )
+    lodLevels: IntProperty(
+        name="LOD Levels",
+        description="Number of lower detail versions kept as children.  Each halves the steps and the last is a ramp",
+        min=0, max=8,
+        default=0,
+        update=update_stairs,
+    )
+    collisionProxy: BoolProperty(
+        name="Collision Proxy",
+        description="Keep a low poly collision mesh as a child of the stairs",
+        default=False,
+        update=update_stairs,
+    )
+    collisionShape: EnumProperty(
+        name="Collision Shape",
+        description="Shape of the collision proxy of straight stairs",
+        items=collision_shape,
+        default="RAMP",
+        update=update_stairs,
+    )
+    collisionSegments: IntProperty(
+        name="Collision Pieces",
+        description="Number of convex pieces in the collision proxy",
+        min=1, soft_max=32,
+        default=4,
+        update=update_stairs,
+    )
+
+
+class OBJECT_PT_kitfox_stairs(bpy.types.Panel):
+    """Edit the parameters of a stairs object"""
+    bl_label = "Stairs"
+    bl_space_type = 'PROPERTIES'
+    bl_region_type = 'WINDOW'
+    bl_context = "object"
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        return obj is not None and obj.type == 'MESH' and obj.kitfoxStairs.isStairs
+
+    def draw(self, context):
+        layout = self.layout
+        obj = context.object
+        settings = obj.kitfoxStairs
+
+        if obj.mode == 'EDIT':
+            layout.label(text="Leave edit mode to change the stairs", icon='INFO')
+
+        col = layout.column()
+        col.enabled = obj.mode != 'EDIT'
+        col.label(text=settings.bl_rna.properties["stairsType"].enum_items[settings.stairsType].name)
+        for name in STAIRS_PARAMS[settings.stairsType]:
+            col.prop(settings, name)
+
+        col.separator()
+        col.prop(settings, "lodLevels")
+        col.prop(settings, "collisionProxy")
+        if settings.collisionProxy:
+            if settings.stairsType == STRAIGHT:
+                col.prop(settings, "collisionShape")
+            col.prop(settings, "collisionSegments")
+
+
+def register():
+    bpy.utils.register_class(KitfoxStairsSettings)
+    bpy.utils.register_class(OBJECT_PT_kitfox_stairs)
+    bpy.types.Object.kitfoxStairs = PointerProperty(type=KitfoxStairsSettings)
+
+
+def unregister():
+    del bpy.types.Object.kitfoxStairs
+    bpy.utils.unregister_class(OBJECT_PT_kitfox_stairs)
+    bpy.utils.unregister_class(KitfoxStairsSettings)
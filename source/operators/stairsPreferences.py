@@ -0,0 +1,95 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import bpy
+from ..core.geometryCache import geometryCache
+
+from bpy.props import (
+    IntProperty,
+    StringProperty,
+)
+
+ADDON_NAME = __package__.rpartition(".")[0]
+
+
+def get_preferences(context):
+    addon = context.preferences.addons.get(ADDON_NAME)
+    return addon.preferences if addon is not None else None
+
+
+def apply_cache_limits(prefs):
+    geometryCache.set_limits(prefs.cacheEntries, prefs.cacheMegabytes * 1024 * 1024)
+    geometryCache.set_disk_cache(bpy.path.abspath(prefs.diskCachePath) if prefs.diskCachePath else "", prefs.diskCacheMegabytes * 1024 * 1024)
+
+
+def update_cache_limits(self, context):
+    apply_cache_limits(self)
+
+
+class StairsPreferences(bpy.types.AddonPreferences):
+    bl_idname = ADDON_NAME
+
+    cacheEntries: IntProperty(
+        name="Cached Meshes",
+        description="Number of generated stair meshes kept in memory so the redo panel can reuse them.  Zero disables the cache",
+        min=0, soft_max=1024,
+        default=64,
+        update=update_cache_limits,
+    )
+    cacheMegabytes: IntProperty(
+        name="Cache Size (MB)",
+        description="Memory the cached stair meshes may use before the least recently used ones are dropped",
+        min=0, soft_max=4096,
+        default=256,
+        update=update_cache_limits,
+    )
+    diskCachePath: StringProperty(
+        name="Disk Cache Folder",
+        description="Folder to store generated stair meshes in, so later sessions and other Blender processes can reuse them.  Leave empty to disable",
+        subtype='DIR_PATH',
+        default="",
+        update=update_cache_limits,
+    )
+    diskCacheMegabytes: IntProperty(
+        name="Disk Cache Size (MB)",
+        description="Disk space the stored stair meshes may use before the least recently used ones are deleted",
+        min=1, soft_max=65536,
+        default=1024,
+        update=update_cache_limits,
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column()
+        col.label(text="Geometry Cache")
+        col.prop(self, "cacheEntries")
+        col.prop(self, "cacheMegabytes")
+        col.separator()
+        col.label(text="Disk Cache")
+        col.prop(self, "diskCachePath")
+        col.prop(self, "diskCacheMegabytes")
+
+
+def register():
+    bpy.utils.register_class(StairsPreferences)
+
+    prefs = get_preferences(bpy.context)
+    if prefs is not None:
+        apply_cache_limits(prefs)
+
+
+def unregister():
+    bpy.utils.unregister_class(StairsPreferences)
+    geometryCache.clear()
@@ -0,0 +1,28 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import bpy
+
+
+def report_profile(operator, timer, statsPath="", params=None):
+    """Show the phase timings of an operator run in the status bar and the log, and optionally save them."""
+    operator.report({'INFO'}, timer.summary())
+    timer.log(operator.bl_label)
+    if statsPath:
+        try:
+            timer.write_json(bpy.path.abspath(statsPath), operator=operator.bl_idname, params=params or {})
+        except OSError as e:
+            #The stairs are already built, so only warn
+            operator.report({'WARNING'}, "Could not write stats file: %s" % e)
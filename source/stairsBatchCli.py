@@ -0,0 +1,154 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Build every staircase in a spec file and save them to a .blend file.
+
+    blender -b --python-exit-code 1 --python <addon dir>/stairsBatchCli.py -- spec.json out.blend
+
+The add-on does not have to be installed or enabled.  No menus or
+operators are registered and nothing depends on an operator context.
+
+Options:
+    --join            Build all staircases as one mesh object
+    --no-share        Give every staircase its own mesh datablock
+    --processes N     Worker processes used to generate geometry (default 1, 0 for every core).
+                      Specs with fewer than a million steps in total always use one
+    --shards N        Split the spec across N Blender processes running at the
+                      same time, each writing out_<i>.blend
+    --disk-cache DIR  Reuse geometry stored in DIR by earlier runs and store new geometry there
+    --disk-cache-mb N Size limit of the disk cache (default 1024)
+"""
+
+import argparse
+import importlib
+import os
+import subprocess
+import sys
+
+#bpy is imported inside the functions that use it.  Geometry worker
+#processes run this file again as their main module, outside of Blender.
+
+
+def import_addon():
+    """Import the add-on package this script lives in, whatever its folder is called."""
+    addonDir = os.path.dirname(os.path.abspath(__file__))
+    parentDir, packageName = os.path.split(addonDir)
+    if parentDir not in sys.path:
+        sys.path.insert(0, parentDir)
+
+    batchSpec = importlib.import_module(packageName + ".core.batchSpec")
+    kitfoxStairsBatch = importlib.import_module(packageName + ".operators.kitfoxStairsBatch")
+    stairsObject = importlib.import_module(packageName + ".operators.stairsObject")
+    geometryCache = importlib.import_module(packageName + ".core.geometryCache")
+    return batchSpec, kitfoxStairsBatch, stairsObject, geometryCache
+
+
+def parse_args(argv):
+    #Blender keeps its own arguments before the --
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    else:
+        argv = []
+
+    parser = argparse.ArgumentParser(
+        prog="blender -b --python stairsBatchCli.py --",
+        description="Build the staircases listed in a JSON or CSV spec and save them to a .blend file.",
+    )
+    parser.add_argument("spec", help="JSON or CSV stairs spec")
+    parser.add_argument("output", help=".blend file to write")
+    parser.add_argument("--join", action="store_true", help="build all staircases as one mesh object")
+    parser.add_argument("--no-share", dest="share", action="store_false", help="give every staircase its own mesh")
+    parser.add_argument("--processes", type=int, default=1, help="geometry worker processes, 0 for every core")
+    parser.add_argument("--shards", type=int, default=1, help="number of Blender processes to split the spec across")
+    parser.add_argument("--disk-cache", dest="diskCache", default="", help="directory of geometry shared between runs")
+    parser.add_argument("--disk-cache-mb", dest="diskCacheMegabytes", type=int, default=1024, help="size limit of the disk cache")
+    parser.add_argument("--shard", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def shard_path(output, index):
+    root, ext = os.path.splitext(output)
+    return "%s_%d%s" % (root, index, ext or ".blend")
+
+
+def run_shards(args):
+    """Launch one background Blender per shard and wait for all of them."""
+    import bpy
+
+    children = []
+    for i in range(args.shards):
+        command = [
+            bpy.app.binary_path, "-b", "--factory-startup", "--python-exit-code", "1",
+            "--python", os.path.abspath(__file__), "--",
+            args.spec, shard_path(args.output, i),
+            "--shard", "%d/%d" % (i, args.shards),
+            "--processes", str(args.processes),
+        ]
+        if args.join:
+            command.append("--join")
+        if not args.share:
+            command.append("--no-share")
+        if args.diskCache:
+            command += ["--disk-cache", args.diskCache, "--disk-cache-mb", str(args.diskCacheMegabytes)]
+        children.append(subprocess.Popen(command))
+
+    failed = [i for i, child in enumerate(children) if child.wait() != 0]
+    if failed:
+        print("Stairs shards failed: %s" % ", ".join(str(i) for i in failed))
+        return 1
+    return 0
+
+
+def build(args):
+    import bpy
+
+    batchSpec, kitfoxStairsBatch, stairsObject, geometryCache = import_addon()
+    if args.diskCache:
+        geometryCache.geometryCache.set_disk_cache(os.path.abspath(args.diskCache), args.diskCacheMegabytes * 1024 * 1024)
+
+    specs = batchSpec.load_spec(args.spec)
+    if args.shard:
+        index, count = (int(part) for part in args.shard.split("/"))
+        specs = specs[index::count]
+    if not specs:
+        #An empty spec, or a shard beyond the number of staircases
+        print("Stairs spec is empty, %s not written" % args.output)
+        return 0
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+    #Register the stairs object properties, and with them their panel, so the
+    #saved stairs stay editable.  No operators or menus are registered.
+    stairsObject.register()
+
+    scene = bpy.context.scene
+    collection = bpy.data.collections.new("Stairs")
+    scene.collection.children.link(collection)
+
+    kitfoxStairsBatch.build_stairs_objects(collection, specs, args.join, processes=args.processes, shareMeshes=args.share)
+
+    bpy.ops.wm.save_as_mainfile(filepath=os.path.abspath(args.output))
+    print("Saved %d staircases to %s" % (len(specs), args.output))
+    return 0
+
+
+def main():
+    args = parse_args(sys.argv)
+    if args.shards > 1 and not args.shard:
+        return run_shards(args)
+    return build(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+#Records run time and peak memory of the stairs generators for a grid of
+#configurations and compares them with a stored baseline.  Exits with an
+#error if any configuration got noticeably slower or bigger.  Times depend
+#on the machine, so the baseline is not part of the repository.  Record one
+#with --save on the machine the comparison runs on, before making changes.
+#
+#    python test/benchmark.py [--save] [--baseline file] [maxSteps]
+
+import argparse
+import json
+import os
+import sys
+
+from scalingBenchmark import CASES, measure
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarkBaseline.json")
+
+#Allowed growth over the baseline before a configuration counts as a
+#regression.  Best of several runs still varies by up to about 1.6 times
+#between runs on a busy machine, while peak memory is repeatable.
+MAX_TIME_RATIO = 2.0
+MAX_MEMORY_RATIO = 1.1
+
+#Runs shorter than this are too noisy to compare times
+MIN_COMPARED_SECONDS = 0.05
+
+#Timed runs per configuration, the fastest one is kept
+REPEATS = 9
+
+
+def run(maxSteps):
+    results = {}
+    for name, func in CASES:
+        numSteps = 100
+        while numSteps <= maxSteps:
+            elapsed, peak = measure(func, numSteps, REPEATS)
+            key = "%s %d" % (name, numSteps)
+            results[key] = {"seconds": elapsed, "peakBytes": peak}
+            print("%-32s %9.2f ms  %9.1f MB" % (key, elapsed * 1000, peak / 1e6))
+            numSteps *= 10
+    return results
+
+
+def regressions(results, baseline):
+    found = []
+    for key, result in sorted(results.items()):
+        if key not in baseline:
+            continue
+        base = baseline[key]
+        timeRatio = result["seconds"] / base["seconds"]
+        memoryRatio = result["peakBytes"] / max(base["peakBytes"], 1)
+        if timeRatio > MAX_TIME_RATIO and result["seconds"] > MIN_COMPARED_SECONDS:
+            found.append("%s: time x%.2f (%.2f ms -> %.2f ms)" % (key, timeRatio, base["seconds"] * 1000, result["seconds"] * 1000))
+        if memoryRatio > MAX_MEMORY_RATIO:
+            found.append("%s: peak memory x%.2f (%.1f MB -> %.1f MB)" % (key, memoryRatio, base["peakBytes"] / 1e6, result["peakBytes"] / 1e6))
+    return found
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the stairs generators against a stored baseline.")
+    parser.add_argument("maxSteps", type=int, nargs="?", default=100000)
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    args = parser.parse_args()
+
+    results = run(args.maxSteps)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+            f.write("\n")
+        print("Saved baseline to %s" % args.baseline)
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print("No baseline at %s, run with --save first" % args.baseline)
+        sys.exit(1)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    found = regressions(results, baseline)
+    for line in found:
+        print("REGRESSION " + line)
+    if found:
+        sys.exit(1)
+    print("No regressions against %s" % args.baseline)
@@ -0,0 +1,61 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+
+import json
+import os
+import sys
+
+import pytest
+
+#Tests import the bpy-free source.core package straight from the checkout
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+def pytest_addoption(parser):
+    parser.addoption("--update-golden", action="store_true", default=False,
+        help="Rewrite the stored golden checksums from the current generators")
+
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "goldenChecksums.json")
+
+
+@pytest.fixture(scope="session")
+def golden(request):
+    """Stored checksums by case name.  With --update-golden tests fill it in and it is written back afterwards."""
+    update = request.config.getoption("--update-golden")
+    if update or not os.path.exists(GOLDEN_PATH):
+        checksums = {}
+    else:
+        with open(GOLDEN_PATH) as f:
+            checksums = json.load(f)
+    checksums = GoldenChecksums(checksums, update)
+    yield checksums
+    if update:
+        with open(GOLDEN_PATH, "w") as f:
+            json.dump(checksums.values, f, indent=1, sort_keys=True)
+            f.write("\n")
+
+
+class GoldenChecksums:
+    def __init__(self, values, update):
+        self.values = values
+        self.update = update
+
+    def check(self, name, value):
+        if self.update:
+            self.values[name] = value
+            return
+        assert name in self.values, "No golden checksum for %s, run pytest with --update-golden" % name
+        assert self.values[name] == value, "Output of %s changed" % name
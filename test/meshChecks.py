@@ -0,0 +1,59 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Checks on MeshBuffers shared by the tests and benchmarks."""
+
+import hashlib
+import numpy as np
+
+
+def directed_edges(buffers):
+    """(numLoops, 2) array of the edge leaving every face corner."""
+    nextLoop = np.arange(1, buffers.numLoops + 1)
+    nextLoop[buffers.loopStarts + buffers.loopTotals - 1] = buffers.loopStarts
+    return np.stack((buffers.loopVerts, buffers.loopVerts[nextLoop]), axis=1)
+
+
+def is_watertight(buffers):
+    """Every edge is shared by exactly two faces which wind it in opposite directions, and every vertex is used."""
+    edges = directed_edges(buffers).astype(np.int64)
+    numVerts = buffers.numVerts
+    keys = np.sort(edges[:, 0] * numVerts + edges[:, 1])
+    reverseKeys = edges[:, 1] * numVerts + edges[:, 0]
+    if (np.diff(keys) == 0).any():
+        return False
+    found = np.minimum(np.searchsorted(keys, reverseKeys), len(keys) - 1)
+    if (keys[found] != reverseKeys).any():
+        return False
+    return len(np.unique(buffers.loopVerts)) == numVerts
+
+
+def signed_volume(buffers):
+    """Volume enclosed by a closed mesh, negative if its faces point inwards."""
+    edges = directed_edges(buffers)
+    crosses = np.cross(buffers.co[edges[:, 0]], buffers.co[edges[:, 1]])
+    faceAreas = np.add.reduceat(crosses, buffers.loopStarts, axis=0) / 2
+    firstCorners = buffers.co[buffers.loopVerts[buffers.loopStarts]]
+    return np.einsum("ij,ij->", firstCorners, faceAreas) / 3
+
+
+def checksum(buffers, decimals=6):
+    """Hash of the mesh which ignores rounding noise below decimals places."""
+    digest = hashlib.sha256()
+    for values in (buffers.co, buffers.uvs):
+        #Adding zero turns -0.0 into 0.0
+        digest.update(np.ascontiguousarray(np.round(values, decimals) + 0.0, dtype=np.float64).tobytes())
+    for values in (buffers.loopVerts, buffers.loopStarts, buffers.loopTotals):
+        digest.update(np.ascontiguousarray(values, dtype=np.int64).tobytes())
+    return digest.hexdigest()
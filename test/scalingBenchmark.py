@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+#Measures how run time and peak memory of the stairs generators grow with
+#the step count.  The growth is fitted across every step count, as the
+#exponent of a power law, so one noisy timing cannot fail the run.  Exits
+#with an error if either grows noticeably faster than linearly.
+#
+#    python test/scalingBenchmark.py [maxSteps]
+
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from source.core import straightStairs, curvedStairs
+
+#Largest allowed exponents of the fitted power laws.  1 is linear, and
+#quadratic growth would give 2.  Time is left room for timing noise and for
+#the largest runs outgrowing the CPU caches, which measures up to about 1.2.
+MAX_TIME_EXPONENT = 1.3
+MAX_MEMORY_EXPONENT = 1.1
+
+CASES = [
+    ("straight", lambda n: straightStairs.add_stairs_buffers(2, n * 0.2, n * 0.3, "NUM_STAIRS", n, 0.2, False)),
+    ("straight sides", lambda n: straightStairs.add_stairs_buffers(2, n * 0.2, n * 0.3, "NUM_STAIRS", n, 0.2, True)),
+    ("straight split sides", lambda n: straightStairs.add_stairs_buffers(2, n * 0.2, n * 0.3, "NUM_STAIRS", n, 0.2, True, True)),
+    ("curved", lambda n: curvedStairs.add_stairs_buffers(n * 0.2, 1, "NUM_STAIRS", n, 0.2, 360, 2, True, False)),
+    ("curved sides", lambda n: curvedStairs.add_stairs_buffers(n * 0.2, 1, "NUM_STAIRS", n, 0.2, 360, 2, True, True)),
+    ("curved minimal topology", lambda n: curvedStairs.add_stairs_buffers(n * 0.2, 1, "NUM_STAIRS", n, 0.2, 360, 2, True, True, True)),
+    ("curved adaptive", lambda n: curvedStairs.add_stairs_buffers(n * 0.2, 1, "NUM_STAIRS", n, 0.2, n * 7.2, 2, True, True, False, True, 0.001)),
+]
+
+
+def clear_caches():
+    #Measure topology generation as well, not just cache hits
+    straightStairs.stairs_topology.cache_clear()
+    curvedStairs.stairs_topology.cache_clear()
+    curvedStairs.adaptive_topology.cache_clear()
+
+
+def measure(func, numSteps, repeats=5):
+    best = None
+    for i in range(repeats):
+        clear_caches()
+        start = time.perf_counter()
+        func(numSteps)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    clear_caches()
+    tracemalloc.start()
+    func(numSteps)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return best, peak
+
+
+def growth_exponent(stepCounts, values):
+    """Slope of a least squares line through log(value) against log(steps)."""
+    xs = [math.log(n) for n in stepCounts]
+    ys = [math.log(max(v, 1e-12)) for v in values]
+    meanX = sum(xs) / len(xs)
+    meanY = sum(ys) / len(ys)
+    return sum((x - meanX) * (y - meanY) for x, y in zip(xs, ys)) / sum((x - meanX) ** 2 for x in xs)
+
+
+def run(maxSteps):
+    #Half decades, so the fit has several points
+    stepCounts = []
+    n = 1000
+    while n <= maxSteps:
+        stepCounts.append(n)
+        if n * 3 <= maxSteps:
+            stepCounts.append(n * 3)
+        n *= 10
+
+    linear = True
+    for name, func in CASES:
+        print(name)
+        times = []
+        peaks = []
+        for numSteps in stepCounts:
+            elapsed, peak = measure(func, numSteps)
+            times.append(elapsed)
+            peaks.append(peak)
+            print("  %8d steps  %9.2f ms  %9.1f MB  %7.3f us/step  %6.0f bytes/step" % (
+                numSteps, elapsed * 1000, peak / 1e6, elapsed / numSteps * 1e6, peak / numSteps))
+
+        if len(stepCounts) < 2:
+            continue
+        timeExponent = growth_exponent(stepCounts, times)
+        memoryExponent = growth_exponent(stepCounts, peaks)
+        print("  growth: time n^%.2f, memory n^%.2f" % (timeExponent, memoryExponent))
+        if timeExponent > MAX_TIME_EXPONENT or memoryExponent > MAX_MEMORY_EXPONENT:
+            print("  NOT LINEAR")
+            linear = False
+
+    return linear
+
+
+if __name__ == '__main__':
+    maxSteps = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    if not run(maxSteps):
+        sys.exit(1)
@@ -0,0 +1,89 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Tests for reading JSON and CSV stairs spec files."""
+
+import math
+
+import pytest
+
+from source.core import generators
+from source.core.batchSpec import load_spec, make_spec, parse_csv, parse_json
+
+
+def test_json():
+    specs = parse_json('{"stairs": [{"type": "straight", "name": "Lobby", "params": {"width": 3, "numSteps": "24"},'
+        ' "location": [1, 2, 3], "rotation": [0, 0, 90]}, {"type": "Curved", "params": {"ccw": "false"}}]}')
+    assert [spec.stairsType for spec in specs] == [generators.STRAIGHT, generators.CURVED]
+
+    lobby = specs[0]
+    assert lobby.name == "Lobby"
+    assert lobby.params["width"] == 3.0 and lobby.params["numSteps"] == 24
+    assert lobby.params["depth"] == generators.STAIRS_DEFAULTS[generators.STRAIGHT]["depth"]
+    assert lobby.location == (1.0, 2.0, 3.0)
+    assert lobby.rotation == pytest.approx((0.0, 0.0, math.pi / 2))
+    assert lobby.scale == (1.0, 1.0, 1.0)
+
+    assert specs[1].name == "Curved Stairs"
+    assert specs[1].params["ccw"] is False
+
+
+def test_csv(tmp_path):
+    path = tmp_path / "stairs.csv"
+    path.write_text("type,name,x,rz,sz,numSteps,sides\nstraight,A,5,45,,8,yes\ncurved,,,,2,,\n")
+    specs = load_spec(str(path))
+
+    assert specs[0].name == "A"
+    assert specs[0].location == (5.0, 0.0, 0.0)
+    assert specs[0].rotation == pytest.approx((0.0, 0.0, math.pi / 4))
+    assert specs[0].params["numSteps"] == 8 and specs[0].params["sides"] is True
+    assert specs[1].stairsType == generators.CURVED
+    assert specs[1].scale == (1.0, 1.0, 2.0)
+    assert specs[1].params == generators.complete_params(generators.CURVED, {})
+
+
+@pytest.mark.parametrize("params, message", [
+    ({"stepHeight": 0}, "stepHeight must be at least"),
+    ({"width": -1}, "width must be at least"),
+    ({"depth": "nan"}, "depth must be at least"),
+    ({"numSteps": 0}, "numSteps must be at least"),
+    ({"stepType": "BOGUS"}, "unknown stepType 'BOGUS'"),
+    ({"curvature": 90}, "unknown straight stairs parameters: curvature"),
+    ({"width": "wide"}, "bad value 'wide' for width"),
+])
+def test_invalid_params(params, message):
+    with pytest.raises(ValueError, match=message):
+        make_spec(generators.STRAIGHT, params)
+
+
+def test_invalid_curved_params():
+    with pytest.raises(ValueError, match="turns must be at least 1"):
+        make_spec(generators.CURVED, {"turns": 0})
+    with pytest.raises(ValueError, match="chordTolerance must be at least"):
+        make_spec(generators.CURVED, {"chordTolerance": 0})
+
+
+def test_invalid_entries():
+    with pytest.raises(ValueError, match="entry 0: unknown stairs type 'spiral'"):
+        parse_json('[{"type": "spiral"}]')
+    with pytest.raises(ValueError, match="entry 0: params must be an object"):
+        parse_json('[{"params": null}]')
+    with pytest.raises(ValueError, match="entry 1: params must be an object"):
+        parse_json('[{}, {"params": [1]}]')
+    with pytest.raises(ValueError, match="entry 0: location must be a list of three numbers"):
+        parse_json('[{"location": [1, 2]}]')
+    with pytest.raises(ValueError, match="line 3: numSteps must be at least"):
+        parse_csv("type,numSteps\nstraight,4\nstraight,-4\n")
+    with pytest.raises(ValueError):
+        parse_json('{"entries": []}')
@@ -0,0 +1,144 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Tests for the on-disk geometry cache."""
+
+import os
+import numpy as np
+
+from source.core import generators
+from source.core.diskCache import DiskCache, disk_key
+from source.core.geometryCache import GeometryCache
+from source.core.parallel import generate_many
+
+PARAMS = {"numSteps": 12, "height": 2.0}
+
+
+def count_calls(calls):
+    def generate(stairsType, params):
+        calls.append(params)
+        return generators.generate(stairsType, params)
+    return generate
+
+
+def test_round_trip(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    calls = []
+    first = cache.get(generators.STRAIGHT, PARAMS, count_calls(calls))
+    second = DiskCache(str(tmp_path)).get(generators.STRAIGHT, PARAMS, count_calls(calls))
+    assert len(calls) == 1
+
+    expected = generators.generate(generators.STRAIGHT, PARAMS)
+    for stored, array in zip(second, expected):
+        assert isinstance(stored, np.memmap)
+        assert not stored.flags.writeable
+        assert np.allclose(stored, array, atol=1e-6)
+    assert np.array_equal(first.co, second.co)
+
+
+def test_key_covers_every_parameter():
+    key = disk_key(generators.STRAIGHT, PARAMS)
+    assert key == disk_key(generators.STRAIGHT, dict(PARAMS, width=2.0))
+    assert key != disk_key(generators.STRAIGHT, dict(PARAMS, splitSides=True))
+    assert key != disk_key(generators.CURVED, {"numSteps": 12, "height": 2.0})
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    for numSteps in (10, 11, 12):
+        cache.get(generators.STRAIGHT, {"numSteps": numSteps}, generators.generate)
+    oldest = cache.entry_path(generators.STRAIGHT, {"numSteps": 10})
+    os.utime(oldest, (1, 1))
+    entrySize = max(size for mtime, size, path in cache.entries())
+
+    cache.maxBytes = entrySize * 2
+    cache.evict()
+    assert len(cache.entries()) == 2
+    assert not os.path.exists(oldest)
+    assert cache.size() <= cache.maxBytes
+
+
+def test_damaged_entry_is_repaired(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.get(generators.STRAIGHT, PARAMS, generators.generate)
+    entryPath = cache.entry_path(generators.STRAIGHT, PARAMS)
+    os.remove(os.path.join(entryPath, "uvs.npy"))
+    assert cache.load(generators.STRAIGHT, PARAMS) is None
+
+    calls = []
+    buffers = cache.get(generators.STRAIGHT, PARAMS, count_calls(calls))
+    assert isinstance(buffers.uvs, np.memmap)
+    assert os.path.exists(os.path.join(entryPath, "uvs.npy"))
+
+    cache.get(generators.STRAIGHT, PARAMS, count_calls(calls))
+    assert len(calls) == 1
+
+
+def test_geometry_cache_uses_disk(tmp_path):
+    memoryCache = GeometryCache()
+    memoryCache.set_disk_cache(str(tmp_path), 1024 * 1024 * 1024)
+    buffers = memoryCache.get(generators.CURVED, PARAMS)
+    assert memoryCache.disk_cache().misses == 1
+
+    otherSession = GeometryCache()
+    otherSession.set_disk_cache(str(tmp_path), 1024 * 1024 * 1024)
+    assert np.array_equal(otherSession.get(generators.CURVED, PARAMS).loopVerts, buffers.loopVerts)
+    assert otherSession.disk_cache().hits == 1
+
+
+def test_generate_many_uses_disk(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    jobs = [(generators.STRAIGHT, {"numSteps": n}) for n in (3, 4, 3)]
+    first = generate_many(jobs, processes=1, diskCache=cache)
+    assert len(cache.entries()) == 2
+    second = generate_many(jobs, processes=1, diskCache=cache)
+    assert cache.hits == 2
+    for a, b in zip(first, second):
+        assert np.array_equal(a.co, b.co)
+
+
+def test_unusable_folder_falls_back_to_generating(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = DiskCache(str(blocker / "cache"))
+    buffers = cache.get(generators.STRAIGHT, PARAMS, generators.generate)
+    assert buffers.numVerts == generators.generate(generators.STRAIGHT, PARAMS).numVerts
+
+
+def test_oversized_entry_keeps_the_cache(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    for numSteps in (10, 11, 12):
+        cache.get(generators.STRAIGHT, {"numSteps": numSteps}, generators.generate)
+    cache.maxBytes = cache.size() * 2
+
+    params = {"numSteps": 10000}
+    buffers = cache.get(generators.STRAIGHT, params, generators.generate)
+    assert buffers.numVerts == generators.generate(generators.STRAIGHT, params).numVerts
+    assert len(cache.entries()) == 3
+
+
+def test_folder_is_only_scanned_when_full(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    scans = []
+    entries = cache.entries
+    cache.entries = lambda: scans.append(1) or entries()
+
+    for numSteps in range(10, 20):
+        cache.get(generators.STRAIGHT, {"numSteps": numSteps}, generators.generate)
+    assert len(scans) == 1
+
+    cache.maxBytes = cache.knownBytes
+    cache.get(generators.STRAIGHT, {"numSteps": 20}, generators.generate)
+    assert len(scans) == 2
+    assert cache.size() <= cache.maxBytes
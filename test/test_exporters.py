@@ -0,0 +1,137 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Tests for the OBJ, PLY and glTF writers."""
+
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from source.core import exporters, generators
+from source.core.meshBuffers import MeshBuffers
+from meshChecks import is_watertight, signed_volume
+
+CASES = {
+    "straight": (generators.STRAIGHT, {"numSteps": 10, "sides": True}),
+    "straight split": (generators.STRAIGHT, {"numSteps": 10, "sides": True, "splitSides": True}),
+    "curved": (generators.CURVED, {"numSteps": 10, "sides": True}),
+    "curved minimal": (generators.CURVED, {"numSteps": 8, "curvature": 180.0, "sides": True, "minimalTopology": True}),
+    "curved adaptive": (generators.CURVED, {"numSteps": 4, "curvature": 270.0, "sides": True, "adaptiveCurve": True}),
+    "curved adaptive minimal": (generators.CURVED, {"numSteps": 4, "curvature": 270.0, "sides": True,
+        "adaptiveCurve": True, "minimalTopology": True}),
+    #A single turn, as the shells of several turns touch and welding by position would join them
+    "curved column": (generators.CURVED, {"numSteps": 8, "sides": True, "centralColumn": True}),
+}
+
+
+def read_glb(filepath):
+    """The JSON document and the binary chunk of a .glb file."""
+    with open(filepath, "rb") as f:
+        data = f.read()
+    magic, version, length = struct.unpack_from("<4sII", data, 0)
+    assert (magic, version, length) == (b"glTF", 2, len(data))
+
+    jsonLength, jsonType = struct.unpack_from("<I4s", data, 12)
+    assert jsonType == b"JSON"
+    gltf = json.loads(data[20:20 + jsonLength])
+
+    binLength, binType = struct.unpack_from("<I4s", data, 20 + jsonLength)
+    assert binType == b"BIN\x00"
+    binChunk = data[28 + jsonLength:28 + jsonLength + binLength]
+    assert len(binChunk) == binLength == gltf["buffers"][0]["byteLength"]
+    return gltf, binChunk
+
+
+def accessor_array(gltf, binChunk, index):
+    accessor = gltf["accessors"][index]
+    view = gltf["bufferViews"][accessor["bufferView"]]
+    dtype = {5126: "<f4", 5125: "<u4"}[accessor["componentType"]]
+    width = {"SCALAR": 1, "VEC2": 2, "VEC3": 3}[accessor["type"]]
+    array = np.frombuffer(binChunk, dtype, accessor["count"] * width, view["byteOffset"])
+    return array.reshape(accessor["count"], width) if width > 1 else array
+
+
+def welded_triangles(filepath, decimals=4):
+    """The triangles of a .glb, with corners at the same position merged into one vertex."""
+    gltf, binChunk = read_glb(filepath)
+    primitive = gltf["meshes"][0]["primitives"][0]
+    positions = accessor_array(gltf, binChunk, primitive["attributes"]["POSITION"])
+    indices = accessor_array(gltf, binChunk, primitive["indices"])
+
+    co, weld = np.unique(np.round(positions.astype(np.float64), decimals), axis=0, return_inverse=True)
+    numTris = len(indices) // 3
+    return MeshBuffers(
+        co,
+        weld.reshape(-1)[indices],
+        np.arange(numTris) * 3,
+        np.full(numTris, 3),
+        np.zeros((len(indices), 2)),
+    )
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_glb_is_closed(case, tmp_path):
+    stairsType, params = CASES[case]
+    filepath = str(tmp_path / "stairs.glb")
+    exporters.export_stairs(filepath, stairsType, params)
+
+    triangles = welded_triangles(filepath)
+    assert is_watertight(triangles)
+    #The glTF axes are a rotation of Blender's, so the volume is unchanged
+    expected = signed_volume(generators.generate(stairsType, params))
+    assert signed_volume(triangles) == pytest.approx(expected, rel=1e-4)
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_obj_counts(case, tmp_path):
+    stairsType, params = CASES[case]
+    buffers = generators.generate(stairsType, params)
+    filepath = str(tmp_path / "stairs.obj")
+    exporters.write_obj(buffers, filepath, chunkFaces=7)
+
+    with open(filepath) as f:
+        records = [line.split() for line in f]
+    assert sum(1 for record in records if record[0] == "v") == buffers.numVerts
+    assert sum(1 for record in records if record[0] == "vt") == buffers.numLoops
+    faces = [record[1:] for record in records if record[0] == "f"]
+    assert [len(face) for face in faces] == buffers.loopTotals.tolist()
+    assert [int(corner.split("/")[0]) - 1 for face in faces for corner in face] == buffers.loopVerts.tolist()
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_ply_counts(case, tmp_path):
+    stairsType, params = CASES[case]
+    buffers = generators.generate(stairsType, params)
+    filepath = str(tmp_path / "stairs.ply")
+    exporters.write_ply(buffers, filepath, chunkFaces=7)
+
+    with open(filepath, "rb") as f:
+        data = f.read()
+    headerEnd = data.index(b"end_header\n") + len(b"end_header\n")
+    header = data[:headerEnd].decode("ascii")
+    assert "element vertex %d\n" % buffers.numVerts in header
+    assert "element face %d\n" % buffers.numFaces in header
+
+    #Per face, a count and the vertex indices, then a count and the uvs
+    countBytes = 1 if "property list uchar int vertex_indices" in header else 4
+    faceBytes = 2 * countBytes * buffers.numFaces + 4 * buffers.numLoops + 8 * buffers.numLoops
+    assert len(data) - headerEnd == 12 * buffers.numVerts + faceBytes
+
+
+def test_unknown_format(tmp_path):
+    buffers = generators.generate(generators.STRAIGHT, {})
+    with pytest.raises(ValueError):
+        exporters.write_buffers(buffers, str(tmp_path / "stairs.stl"))
@@ -0,0 +1,184 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Regression tests for the straight and curved stairs generators.
+
+Every case of the parameter grid, including the optional topology, adaptive
+curve, multiple turn and central column modes, is checked for its vertex,
+face and uv counts, for being closed when sides are built, and against a
+stored checksum of its output.
+"""
+
+import functools
+import itertools
+import numpy as np
+import pytest
+
+from source.core import curvedStairs, generators, straightStairs
+from meshChecks import checksum, is_watertight, signed_volume
+
+STEP_COUNTS = [1, 2, 3, 10, 100, 1000, 100000]
+STEP_TYPES = ["NUM_STAIRS", "STAIR_HEIGHT"]
+
+#The optional modes are checked on fewer step counts to keep the run short
+MODE_STEP_COUNTS = [1, 2, 3, 10, 100, 10000]
+
+#The slow list based add_stairs functions are only compared up to this many steps
+MAX_LEGACY_STEPS = 100
+
+#Exact in binary, so STAIR_HEIGHT gives the same number of steps as NUM_STAIRS
+STEP_HEIGHT = 0.25
+
+#A single step spanning more than half a turn folds over itself
+MAX_STEP_DEGREES = 90.0
+
+#Parameters added by each mode, by stairs type.  The empty mode is the default.
+MODES = {
+    generators.STRAIGHT: {
+        "": {},
+        "split": {"splitSides": True},
+    },
+    generators.CURVED: {
+        "": {},
+        "cw": {"ccw": False},
+        "minimal": {"minimalTopology": True},
+        "adaptive": {"adaptiveCurve": True},
+        "adaptive minimal": {"adaptiveCurve": True, "minimalTopology": True},
+        "turns3": {"turns": 3},
+        "turns2 column": {"turns": 2, "centralColumn": True},
+        "turns2 minimal": {"turns": 2, "minimalTopology": True},
+    },
+}
+
+
+def case_params(stairsType, stepType, numSteps, sides, mode=""):
+    if stairsType == generators.STRAIGHT:
+        params = {"width": 2.0, "height": numSteps * STEP_HEIGHT, "depth": numSteps * 0.3, "stepType": stepType,
+            "numSteps": numSteps, "stepHeight": STEP_HEIGHT, "sides": sides}
+    else:
+        params = {"height": numSteps * STEP_HEIGHT, "stairWidth": 1.0, "stepType": stepType, "numSteps": numSteps,
+            "stepHeight": STEP_HEIGHT, "curvature": min(270.0, numSteps * MAX_STEP_DEGREES), "innerRadius": 2.0, "sides": sides}
+    params.update(MODES[stairsType][mode])
+    return params
+
+
+CASES = [
+    (stairsType, stepType, numSteps, sides, mode)
+    for stairsType in (generators.STRAIGHT, generators.CURVED)
+    for mode in MODES[stairsType]
+    for stepType, numSteps, sides in itertools.product(STEP_TYPES, STEP_COUNTS if mode in ("", "cw") else MODE_STEP_COUNTS, [False, True])
+]
+
+
+def case_name(case):
+    stairsType, stepType, numSteps, sides, mode = case
+    name = "%s %s %d" % (stairsType, stepType, numSteps)
+    if sides:
+        name += " sides"
+    if mode:
+        name += " " + mode
+    return name
+
+
+@functools.lru_cache(maxsize=4)
+def build(case):
+    stairsType = case[0]
+    return generators.generate(stairsType, case_params(*case))
+
+
+def expected_counts(stairsType, numSteps, sides, mode=""):
+    """Vertex, face and loop counts, or None where they depend on the curve tessellation."""
+    params = MODES[stairsType][mode]
+    if params.get("adaptiveCurve"):
+        return None
+
+    turns = params.get("turns", 1)
+    if not sides:
+        #The walking surfaces of all turns are welded into one strip
+        n = numSteps * turns
+        counts = (4 * n + 2, 2 * n, 8 * n)
+    else:
+        n = numSteps
+        if stairsType == generators.STRAIGHT and not params.get("splitSides"):
+            counts = (4 * n + 4, 2 * n + 4, 12 * n + 12)
+        elif params.get("minimalTopology"):
+            counts = (6 * n + 2, 4 * n + 2, 20 * n + 4)
+        else:
+            counts = (6 * n + 2, 7 * n + 1, 26 * n + 2)
+        counts = tuple(count * turns for count in counts)
+
+    if params.get("centralColumn"):
+        segments = curvedStairs.COLUMN_SEGMENTS
+        counts = (counts[0] + 2 * segments, counts[1] + segments + 2, counts[2] + 6 * segments)
+    return counts
+
+
+def closed_components(stairsType, mode):
+    """Number of separate closed shells built with sides."""
+    params = MODES[stairsType][mode]
+    return params.get("turns", 1) + (1 if params.get("centralColumn") else 0)
+
+
+@pytest.mark.parametrize("case", CASES, ids=case_name)
+def test_counts(case):
+    stairsType, stepType, numSteps, sides, mode = case
+    buffers = build(case)
+    expected = expected_counts(stairsType, numSteps, sides, mode)
+    if expected is not None:
+        assert (buffers.numVerts, buffers.numFaces, buffers.numLoops) == expected
+    assert buffers.uvs.shape == (buffers.numLoops, 2)
+    assert buffers.loopTotals.sum() == buffers.numLoops
+    assert np.array_equal(buffers.loopStarts[1:], np.cumsum(buffers.loopTotals)[:-1])
+    assert buffers.loopVerts.min() >= 0 and buffers.loopVerts.max() < buffers.numVerts
+    assert np.isfinite(buffers.co).all() and np.isfinite(buffers.uvs).all()
+
+
+@pytest.mark.parametrize("case", [case for case in CASES if case[3]], ids=case_name)
+def test_watertight(case):
+    stairsType, stepType, numSteps, sides, mode = case
+    buffers = build(case)
+    assert is_watertight(buffers)
+
+    #Every closed shell is a sphere, so V - E + F is twice the number of shells
+    numEdges = buffers.numLoops // 2
+    assert buffers.numVerts - numEdges + buffers.numFaces == 2 * closed_components(stairsType, mode)
+
+    volume = signed_volume(buffers)
+    if stairsType == generators.STRAIGHT:
+        params = case_params(*case)
+        expected = params["width"] * params["depth"] * params["height"] * (numSteps + 1) / (2 * numSteps)
+        assert volume == pytest.approx(expected, rel=1e-6)
+    elif mode != "cw":
+        #Clockwise curved stairs are mirrored, so only the winding is checked for them
+        assert volume > 0
+
+
+@pytest.mark.parametrize("case", CASES, ids=case_name)
+def test_golden(case, golden):
+    golden.check(case_name(case), checksum(build(case)))
+
+
+@pytest.mark.parametrize("case", [case for case in CASES if case[2] <= MAX_LEGACY_STEPS and case[4] in ("", "cw")], ids=case_name)
+def test_matches_add_stairs(case):
+    stairsType = case[0]
+    params = generators.complete_params(stairsType, case_params(*case))
+    if stairsType == generators.STRAIGHT:
+        verts, faces, uvs = straightStairs.add_stairs(*[params[name] for name in generators.STAIRS_PARAMS[stairsType][:7]])
+    else:
+        verts, faces, uvs = curvedStairs.add_stairs(*[params[name] for name in generators.STAIRS_PARAMS[stairsType][:9]])
+
+    bufferVerts, bufferFaces, bufferUvs = build(case).to_lists()
+    assert bufferFaces == [tuple(face) for face in faces]
+    assert np.allclose(bufferVerts, verts)
+    assert np.allclose(np.concatenate(bufferUvs), np.concatenate(uvs))
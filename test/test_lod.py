@@ -0,0 +1,92 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Tests for the level of detail chains and collision proxies."""
+
+import pytest
+
+from source.core import collision, generators, lod
+from meshChecks import checksum, is_watertight, signed_volume
+
+CASES = {
+    "straight": (generators.STRAIGHT, {"width": 2.0, "height": 3.0, "depth": 4.0, "numSteps": 12}),
+    "curved": (generators.CURVED, {"height": 3.0, "numSteps": 12, "curvature": 270.0, "innerRadius": 2.0}),
+    "curved turns2 column": (generators.CURVED, {"height": 2.0, "numSteps": 8, "curvature": 360.0, "turns": 2, "centralColumn": True}),
+    "curved step height": (generators.CURVED, {"height": 2.0, "stepType": "STAIR_HEIGHT", "stepHeight": 0.3, "curvature": 90.0}),
+}
+
+
+def with_sides(case):
+    stairsType, params = CASES[case]
+    return stairsType, dict(params, sides=True)
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_lod_chain(case, golden):
+    stairsType, params = with_sides(case)
+    chain = lod.lod_chain(stairsType, params, 6)
+    faces = [generators.generate(stairsType, params).numFaces] + [buffers.numFaces for buffers in chain[:-1]]
+
+    #Every stepped level has fewer steps than the one before, so none repeats
+    #another.  The ramp follows the curve, so it is only compared with the
+    #full stairs.
+    assert faces == sorted(set(faces), reverse=True)
+    assert chain[-1].numFaces < faces[0]
+    for level, buffers in enumerate(chain):
+        assert is_watertight(buffers)
+        assert signed_volume(buffers) > 0
+        golden.check("LOD %s %d" % (case, level + 1), checksum(buffers))
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_lod_chain_length(case):
+    stairsType, params = with_sides(case)
+    assert lod.lod_chain(stairsType, params, 0) == []
+    assert len(lod.lod_chain(stairsType, params, 1)) == 1
+    assert len(lod.lod_chain(stairsType, params, 6)) <= 6
+
+
+def test_straight_ramp_volume():
+    stairsType, params = with_sides("straight")
+    ramp = lod.ramp(stairsType, params)
+    assert signed_volume(ramp) == pytest.approx(params["width"] * params["height"] * params["depth"] / 2)
+
+
+@pytest.mark.parametrize("shape", [collision.RAMP, collision.BOXES])
+@pytest.mark.parametrize("case", CASES)
+def test_collision_proxy(case, shape, golden):
+    stairsType, params = CASES[case]
+    proxy = collision.collision_proxy(stairsType, params, shape)
+    assert is_watertight(proxy)
+    assert signed_volume(proxy) > 0
+    golden.check("COLLISION %s %s" % (case, shape), checksum(proxy))
+
+
+def test_boxes_cover_the_steps():
+    stairsType, params = CASES["straight"]
+    proxy = collision.collision_proxy(stairsType, params, collision.BOXES, 4)
+    stairs = generators.generate(stairsType, dict(params, sides=True))
+    assert proxy.numFaces == 4 * 6
+    assert signed_volume(proxy) >= signed_volume(stairs)
+
+
+@pytest.mark.parametrize("ccw", [True, False])
+@pytest.mark.parametrize("curvature, numSegments", [(90.0, 1), (360.0, 4), (270.0, 12)])
+def test_curved_pieces_cover_the_steps(curvature, numSegments, ccw):
+    params = {"height": 3.0, "numSteps": 24, "curvature": curvature, "innerRadius": 1.0, "stairWidth": 1.0, "ccw": ccw}
+    proxy = collision.collision_proxy(generators.CURVED, params, numSegments=numSegments)
+    stairs = generators.generate(generators.CURVED, dict(params, sides=True))
+    assert is_watertight(proxy)
+    #Clockwise stairs are built inside out, so compare sizes only
+    assert signed_volume(proxy) >= abs(signed_volume(stairs))
@@ -0,0 +1,80 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Tests for generating geometry in worker processes."""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+from source.core import generators
+from source.core.parallel import generate_many
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+#Stands in for Blender's bpy, which only exists in the Blender process
+FAKE_BPY = textwrap.dedent("""
+    import os
+    if os.getpid() != int(os.environ["BPY_PID"]):
+        raise ImportError("bpy is only available inside Blender")
+""")
+
+#Blender runs a --python script as __main__ with __file__ set, so spawned
+#workers run the script again as their own main module
+DRIVER = textwrap.dedent("""
+    import os, sys, types
+    os.environ["BPY_PID"] = str(os.getpid())
+    sys.path.insert(0, sys.argv[2])
+    from source.core import generators, parallel
+
+    sys.path.insert(0, sys.argv[1])
+    import bpy
+
+    script = types.ModuleType("blenderScript")
+    script.__file__ = sys.argv[3]
+    script.__spec__ = None
+    with open(sys.argv[3]) as f:
+        exec(compile(f.read(), sys.argv[3], "exec"), script.__dict__)
+    sys.modules["__main__"] = script
+
+    jobs = [(generators.STRAIGHT, {"numSteps": n}) for n in range(10, 20)]
+    results = parallel.generate_many(jobs, processes=2, minParallelSteps=0)
+    print(sum(buffers.numFaces for buffers in results))
+""")
+
+
+def test_matches_one_process():
+    jobs = [(generators.CURVED, {"numSteps": n, "sides": True}) for n in (4, 5, 4, 6)]
+    parallel = generate_many(jobs, processes=2, minParallelSteps=0)
+    serial = generate_many(jobs, processes=1)
+    assert len(parallel) == len(jobs)
+    assert parallel[0] is parallel[2]
+    for a, b in zip(parallel, serial):
+        assert all((x == y).all() for x, y in zip(a, b))
+
+
+def test_workers_of_batch_script(tmp_path):
+    #Kept out of the driver's folder, which is on sys.path from the start
+    modulesDir = tmp_path / "modules"
+    modulesDir.mkdir()
+    (modulesDir / "bpy.py").write_text(FAKE_BPY)
+    driver = tmp_path / "driver.py"
+    driver.write_text(DRIVER)
+    script = os.path.join(REPO_DIR, "source", "stairsBatchCli.py")
+
+    result = subprocess.run([sys.executable, str(driver), str(modulesDir), REPO_DIR, script],
+        capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert int(result.stdout) == sum(generators.generate(generators.STRAIGHT, {"numSteps": n}).numFaces for n in range(10, 20))
@@ -0,0 +1,77 @@
+#Copyright 2019 Mark McKay
+#
+#Licensed under the Apache License, Version 2.0 (the "License");
+#you may not use this file except in compliance with the License.
+#You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#Unless required by applicable law or agreed to in writing, software
+#distributed under the License is distributed on an "AS IS" BASIS,
+#WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#See the License for the specific language governing permissions and
+#limitations under the License.
+
+"""Tests for stairs built along a curve."""
+
+import math
+import numpy as np
+import pytest
+
+from source.core import generators, pathStairs
+from meshChecks import checksum, is_watertight, signed_volume
+
+#Dense enough that the polyline follows the arc to within the comparison tolerance
+ARC_POINTS = 20001
+
+
+def arc(radius, degrees):
+    """Counter clockwise arc starting at the origin heading along +y, like curved stairs."""
+    angles = np.linspace(0, math.radians(degrees), ARC_POINTS)
+    return np.stack((radius * (np.cos(angles) - 1), radius * np.sin(angles)), axis=1)
+
+
+def s_curve():
+    knots = [(0, 0, 0), (2, 4, 0), (0, 8, 0)]
+    handlesLeft = [(-1, -2, 0), (3, 2, 0), (-1, 7, 0)]
+    handlesRight = [(1, 2, 0), (1, 6, 0), (1, 9, 0)]
+    return pathStairs.bezier_points(knots, handlesLeft, handlesRight)
+
+
+@pytest.mark.parametrize("sides", [False, True])
+def test_arc_matches_curved_stairs(sides):
+    buffers = pathStairs.path_stairs_buffers(arc(2.5, 180), 1.0, 3.0, "NUM_STAIRS", 12, 0.25, sides)
+    expected = generators.generate(generators.CURVED, {"height": 3.0, "stairWidth": 1.0, "numSteps": 12,
+        "curvature": 180.0, "innerRadius": 2.0, "ccw": True, "sides": sides})
+
+    assert np.array_equal(buffers.loopVerts, expected.loopVerts)
+    assert np.array_equal(buffers.loopTotals, expected.loopTotals)
+    assert np.allclose(buffers.co, expected.co, atol=1e-4)
+    assert np.allclose(buffers.uvs, expected.uvs, atol=1e-4)
+
+
+@pytest.mark.parametrize("numSteps", [1, 10, 1000])
+@pytest.mark.parametrize("minimalTopology", [False, True])
+def test_s_curve_is_closed(numSteps, minimalTopology, golden):
+    buffers = pathStairs.path_stairs_buffers(s_curve(), 1.0, numSteps * 0.2, "NUM_STAIRS", numSteps, 0.2, True, minimalTopology)
+    assert is_watertight(buffers)
+    assert signed_volume(buffers) > 0
+    golden.check("PATH s curve %d%s" % (numSteps, " minimal" if minimalTopology else ""), checksum(buffers))
+
+
+def test_bezier_passes_through_knots():
+    points = s_curve()
+    assert len(points) == 2 * pathStairs.BEZIER_SAMPLES + 1
+    assert np.allclose(points[0], (0, 0, 0))
+    assert np.allclose(points[pathStairs.BEZIER_SAMPLES], (2, 4, 0))
+    assert np.allclose(points[-1], (0, 8, 0))
+
+
+def test_single_knot_is_rejected():
+    with pytest.raises(ValueError):
+        pathStairs.bezier_points([(0, 0, 0)], [(0, 0, 0)], [(0, 0, 0)])
+
+
+def test_repeated_points_are_rejected():
+    with pytest.raises(ValueError):
+        pathStairs.path_stairs_buffers([(1, 1), (1, 1)], 1.0, 2.0, "NUM_STAIRS", 4, 0.25, True)